@@ -209,7 +209,7 @@ def _build_relative_set(individual_id: str, max_generations: int = 5) -> set[str
             fam = state.families.get(fam_id)
             if fam:
                 # Add spouse
-                spouse_id = fam.wife_id if fam.husband_id == indi_id else fam.husband_id
+                spouse_id = state.spouse_of[(indi_id, fam_id)]
                 if spouse_id:
                     relatives.add(spouse_id)
                 # Add and recurse into children
@@ -0,0 +1,100 @@
+"""Per-individual attribute columns for vectorized statistics.
+
+Frequently aggregated fields are stored struct-of-arrays style: one numpy array per
+field, indexed by dense individual ID (state.individual_ids), so counts, ranges and
+year windows are array reductions instead of a Python loop over Individual objects.
+Each individual's events are also sorted chronologically once, for timelines.
+Rebuilt by load_gedcom() via build_columns(), after build_pedigree().
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import state
+from .helpers import extract_year
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .models import Event, Individual
+
+# Codes stored in sex_codes
+SEX_UNKNOWN = 0
+SEX_MALE = 1
+SEX_FEMALE = 2
+_SEX_CODES = {"M": SEX_MALE, "F": SEX_FEMALE}
+
+# Columns (set by build_columns)
+birth_years: NDArray[np.int32] = np.zeros(0, dtype=np.int32)  # 0 when unknown
+sex_codes: NDArray[np.int8] = np.zeros(0, dtype=np.int8)
+birth_place_codes: NDArray[np.int32] = np.zeros(0, dtype=np.int32)  # -1 when unknown
+birth_place_names: list[str] = []  # birth place string for each code, verbatim
+
+# Each individual's events in chronological order, CSR style: timeline_events[
+# timeline_offsets[i]:timeline_offsets[i + 1]] are positions in individual i's events list
+timeline_offsets: NDArray[np.int32] = np.zeros(1, dtype=np.int32)
+timeline_events: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+
+
+def build_columns() -> None:
+    """Extract the column arrays from state.individuals in dense-ID order."""
+    global birth_years, sex_codes, birth_place_codes, birth_place_names
+
+    indis = [state.individuals[indi_id] for indi_id in state.individual_ids]
+    count = len(indis)
+
+    birth_years = np.fromiter(
+        (extract_year(indi.birth_date) or 0 for indi in indis), dtype=np.int32, count=count
+    )
+    sex_codes = np.fromiter(
+        (_SEX_CODES.get(indi.sex or "", SEX_UNKNOWN) for indi in indis), dtype=np.int8, count=count
+    )
+
+    place_codes: dict[str, int] = {}
+    birth_place_codes = np.fromiter(
+        (
+            place_codes.setdefault(indi.birth_place, len(place_codes)) if indi.birth_place else -1
+            for indi in indis
+        ),
+        dtype=np.int32,
+        count=count,
+    )
+    birth_place_names = list(place_codes)
+
+    build_timelines(indis)
+
+
+def _timeline_order(events: list[Event]) -> list[int]:
+    """Positions of events sorted by year (undated last), then by date string."""
+
+    def sort_key(e: int) -> tuple[int, str]:
+        date = events[e].date
+        return (extract_year(date) or 9999, date or "")
+
+    return sorted(range(len(events)), key=sort_key)
+
+
+def build_timelines(indis: list[Individual]) -> None:
+    """Sort each individual's events once, in dense-ID order."""
+    global timeline_offsets, timeline_events
+
+    order: list[int] = []
+    offsets = [0]
+    for indi in indis:
+        order.extend(_timeline_order(indi.events))
+        offsets.append(len(order))
+    timeline_offsets = np.array(offsets, dtype=np.int32)
+    timeline_events = np.array(order, dtype=np.int32)
+
+
+def timeline_of(i: int) -> list[int]:
+    """Positions in individual i's events list, in chronological order."""
+    return timeline_events[timeline_offsets[i] : timeline_offsets[i + 1]].tolist()
+
+
+def positions_born_between(start_year: int, end_year: int) -> NDArray[np.intp]:
+    """Dense IDs of individuals with a known birth year in [start_year, end_year], ascending."""
+    return np.flatnonzero((birth_years >= max(start_year, 1)) & (birth_years <= end_year))
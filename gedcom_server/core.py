@@ -1,31 +1,84 @@
 """Core logic functions for querying genealogy data."""
 
-from . import state
+import functools
+import sys
+from collections import Counter
+from collections.abc import Iterable
+
+import numpy as np
+
+from . import columns, pedigree, state
+from .helpers import trigram_candidates
 
 
 def _normalize_lookup_id(id_str: str) -> str:
     """Normalize an ID for lookup in the dictionaries.
 
     IDs are stored with @ symbols (e.g., '@I123@'), so we ensure
-    the lookup ID has them.
+    the lookup ID has them. The result is interned like the stored keys, so
+    dictionary lookups and cache keys match by identity. IDs of loaded records
+    are looked up in state.lookup_ids instead of being rebuilt; that table is
+    the memo, so an lru_cache on top would only add its own overhead.
     """
+    normalized = state.lookup_ids.get(id_str)
+    if normalized is not None:
+        return normalized
     stripped = id_str.strip("@")
-    return f"@{stripped}@"
+    return sys.intern(f"@{stripped}@")
+
+
+_NAME_SEPARATOR = "\x1f"  # joins the names in _name_haystack
+
+
+@functools.lru_cache(maxsize=1)
+def _name_haystack() -> tuple[str, np.ndarray]:
+    """All lowercased full names joined by a separator, with each name's start offset."""
+    keys = state.name_search_keys
+    starts = np.zeros(len(keys), dtype=np.int64)
+    if keys:
+        starts[1:] = np.cumsum([len(key) + 1 for key in keys[:-1]])
+    return _NAME_SEPARATOR.join(keys), starts
+
+
+state.register_cache(_name_haystack.cache_clear)
+
+
+def _scan_names(name_lower: str) -> Iterable[int]:
+    """Positions of the names containing name_lower, via str.find over the haystack."""
+    haystack, starts = _name_haystack()
+    count = len(starts)
+    if not count:
+        return
+    pos = haystack.find(name_lower)
+    while pos >= 0:
+        i = int(np.searchsorted(starts, pos, side="right")) - 1
+        yield i
+        if i + 1 >= count:
+            return
+        pos = haystack.find(name_lower, int(starts[i + 1]))
 
 
 def _search_individuals(name: str, max_results: int = 50) -> list[dict]:
     name_lower = name.lower()
-    results = []
+    keys = state.name_search_keys
+    results: list[dict] = []
 
-    for indi in state.individuals.values():
-        if (
-            name_lower in indi.given_name.lower()
-            or name_lower in indi.surname.lower()
-            or name_lower in indi.full_name().lower()
-        ):
-            results.append(indi.to_summary())
-            if len(results) >= max_results:
-                break
+    # Given name and surname are both part of the full name, so one lowercased full name
+    # per individual (built at load) is matched. The trigram index narrows longer queries;
+    # shorter ones are found by a single scan over all names joined together.
+    candidates = trigram_candidates(state.name_trigram_index, name_lower)
+    if candidates is not None:
+        matches: Iterable[int] = (i for i in candidates if name_lower in keys[i])
+    elif _NAME_SEPARATOR in name_lower:
+        matches = (i for i, key in enumerate(keys) if name_lower in key)
+    else:
+        matches = _scan_names(name_lower)
+
+    ids = state.individual_ids
+    for i in matches:
+        results.append(state.individuals[ids[i]].to_summary())
+        if len(results) >= max_results:
+            break
 
     return results
 
@@ -80,22 +133,14 @@ def _get_parents(individual_id: str) -> dict | None:
 
 def _get_children(individual_id: str) -> list[dict]:
     lookup_id = _normalize_lookup_id(individual_id)
-    indi = state.individuals.get(lookup_id)
-    if not indi:
+    i = state.individual_index.get(lookup_id)
+    if i is None:
         return []
 
-    children = []
-    seen = set()
-
-    for fam_id in indi.families_as_spouse:
-        fam = state.families.get(fam_id)
-        if fam:
-            for child_id in fam.children_ids:
-                if child_id not in seen and child_id in state.individuals:
-                    seen.add(child_id)
-                    children.append(state.individuals[child_id].to_summary())
-
-    return children
+    # Each child once, in family order, even if listed in several of the families
+    ids = state.individual_ids
+    children = dict.fromkeys(pedigree.children_of(i))
+    return [state.individuals[ids[c]].to_summary() for c in children]
 
 
 def _get_spouses(individual_id: str) -> list[dict]:
@@ -109,7 +154,7 @@ def _get_spouses(individual_id: str) -> list[dict]:
     for fam_id in indi.families_as_spouse:
         fam = state.families.get(fam_id)
         if fam:
-            spouse_id = fam.wife_id if fam.husband_id == lookup_id else fam.husband_id
+            spouse_id = state.spouse_of[(lookup_id, fam_id)]
             if spouse_id and spouse_id in state.individuals:
                 spouse_info = state.individuals[spouse_id].to_summary()
                 spouse_info["family_id"] = fam_id
@@ -122,20 +167,12 @@ def _get_spouses(individual_id: str) -> list[dict]:
 
 def _get_siblings(individual_id: str) -> list[dict]:
     lookup_id = _normalize_lookup_id(individual_id)
-    indi = state.individuals.get(lookup_id)
-    if not indi or not indi.family_as_child:
+    i = state.individual_index.get(lookup_id)
+    if i is None:
         return []
 
-    fam = state.families.get(indi.family_as_child)
-    if not fam:
-        return []
-
-    siblings = []
-    for child_id in fam.children_ids:
-        if child_id != lookup_id and child_id in state.individuals:
-            siblings.append(state.individuals[child_id].to_summary())
-
-    return siblings
+    ids = state.individual_ids
+    return [state.individuals[ids[s]].to_summary() for s in pedigree.siblings_of(i)]
 
 
 def _get_ancestors(
@@ -159,86 +196,108 @@ def _get_ancestors(
     lookup_id = _normalize_lookup_id(individual_id)
     generations = min(generations, 20)  # Cap at 20
 
+    start = state.individual_index.get(lookup_id)
+    ids = state.individual_ids
+
     if filter == "terminal":
-        # Find ancestors with no known parents (brick walls)
-        terminal_ancestors: list[dict] = []
-        seen: set[str] = set()
-
-        def find_terminal(indi_id: str | None, gen: int, path: list[str]) -> None:
-            if not indi_id or gen <= 0 or indi_id not in state.individuals:
-                return
-            if indi_id in seen:
-                return
-            seen.add(indi_id)
-
-            indi = state.individuals[indi_id]
-
-            # Check if this person has parents
-            has_parents = False
-            if indi.family_as_child:
-                fam = state.families.get(indi.family_as_child)
-                if fam and (fam.husband_id or fam.wife_id):
-                    has_parents = True
-                    # Recurse to parents
-                    if fam.husband_id:
-                        find_terminal(fam.husband_id, gen - 1, path + ["father"])
-                    if fam.wife_id:
-                        find_terminal(fam.wife_id, gen - 1, path + ["mother"])
-
-            if not has_parents and indi_id != lookup_id:
-                result = indi.to_summary()
-                result["generation"] = generations - gen + 1
-                result["path"] = path
-                terminal_ancestors.append(result)
+        if start is None:
+            return []
+        return _terminal_ancestors(start, generations)
 
-        find_terminal(lookup_id, generations + 1, [])
-        return terminal_ancestors
+    # Default: return nested tree. With pedigree collapse the same ancestor recurs with
+    # the same generations left; each such subtree is built once and shared.
+    subtrees: dict[tuple[int, int], dict] = {}
 
-    # Default: return nested tree
-    def build_ancestor_tree(indi_id: str | None, gen: int) -> dict | None:
-        if not indi_id or gen <= 0 or indi_id not in state.individuals:
+    def build_ancestor_tree(i: int, gen: int) -> dict | None:
+        if i < 0 or gen <= 0:
             return None
+        subtree = subtrees.get((i, gen))
+        if subtree is not None:
+            return subtree
 
-        indi = state.individuals[indi_id]
+        indi = state.individuals[ids[i]]
         result = indi.to_summary()
 
-        if gen > 1 and indi.family_as_child:
-            fam = state.families.get(indi.family_as_child)
-            if fam:
-                result["father"] = build_ancestor_tree(fam.husband_id, gen - 1)
-                result["mother"] = build_ancestor_tree(fam.wife_id, gen - 1)
+        if gen > 1 and indi.family_as_child in state.families:
+            result["father"] = build_ancestor_tree(pedigree.father_of(i), gen - 1)
+            result["mother"] = build_ancestor_tree(pedigree.mother_of(i), gen - 1)
 
+        subtrees[i, gen] = result
         return result
 
-    return build_ancestor_tree(lookup_id, generations + 1) or {}
+    if start is None:
+        return {}
+    return build_ancestor_tree(start, generations + 1) or {}
+
+
+def _terminal_ancestors(start: int, generations: int) -> list[dict]:
+    """Ancestors of start with no known parents (brick walls), within the generation limit.
+
+    Walks the pedigree depth-first, father's line before mother's, and lists each
+    ancestor once, after all of its own ancestors, with the father/mother path from
+    start. Paths are kept as parent pointers and only spelled out for listed ancestors.
+    """
+    ids = state.individual_ids
+    terminal_ancestors: list[dict] = []
+    seen = np.zeros(len(ids), dtype=np.bool_)
+
+    # Entries are (i, generations left, path link, is_terminal); is_terminal is None until
+    # the parents of i have been pushed. A path link is (previous link, step) or None.
+    stack: list[tuple[int, int, tuple | None, bool | None]] = [(start, generations + 1, None, None)]
+    while stack:
+        i, gen, link, is_terminal = stack.pop()
+        if is_terminal is None:
+            if i < 0 or gen <= 0 or seen[i]:
+                continue
+            seen[i] = True
+            father, mother = pedigree.father_of(i), pedigree.mother_of(i)
+            stack.append((i, gen, link, father < 0 and mother < 0 and i != start))
+            stack.append((mother, gen - 1, (link, "mother"), None))
+            stack.append((father, gen - 1, (link, "father"), None))
+        elif is_terminal:
+            indi = state.individuals[ids[i]]
+            # Parents recorded but missing from the tree still count as known
+            fam = state.families.get(indi.family_as_child) if indi.family_as_child else None
+            if not (fam and (fam.husband_id or fam.wife_id)):
+                path: list[str] = []
+                while link is not None:
+                    link, step = link
+                    path.append(step)
+                result = indi.to_summary()
+                result["generation"] = generations - gen + 1
+                result["path"] = path[::-1]
+                terminal_ancestors.append(result)
+    return terminal_ancestors
 
 
 def _get_descendants(individual_id: str, generations: int = 4) -> dict:
     lookup_id = _normalize_lookup_id(individual_id)
     generations = min(generations, 10)
 
-    def build_descendant_tree(indi_id: str | None, gen: int) -> dict | None:
-        if not indi_id or gen <= 0 or indi_id not in state.individuals:
-            return None
+    start = state.individual_index.get(lookup_id)
+    if start is None or generations < 0:
+        return {}
 
-        indi = state.individuals[indi_id]
-        result = indi.to_summary()
+    ids = state.individual_ids
+    # Descendants reached through several lines share one subtree (see _get_ancestors)
+    subtrees: dict[tuple[int, int], dict] = {}
+
+    def build_descendant_tree(i: int, gen: int) -> dict:
+        subtree = subtrees.get((i, gen))
+        if subtree is not None:
+            return subtree
+
+        result = state.individuals[ids[i]].to_summary()
 
         if gen > 1:
-            children_list = []
-            for fam_id in indi.families_as_spouse:
-                fam = state.families.get(fam_id)
-                if fam:
-                    for child_id in fam.children_ids:
-                        child_tree = build_descendant_tree(child_id, gen - 1)
-                        if child_tree:
-                            children_list.append(child_tree)
+            children_list = [build_descendant_tree(c, gen - 1) for c in pedigree.children_of(i)]
             if children_list:
                 result["children"] = children_list
 
+        subtrees[i, gen] = result
         return result
 
-    return build_descendant_tree(lookup_id, generations + 1) or {}
+    return build_descendant_tree(start, generations + 1)
 
 
 def _search_by_birth(
@@ -248,13 +307,16 @@ def _search_by_birth(
     max_results: int = 50,
 ) -> list[dict]:
     results = []
-    candidates = set()
 
+    candidates: Iterable[str]
     if year:
-        for y in range(year - year_range, year + year_range + 1):
-            candidates.update(state.birth_year_index.get(y, []))
+        # Birth year window over the year column, in load order
+        candidates = [
+            state.individual_ids[i]
+            for i in columns.positions_born_between(year - year_range, year + year_range).tolist()
+        ]
     else:
-        candidates = set(state.individuals.keys())
+        candidates = state.individuals.keys()
 
     place_lower = place.lower() if place else None
 
@@ -306,14 +368,28 @@ def _get_surname_group(surname: str, include_spouses: bool = False) -> dict:
     Returns:
         Dict with surname, count, individuals list, and statistics
     """
-    from .helpers import extract_year
+    count, individuals_data, statistics = _surname_group(surname.lower(), include_spouses)
+    return {
+        "surname": surname,
+        "count": count,
+        "individuals": individuals_data,
+        "statistics": statistics,
+    }
+
 
-    surname_lower = surname.lower()
+@functools.lru_cache(maxsize=1024)
+def _surname_group(surname_lower: str, include_spouses: bool) -> tuple[int, list[dict], dict]:
+    """Members and statistics for a lowercased surname, computed once per loaded tree.
+
+    Returns (count, individuals, statistics); the lists and dicts are shared between
+    calls and must not be mutated.
+    """
     indi_ids = state.surname_index.get(surname_lower, [])
+    members = set(indi_ids)
 
     # Collect individuals
     individuals_data: list[dict] = []
-    spouse_ids: set[str] = set()
+    spouse_ids: dict[str, None] = {}  # ordered set
 
     for indi_id in indi_ids:
         indi = state.individuals.get(indi_id)
@@ -322,11 +398,9 @@ def _get_surname_group(surname: str, include_spouses: bool = False) -> dict:
             # Collect spouse IDs if requested
             if include_spouses:
                 for fam_id in indi.families_as_spouse:
-                    fam = state.families.get(fam_id)
-                    if fam:
-                        spouse_id = fam.wife_id if fam.husband_id == indi_id else fam.husband_id
-                        if spouse_id and spouse_id not in indi_ids:
-                            spouse_ids.add(spouse_id)
+                    spouse_id = state.spouse_of.get((indi_id, fam_id))
+                    if spouse_id and spouse_id not in members:
+                        spouse_ids[spouse_id] = None
 
     # Add spouses if requested
     if include_spouses:
@@ -337,44 +411,35 @@ def _get_surname_group(surname: str, include_spouses: bool = False) -> dict:
                 spouse_data["is_spouse"] = True
                 individuals_data.append(spouse_data)
 
-    # Compute statistics
-    birth_years: list[int] = []
-    places: list[str] = []
+    # Compute statistics from the members' columns
+    positions = [state.individual_index[i] for i in indi_ids if i in state.individual_index]
+    birth_years = columns.birth_years[positions]
+    birth_years = birth_years[birth_years > 0]
+    place_codes = columns.birth_place_codes[positions]
+    place_codes = place_codes[place_codes >= 0]
 
-    for indi_id in indi_ids:
-        indi = state.individuals.get(indi_id)
-        if indi:
-            if indi.birth_date:
-                year = extract_year(indi.birth_date)
-                if year:
-                    birth_years.append(year)
-            if indi.birth_place:
-                places.append(indi.birth_place)
-
-    # Count common places
-    place_counts: dict[str, int] = {}
-    for place in places:
-        place_counts[place] = place_counts.get(place, 0) + 1
-    common_places = sorted(place_counts.items(), key=lambda x: -x[1])[:5]
+    # Count common places (ties in order of first appearance)
+    codes, first_seen, counts = np.unique(place_codes, return_index=True, return_counts=True)
+    top = np.lexsort((first_seen, -counts))[:5]
+    common_places = [(columns.birth_place_names[codes[k]], int(counts[k])) for k in top]
 
     # Estimate generation count from birth year spread
-    if birth_years:
-        year_span = max(birth_years) - min(birth_years)
+    if len(birth_years):
+        year_span = int(birth_years.max()) - int(birth_years.min())
         generation_count = max(1, year_span // 25 + 1)
     else:
         generation_count = 0
 
-    return {
-        "surname": surname,
-        "count": len(indi_ids),
-        "individuals": individuals_data,
-        "statistics": {
-            "earliest_birth": min(birth_years) if birth_years else None,
-            "latest_birth": max(birth_years) if birth_years else None,
-            "common_places": [{"place": p, "count": c} for p, c in common_places],
-            "generation_count": generation_count,
-        },
+    statistics = {
+        "earliest_birth": int(birth_years.min()) if len(birth_years) else None,
+        "latest_birth": int(birth_years.max()) if len(birth_years) else None,
+        "common_places": [{"place": p, "count": c} for p, c in common_places],
+        "generation_count": generation_count,
     }
+    return len(indi_ids), individuals_data, statistics
+
+
+state.register_cache(_surname_group.cache_clear)
 
 
 def _get_surname_origins(surname: str) -> dict:
@@ -391,64 +456,62 @@ def _get_surname_origins(surname: str) -> dict:
     Returns:
         Dict with surname, count, individuals, primary_origin, place_timeline, statistics
     """
-    from .helpers import extract_year
-
-    surname_lower = surname.lower()
-    indi_ids = state.surname_index.get(surname_lower, [])
-
-    # Collect individuals with birth info
-    individuals_data: list[dict] = []
-    place_years: dict[str, list[int]] = {}  # place -> list of birth years
-    all_birth_years: list[int] = []
+    indi_ids = state.surname_index.get(surname.lower(), [])
 
-    for indi_id in indi_ids:
-        indi = state.individuals.get(indi_id)
-        if not indi:
-            continue
-
-        individuals_data.append(indi.to_summary())
-
-        # Track birth year
-        year = extract_year(indi.birth_date) if indi.birth_date else None
-        if year:
-            all_birth_years.append(year)
-
-            # Track place timeline
-            if indi.birth_place:
-                if indi.birth_place not in place_years:
-                    place_years[indi.birth_place] = []
-                place_years[indi.birth_place].append(year)
-
-    # Find primary origin (place with earliest births)
+    # Collect individuals
+    individuals_data = [
+        state.individuals[indi_id].to_summary()
+        for indi_id in indi_ids
+        if indi_id in state.individuals
+    ]
+
+    # Birth years and places from the members' columns
+    positions = [state.individual_index[i] for i in indi_ids if i in state.individual_index]
+    years = columns.birth_years[positions]
+    codes = columns.birth_place_codes[positions]
+    all_birth_years = years[years > 0]
+    dated = (years > 0) & (codes >= 0)
+    years, codes = years[dated], codes[dated]
+
+    # Per place: number of dated births and first appearance among the members
+    place_codes, first_seen, counts = np.unique(codes, return_index=True, return_counts=True)
+
+    # Distinct (place, year) pairs, grouped by place with years ascending
+    order = np.lexsort((years, codes))
+    codes, years = codes[order], years[order]
+    distinct = np.ones(len(codes), dtype=bool)
+    distinct[1:] = (codes[1:] != codes[:-1]) | (years[1:] != years[:-1])
+    codes, years = codes[distinct], years[distinct]
+    starts = np.searchsorted(codes, place_codes)
+    earliest = years[starts]
+    place_years = np.split(years, starts[1:])
+
+    # Places by earliest birth (ties in order of first appearance); the first is the origin
+    by_earliest = np.lexsort((first_seen, earliest)).tolist()
+    place_timeline = {
+        columns.birth_place_names[place_codes[k]]: place_years[k].tolist() for k in by_earliest
+    }
     primary_origin = None
-    earliest_year_overall = None
-    for place, years in place_years.items():
-        earliest = min(years)
-        if earliest_year_overall is None or earliest < earliest_year_overall:
-            earliest_year_overall = earliest
-            primary_origin = {"place": place, "earliest_year": earliest}
-
-    # Build place timeline (sorted years for each place)
-    place_timeline: dict[str, list[int]] = {}
-    for place, years in place_years.items():
-        place_timeline[place] = sorted(set(years))
-
-    # Sort places by earliest year
-    place_timeline = dict(sorted(place_timeline.items(), key=lambda x: min(x[1]) if x[1] else 9999))
+    if by_earliest:
+        k = by_earliest[0]
+        primary_origin = {
+            "place": columns.birth_place_names[place_codes[k]],
+            "earliest_year": int(earliest[k]),
+        }
 
     # Calculate statistics
-    if all_birth_years:
-        earliest_birth = min(all_birth_years)
-        latest_birth = max(all_birth_years)
+    if len(all_birth_years):
+        earliest_birth = int(all_birth_years.min())
+        latest_birth = int(all_birth_years.max())
         span_years = latest_birth - earliest_birth
     else:
         earliest_birth = None
         latest_birth = None
         span_years = 0
 
-    # Get common places sorted by count
-    place_counts = {p: len(years) for p, years in place_years.items()}
-    common_places = sorted(place_counts.items(), key=lambda x: -x[1])[:5]
+    # Get common places sorted by count (ties in order of first appearance)
+    top = np.lexsort((first_seen, -counts))[:5]
+    common_places = [(columns.birth_place_names[place_codes[k]], int(counts[k])) for k in top]
 
     return {
         "surname": surname,
@@ -465,15 +528,20 @@ def _get_surname_origins(surname: str) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=1)
 def _get_statistics() -> dict:
+    """Tree-wide counts and ranges, computed once per loaded tree.
+
+    The result is shared between callers and must not be mutated.
+    """
     # Calculate date ranges
-    birth_years = list(state.birth_year_index.keys())
-    min_year = min(birth_years) if birth_years else None
-    max_year = max(birth_years) if birth_years else None
+    birth_years = columns.birth_years[columns.birth_years > 0]
+    min_year = int(birth_years.min()) if len(birth_years) else None
+    max_year = int(birth_years.max()) if len(birth_years) else None
 
     # Count by sex
-    males = sum(1 for i in state.individuals.values() if i.sex == "M")
-    females = sum(1 for i in state.individuals.values() if i.sex == "F")
+    males = int(np.count_nonzero(columns.sex_codes == columns.SEX_MALE))
+    females = int(np.count_nonzero(columns.sex_codes == columns.SEX_FEMALE))
     unknown_sex = len(state.individuals) - males - females
 
     # Top surnames
@@ -494,6 +562,9 @@ def _get_statistics() -> dict:
     }
 
 
+state.register_cache(_get_statistics.cache_clear)
+
+
 def _get_home_person() -> dict | None:
     """Get the home person (tree owner) record."""
     if state.HOME_PERSON_ID is None:
@@ -510,14 +581,29 @@ def _get_individuals_batch(individual_ids: list[str]) -> dict[str, dict | None]:
     Returns:
         Dict mapping ID → individual data (or None if not found)
     """
+    # Repeated IDs (in either "I1" or "@I1@" form) are resolved once
+    unique_ids = dict.fromkeys(map(_normalize_lookup_id, individual_ids))
     results = {}
-    for id_str in individual_ids:
-        lookup_id = _normalize_lookup_id(id_str)
+    for lookup_id in unique_ids:
         indi = state.individuals.get(lookup_id)
         results[lookup_id] = indi.to_dict() if indi else None
     return results
 
 
+def _get_families_batch(family_ids: list[str]) -> dict[str, dict | None]:
+    """Get multiple families in one call.
+
+    Args:
+        family_ids: List of GEDCOM family IDs to retrieve
+
+    Returns:
+        Dict mapping ID → family data (or None if not found)
+    """
+    # Repeated IDs (in either "F1" or "@F1@" form) are resolved once
+    unique_ids = dict.fromkeys(map(_normalize_lookup_id, family_ids))
+    return {lookup_id: _get_family(lookup_id) for lookup_id in unique_ids}
+
+
 def _build_ancestor_set(individual_id: str, max_generations: int = 10) -> dict[str, list[int]]:
     """Build a set of all ancestors with their generation depths.
 
@@ -552,6 +638,35 @@ def _build_ancestor_set(individual_id: str, max_generations: int = 10) -> dict[s
     return ancestors
 
 
+def _build_ancestor_depths(individual_id: str, max_generations: int = 10) -> dict[str, int]:
+    """Map each ancestor to its closest generation distance (1 = parent).
+
+    Breadth-first over the pedigree arrays, so every ancestor is expanded once even
+    when it is reachable through several lines (pedigree collapse).
+    """
+    start = state.individual_index.get(_normalize_lookup_id(individual_id))
+    if start is None:
+        return {}
+
+    ancestors, generations = pedigree.ancestor_depths(start, max_generations)
+    ids = state.individual_ids
+    return {ids[i]: gen for i, gen in zip(ancestors.tolist(), generations.tolist(), strict=True)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _ancestor_depths(individual_id: str, max_generations: int = 10) -> dict[str, int]:
+    """Memoized _build_ancestor_depths for a normalized ID.
+
+    Relationship and common-ancestor queries re-use one person's ancestry many times
+    (matrices, repeated pair lookups), so each depth map is built once per loaded tree.
+    The returned dict is shared and must not be mutated.
+    """
+    return _build_ancestor_depths(individual_id, max_generations)
+
+
+state.register_cache(_ancestor_depths.cache_clear)
+
+
 def _find_common_ancestors(id1: str, id2: str, max_generations: int = 10) -> dict:
     """Find common ancestors between two individuals.
 
@@ -577,19 +692,16 @@ def _find_common_ancestors(id1: str, id2: str, max_generations: int = 10) -> dic
             "error": "One or both individuals not found",
         }
 
-    # Build ancestor sets for both individuals
-    ancestors1 = _build_ancestor_set(lookup_id1, max_generations)
-    ancestors2 = _build_ancestor_set(lookup_id2, max_generations)
-
-    # Find intersection
-    common_ids = set(ancestors1.keys()) & set(ancestors2.keys())
+    ancestors1 = _ancestor_depths(lookup_id1, max_generations)
+    ancestors2 = _ancestor_depths(lookup_id2, max_generations)
 
     common_ancestors: list[dict[str, str | int]] = []
-    for ancestor_id in common_ids:
+    for ancestor_id, gen1 in ancestors1.items():
+        gen2 = ancestors2.get(ancestor_id)
+        if gen2 is None:
+            continue
         ancestor = state.individuals.get(ancestor_id)
         if ancestor:
-            gen1 = min(ancestors1[ancestor_id])
-            gen2 = min(ancestors2[ancestor_id])
             common_ancestors.append(
                 {
                     "id": ancestor_id,
@@ -694,18 +806,20 @@ def _get_relationship(id1: str, id2: str, max_generations: int | None = 10) -> d
                         if gp_fam and lookup_id1 in (gp_fam.husband_id, gp_fam.wife_id):
                             return {**base_result, "relationship": "grandparent"}
 
-    # Check deep direct ancestry (beyond grandparent)
-    # Build ancestor set for id1 and check if id2 is in it
-    ancestors1 = _build_ancestor_set(lookup_id1, search_depth)
-    if lookup_id2 in ancestors1:
-        gen = min(ancestors1[lookup_id2])
-        return {**base_result, "relationship": _ancestor_name(gen)}
+    # Check deep direct ancestry (beyond grandparent). The pedigree interval labels
+    # rule out most non-lineal pairs without building an ancestor map.
+    index1 = state.individual_index[lookup_id1]
+    index2 = state.individual_index[lookup_id2]
+    if pedigree.may_be_ancestor(index2, index1):
+        ancestors1 = _ancestor_depths(lookup_id1, search_depth)
+        if lookup_id2 in ancestors1:
+            return {**base_result, "relationship": _ancestor_name(ancestors1[lookup_id2])}
 
     # Check if id1 is a direct ancestor of id2
-    ancestors2 = _build_ancestor_set(lookup_id2, search_depth)
-    if lookup_id1 in ancestors2:
-        gen = min(ancestors2[lookup_id1])
-        return {**base_result, "relationship": _descendant_name(gen)}
+    if pedigree.may_be_ancestor(index1, index2):
+        ancestors2 = _ancestor_depths(lookup_id2, search_depth)
+        if lookup_id1 in ancestors2:
+            return {**base_result, "relationship": _descendant_name(ancestors2[lookup_id1])}
 
     # Check aunt/uncle and niece/nephew
     # id2 is aunt/uncle of id1 if id2 is sibling of id1's parent
@@ -731,52 +845,37 @@ def _get_relationship(id1: str, id2: str, max_generations: int | None = 10) -> d
                         if gp_fam and lookup_id1 in gp_fam.children_ids:
                             return {**base_result, "relationship": "aunt/uncle"}
 
-    # Check cousins via common ancestors (reuse already-built ancestor sets)
-    common_ids = set(ancestors1.keys()) & set(ancestors2.keys())
-
-    if common_ids:
-        # Find closest common ancestor
-        closest_id = None
-        closest_gen1 = 0
-        closest_gen2 = 0
-        min_total_gen = float("inf")
-        for ancestor_id in common_ids:
-            gen1 = min(ancestors1[ancestor_id])
-            gen2 = min(ancestors2[ancestor_id])
-            total = gen1 + gen2
-            if total < min_total_gen:
-                min_total_gen = total
-                closest_id = ancestor_id
-                closest_gen1 = gen1
-                closest_gen2 = gen2
-
-        if closest_id:
-            # Cousin calculation
-            # First cousins share grandparents (gen 2 for both)
-            # Second cousins share great-grandparents (gen 3 for both)
-            cousin_degree = min(closest_gen1, closest_gen2) - 1
-            removal = abs(closest_gen1 - closest_gen2)
-
-            if cousin_degree >= 1:
-                ordinal = _ordinal(cousin_degree)
-                if removal == 0:
-                    rel = f"{ordinal} cousin"
-                elif removal == 1:
-                    rel = f"{ordinal} cousin once removed"
-                elif removal == 2:
-                    rel = f"{ordinal} cousin twice removed"
-                else:
-                    rel = f"{ordinal} cousin {removal}x removed"
-
-                ancestor = state.individuals.get(closest_id)
-                return {
-                    **base_result,
-                    "relationship": rel,
-                    "common_ancestor": {
-                        "id": closest_id,
-                        "name": ancestor.full_name() if ancestor else None,
-                    },
-                }
+    # Check cousins via the closest common ancestor
+    closest = pedigree.closest_common_ancestor(index1, index2, search_depth)
+    if closest:
+        closest_index, closest_gen1, closest_gen2 = closest
+        closest_id = state.individual_ids[closest_index]
+        # Cousin calculation
+        # First cousins share grandparents (gen 2 for both)
+        # Second cousins share great-grandparents (gen 3 for both)
+        cousin_degree = min(closest_gen1, closest_gen2) - 1
+        removal = abs(closest_gen1 - closest_gen2)
+
+        if cousin_degree >= 1:
+            ordinal = _ordinal(cousin_degree)
+            if removal == 0:
+                rel = f"{ordinal} cousin"
+            elif removal == 1:
+                rel = f"{ordinal} cousin once removed"
+            elif removal == 2:
+                rel = f"{ordinal} cousin twice removed"
+            else:
+                rel = f"{ordinal} cousin {removal}x removed"
+
+            ancestor = state.individuals.get(closest_id)
+            return {
+                **base_result,
+                "relationship": rel,
+                "common_ancestor": {
+                    "id": closest_id,
+                    "name": ancestor.full_name() if ancestor else None,
+                },
+            }
 
     depth_msg = f"within {search_depth} generations" if max_generations else "in tree"
     return {**base_result, "relationship": f"not related ({depth_msg})"}
@@ -835,11 +934,27 @@ def _descendant_name(gen: int) -> str:
     return f"{_ordinal(gen - 2)} great-grandchild"
 
 
+def _inverse_relationship_name(relationship: str | None) -> str | None:
+    """Name the same relationship from the other person's point of view.
+
+    "grandparent" <-> "grandchild", "aunt/uncle" <-> "niece/nephew", etc.
+    Symmetric relationships (spouse, sibling, cousin, ...) are returned unchanged.
+    """
+    if relationship is None:
+        return None
+    for older, younger in (("parent", "child"), ("aunt/uncle", "niece/nephew")):
+        if relationship.endswith(older):
+            return relationship[: -len(older)] + younger
+        if relationship.endswith(younger):
+            return relationship[: -len(younger)] + older
+    return relationship
+
+
 def _get_relationship_matrix(individual_ids: list[str]) -> dict:
     """Calculate all pairwise relationships for a group of individuals.
 
-    Efficiently computes N×(N-1)/2 relationships by building ancestor sets once
-    and reusing them for all comparisons.
+    Efficiently computes N×(N-1)/2 relationships by running one ancestor BFS per
+    individual and resolving every pair from those depth maps.
 
     Args:
         individual_ids: List of GEDCOM IDs to calculate relationships between
@@ -858,10 +973,10 @@ def _get_relationship_matrix(individual_ids: list[str]) -> dict:
             normalized_ids.append(lookup_id)
             individuals_info.append({"id": lookup_id, "name": indi.full_name()})
 
-    # Build ancestor sets for all individuals once
-    ancestor_cache: dict[str, dict[str, list[int]]] = {}
-    for indi_id in normalized_ids:
-        ancestor_cache[indi_id] = _build_ancestor_set(indi_id, max_generations=10)
+    # One ancestor BFS per individual; every pair is then resolved from these maps
+    ancestor_cache = {
+        indi_id: _ancestor_depths(indi_id, max_generations=10) for indi_id in normalized_ids
+    }
 
     # Calculate pairwise relationships
     relationships: list[dict] = []
@@ -884,11 +999,12 @@ def _get_relationship_matrix(individual_ids: list[str]) -> dict:
 
 
 def _get_relationship_with_cache(
-    id1: str, id2: str, ancestor_cache: dict[str, dict[str, list[int]]]
+    id1: str, id2: str, ancestor_cache: dict[str, dict[str, int]]
 ) -> dict:
-    """Calculate relationship using pre-computed ancestor cache.
+    """Calculate relationship using pre-computed ancestor depth maps.
 
-    This is an optimized version of _get_relationship that uses cached ancestor sets.
+    This is an optimized version of _get_relationship that uses cached ancestor depths
+    (see _build_ancestor_depths).
     """
     indi1 = state.individuals.get(id1)
     indi2 = state.individuals.get(id2)
@@ -960,13 +1076,11 @@ def _get_relationship_with_cache(
     # Check deep direct ancestry (beyond grandparent) using cached ancestors
     ancestors1 = ancestor_cache.get(id1, {})
     if id2 in ancestors1:
-        gen = min(ancestors1[id2])
-        return {**base_result, "relationship": _ancestor_name(gen)}
+        return {**base_result, "relationship": _ancestor_name(ancestors1[id2])}
 
     ancestors2 = ancestor_cache.get(id2, {})
     if id1 in ancestors2:
-        gen = min(ancestors2[id1])
-        return {**base_result, "relationship": _descendant_name(gen)}
+        return {**base_result, "relationship": _descendant_name(ancestors2[id1])}
 
     # Check aunt/uncle and niece/nephew
     if indi1.family_as_child:
@@ -991,37 +1105,33 @@ def _get_relationship_with_cache(
                         if gp_fam and id1 in gp_fam.children_ids:
                             return {**base_result, "relationship": "aunt/uncle"}
 
-    # Check cousins via cached ancestor data (reuse already-fetched ancestors)
-    common_ids = set(ancestors1.keys()) & set(ancestors2.keys())
-
-    if common_ids:
-        # Find closest common ancestor
-        closest = None
-        min_total_gen = float("inf")
-        for ancestor_id in common_ids:
-            gen1 = min(ancestors1[ancestor_id])
-            gen2 = min(ancestors2[ancestor_id])
-            total = gen1 + gen2
-            if total < min_total_gen:
-                min_total_gen = total
-                closest = (ancestor_id, gen1, gen2)
-
-        if closest:
-            _, gen1, gen2 = closest
-            cousin_degree = min(gen1, gen2) - 1
-            removal = abs(gen1 - gen2)
-
-            if cousin_degree >= 1:
-                ordinal = _ordinal(cousin_degree)
-                if removal == 0:
-                    rel = f"{ordinal} cousin"
-                elif removal == 1:
-                    rel = f"{ordinal} cousin once removed"
-                elif removal == 2:
-                    rel = f"{ordinal} cousin twice removed"
-                else:
-                    rel = f"{ordinal} cousin {removal}x removed"
-                return {**base_result, "relationship": rel}
+    # Check cousins: closest common ancestor by probing the smaller depth map
+    # (degree and removal are symmetric, so which side is which doesn't matter)
+    smaller, larger = sorted((ancestors1, ancestors2), key=len)
+    closest = None
+    min_total_gen = float("inf")
+    for ancestor_id, gen in smaller.items():
+        other_gen = larger.get(ancestor_id)
+        if other_gen is not None and gen + other_gen < min_total_gen:
+            min_total_gen = gen + other_gen
+            closest = (gen, other_gen)
+
+    if closest:
+        gen1, gen2 = closest
+        cousin_degree = min(gen1, gen2) - 1
+        removal = abs(gen1 - gen2)
+
+        if cousin_degree >= 1:
+            ordinal = _ordinal(cousin_degree)
+            if removal == 0:
+                rel = f"{ordinal} cousin"
+            elif removal == 1:
+                rel = f"{ordinal} cousin once removed"
+            elif removal == 2:
+                rel = f"{ordinal} cousin twice removed"
+            else:
+                rel = f"{ordinal} cousin {removal}x removed"
+            return {**base_result, "relationship": rel}
 
     return {**base_result, "relationship": "not related (within 10 generations)"}
 
@@ -1045,6 +1155,20 @@ def _traverse(
     depth = min(max(depth, 1), 10)  # Clamp between 1 and 10
 
     results: list[dict] = []
+
+    # Lineal directions walk the pedigree arrays a whole level at a time
+    if direction in ("parents", "children"):
+        start = state.individual_index.get(lookup_id)
+        if start is None:
+            return results
+        nodes, levels = pedigree.bfs_levels(start, depth, towards_parents=direction == "parents")
+        ids = state.individual_ids
+        for i, level in zip(nodes.tolist(), levels.tolist(), strict=True):
+            result = state.individuals[ids[i]].to_summary()
+            result["level"] = level
+            results.append(result)
+        return results
+
     seen: set[str] = {lookup_id}  # Track visited to avoid cycles
 
     def get_related(indi_id: str, dir_type: str) -> list[str]:
@@ -1055,37 +1179,15 @@ def _traverse(
 
         related_ids: list[str] = []
 
-        if dir_type == "parents":
-            if indi.family_as_child:
-                fam = state.families.get(indi.family_as_child)
-                if fam:
-                    if fam.husband_id and fam.husband_id in state.individuals:
-                        related_ids.append(fam.husband_id)
-                    if fam.wife_id and fam.wife_id in state.individuals:
-                        related_ids.append(fam.wife_id)
-
-        elif dir_type == "children":
+        if dir_type == "spouses":
             for fam_id in indi.families_as_spouse:
-                fam = state.families.get(fam_id)
-                if fam:
-                    for child_id in fam.children_ids:
-                        if child_id in state.individuals:
-                            related_ids.append(child_id)
+                spouse_id = state.spouse_of.get((indi_id, fam_id))
+                if spouse_id and spouse_id in state.individuals:
+                    related_ids.append(spouse_id)
 
-        elif dir_type == "spouses":
-            for fam_id in indi.families_as_spouse:
-                fam = state.families.get(fam_id)
-                if fam:
-                    spouse_id = fam.wife_id if fam.husband_id == indi_id else fam.husband_id
-                    if spouse_id and spouse_id in state.individuals:
-                        related_ids.append(spouse_id)
-
-        elif dir_type == "siblings" and indi.family_as_child:
-            fam = state.families.get(indi.family_as_child)
-            if fam:
-                for child_id in fam.children_ids:
-                    if child_id != indi_id and child_id in state.individuals:
-                        related_ids.append(child_id)
+        elif dir_type == "siblings":
+            i = state.individual_index[indi_id]
+            related_ids = [state.individual_ids[s] for s in pedigree.siblings_of(i)]
 
         return related_ids
 
@@ -1119,7 +1221,15 @@ def _detect_pedigree_collapse(individual_id: str, max_generations: int = 10) ->
     Returns:
         Dict with collapse points showing ancestors appearing multiple times
     """
-    lookup_id = _normalize_lookup_id(individual_id)
+    return _pedigree_collapse(_normalize_lookup_id(individual_id), max_generations)
+
+
+@functools.lru_cache(maxsize=256)
+def _pedigree_collapse(lookup_id: str, max_generations: int) -> dict:
+    """Pedigree collapse report for a normalized ID, computed once per loaded tree.
+
+    The report is shared between calls and must not be mutated.
+    """
     indi = state.individuals.get(lookup_id)
 
     if not indi:
@@ -1129,53 +1239,62 @@ def _detect_pedigree_collapse(individual_id: str, max_generations: int = 10) ->
             "error": "Individual not found",
         }
 
-    # Track all paths to each ancestor
-    ancestor_paths: dict[str, list[list[str]]] = {}
-
-    def traverse(indi_id: str, path: list[str], generation: int) -> None:
-        if generation > max_generations:
-            return
-        if indi_id not in state.individuals:
-            return
-
-        current_indi = state.individuals[indi_id]
-        if not current_indi.family_as_child:
-            return
+    # Every visit of every ancestor, depth-first (father's line first), recorded as the
+    # ancestor and the visit it was reached from (-1 for the individual). Only ancestors
+    # visited more than once need their paths spelled out.
+    ids = state.individual_ids
+    visit_nodes: list[int] = []
+    visit_prev: list[int] = []
+    stack: list[tuple[int, int, int]] = []  # (ancestor, previous visit, generation)
+    if max_generations >= 1:
+        root = state.individual_index[lookup_id]
+        stack.extend((parent, -1, 2) for parent in reversed(pedigree.parents_of(root)))
+    while stack:
+        i, prev, generation = stack.pop()
+        visit = len(visit_nodes)
+        visit_nodes.append(i)
+        visit_prev.append(prev)
+        if generation <= max_generations:
+            stack.extend(
+                (parent, visit, generation + 1) for parent in reversed(pedigree.parents_of(i))
+            )
 
-        fam = state.families.get(current_indi.family_as_child)
-        if not fam:
-            return
+    counts = Counter(visit_nodes)  # ancestors in order of first visit
 
-        for parent_id in [fam.husband_id, fam.wife_id]:
-            if parent_id and parent_id in state.individuals:
-                new_path = path + [parent_id]
-                if parent_id not in ancestor_paths:
-                    ancestor_paths[parent_id] = []
-                ancestor_paths[parent_id].append(new_path)
-                traverse(parent_id, new_path, generation + 1)
+    def path_to(visit: int) -> list[str]:
+        path = []
+        while visit >= 0:
+            path.append(ids[visit_nodes[visit]])
+            visit = visit_prev[visit]
+        path.append(lookup_id)
+        return path[::-1]
 
-    traverse(lookup_id, [lookup_id], 1)
+    ancestor_visits: dict[int, list[int]] = {i: [] for i, count in counts.items() if count > 1}
+    for visit, i in enumerate(visit_nodes):
+        if i in ancestor_visits:
+            ancestor_visits[i].append(visit)
 
     # Find collapse points (ancestors with multiple paths)
     # Store occurrence_count separately for sorting
     collapse_data: list[tuple[int, dict]] = []
-    for ancestor_id, paths in ancestor_paths.items():
-        if len(paths) > 1:
-            ancestor = state.individuals.get(ancestor_id)
-            if ancestor:
-                occurrence_count = len(paths)
-                collapse_data.append(
-                    (
-                        occurrence_count,
-                        {
-                            "ancestor_id": ancestor_id,
-                            "ancestor_name": ancestor.full_name(),
-                            "paths": paths,
-                            "generations": [len(p) - 1 for p in paths],
-                            "occurrence_count": occurrence_count,
-                        },
-                    )
+    for ancestor_idx, visits in ancestor_visits.items():
+        ancestor_id = ids[ancestor_idx]
+        ancestor = state.individuals.get(ancestor_id)
+        if ancestor:
+            paths = [path_to(visit) for visit in visits]
+            occurrence_count = len(paths)
+            collapse_data.append(
+                (
+                    occurrence_count,
+                    {
+                        "ancestor_id": ancestor_id,
+                        "ancestor_name": ancestor.full_name(),
+                        "paths": paths,
+                        "generations": [len(p) - 1 for p in paths],
+                        "occurrence_count": occurrence_count,
+                    },
                 )
+            )
 
     # Sort by occurrence count (most collapsed first)
     collapse_data.sort(key=lambda x: -x[0])
@@ -1186,3 +1305,12 @@ def _detect_pedigree_collapse(individual_id: str, max_generations: int = 10) ->
         "collapse_points": collapse_points,
         "total_collapse_ancestors": len(collapse_points),
     }
+
+
+state.register_cache(_pedigree_collapse.cache_clear)
+
+
+def _precompute_pedigree_collapse(max_generations: int = 10) -> None:
+    """Compute the home person's collapse report ahead of the first request for it."""
+    if state.HOME_PERSON_ID in state.individuals:
+        _pedigree_collapse(state.HOME_PERSON_ID, max_generations)
@@ -1,9 +1,14 @@
 """Event-related functions for querying genealogy data."""
 
-from . import state
+import bisect
+import functools
+import re
+from collections.abc import Iterable
+
+from . import columns, state
 from .core import _normalize_lookup_id
 from .helpers import extract_year
-from .models import Event
+from .models import Event, Individual
 
 
 def _get_events(individual_id: str) -> list[dict]:
@@ -26,30 +31,37 @@ def _search_events(
     """Search events by type, place, and/or year."""
     results = []
     place_lower = place.lower() if place else None
-
-    for indi in state.individuals.values():
-        for event in indi.events:
-            # Filter by event type
-            if event_type and event.type != event_type.upper():
-                continue
-
-            # Filter by place
-            if place_lower and (not event.place or place_lower not in event.place.lower()):
-                continue
-
-            # Filter by year
-            if year:
-                event_year = extract_year(event.date)
-                if not event_year or abs(event_year - year) > year_range:
-                    continue
-
-            result = event.to_dict()
-            result["individual_id"] = indi.id
-            result["individual_name"] = indi.full_name()
-            results.append(result)
-
-            if len(results) >= max_results:
-                return results
+    event_type_upper = event_type.upper() if event_type else None
+
+    pairs: Iterable[tuple[Individual, Event]]
+    if year:
+        # Only the year buckets in range can match; sorting keeps full-scan order
+        positions = sorted(
+            position
+            for y in range(year - year_range, year + year_range + 1)
+            for position in state.event_year_index.get(y, ())
+        )
+        indis = (state.individuals[state.individual_ids[i]] for i, _ in positions)
+        pairs = ((indi, indi.events[e]) for indi, (_, e) in zip(indis, positions, strict=True))
+    else:
+        pairs = ((indi, event) for indi in state.individuals.values() for event in indi.events)
+
+    for indi, event in pairs:
+        # Filter by event type
+        if event_type_upper and event.type != event_type_upper:
+            continue
+
+        # Filter by place
+        if place_lower and (not event.place or place_lower not in event.place.lower()):
+            continue
+
+        result = event.to_dict()
+        result["individual_id"] = indi.id
+        result["individual_name"] = indi.full_name()
+        results.append(result)
+
+        if len(results) >= max_results:
+            return results
 
     return results
 
@@ -100,14 +112,9 @@ def _get_timeline(individual_id: str) -> list[dict]:
     if not indi:
         return []
 
-    # Sort events by date (events without dates come last)
-    def sort_key(event: Event) -> tuple[int, str]:
-        year = extract_year(event.date)
-        # Put events without years at the end, sort by year then by date string
-        return (year if year else 9999, event.date or "")
-
-    sorted_events = sorted(indi.events, key=sort_key)
-    return [event.to_dict() for event in sorted_events]
+    # Events were sorted by date at load (events without dates come last)
+    events = indi.events
+    return [events[e].to_dict() for e in columns.timeline_of(state.individual_index[lookup_id])]
 
 
 def _get_family_events(family_id: str) -> list[dict]:
@@ -162,15 +169,13 @@ def _get_events_batch(individual_ids: list[str]) -> dict[str, list[dict]]:
     Returns:
         Dict mapping each ID → list of events (empty list if not found)
     """
-    results: dict[str, list[dict]] = {}
-    for id_str in individual_ids:
-        lookup_id = _normalize_lookup_id(id_str)
-        indi = state.individuals.get(lookup_id)
-        if indi:
-            results[lookup_id] = [event.to_dict() for event in indi.events]
-        else:
-            results[lookup_id] = []
-    return results
+    # Repeated IDs (in either "I1" or "@I1@" form) are resolved once
+    lookup_ids = list(dict.fromkeys(map(_normalize_lookup_id, individual_ids)))
+    indis = [state.individuals.get(lookup_id) for lookup_id in lookup_ids]
+    return {
+        lookup_id: [event.to_dict() for event in indi.events] if indi else []
+        for lookup_id, indi in zip(lookup_ids, indis, strict=True)
+    }
 
 
 def _get_family_timeline(
@@ -181,40 +186,60 @@ def _get_family_timeline(
     """Create merged timeline across multiple individuals.
 
     Args:
-        individual_ids: List of GEDCOM IDs to include
+        individual_ids: List of GEDCOM IDs to include (duplicates are ignored)
         start_year: Optional filter for earliest year
         end_year: Optional filter for latest year
 
     Returns:
         List of events with individual context, sorted chronologically
     """
+    lookup_ids = tuple(dict.fromkeys(map(_normalize_lookup_id, individual_ids)))
+    sort_years, events, undated = _merged_family_events(lookup_ids)
+
+    # The merge is sorted by year, so a year window is a slice; undated events pass
+    # any filter and are taken from wherever they fall outside it
+    lo = bisect.bisect_left(sort_years, start_year) if start_year else 0
+    hi = max(lo, bisect.bisect_right(sort_years, end_year) if end_year else len(events))
+    return (
+        [events[i] for i in undated if i < lo]
+        + events[lo:hi]
+        + [events[i] for i in undated if i >= hi]
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _merged_family_events(lookup_ids: tuple[str, ...]) -> tuple[list[int], list[dict], list[int]]:
+    """All events of the given individuals, merged and sorted, computed once per ID tuple.
+
+    Returns (sort_years, events, undated): each event's sort year (9999 when undated),
+    the event dicts with individual context, and the positions of the undated events.
+    The event dicts are shared between calls and must not be mutated.
+    """
     events = []
-
-    for id_str in individual_ids:
-        lookup_id = _normalize_lookup_id(id_str)
+    for lookup_id in lookup_ids:
         indi = state.individuals.get(lookup_id)
-        if indi:
-            for event in indi.events:
-                event_year = extract_year(event.date)
-
-                # Apply year filters
-                if start_year and event_year and event_year < start_year:
-                    continue
-                if end_year and event_year and event_year > end_year:
-                    continue
-
-                event_dict = event.to_dict()
-                event_dict["individual_id"] = indi.id
-                event_dict["individual_name"] = indi.full_name()
-                events.append(event_dict)
+        if indi is None:
+            continue
+        for event in indi.events:
+            event_dict = event.to_dict()
+            event_dict["individual_id"] = indi.id
+            event_dict["individual_name"] = indi.full_name()
+            events.append((extract_year(event.date), event_dict))
 
     # Sort by date
-    def sort_key(e: dict) -> tuple[int, str]:
-        year = extract_year(e.get("date"))
-        return (year if year else 9999, e.get("date") or "")
+    def sort_key(item: tuple[int | None, dict]) -> tuple[int, str]:
+        year, event_dict = item
+        return (year if year else 9999, event_dict.get("date") or "")
 
     events.sort(key=sort_key)
-    return events
+    return (
+        [year if year else 9999 for year, _ in events],
+        [event_dict for _, event_dict in events],
+        [i for i, (year, _) in enumerate(events) if not year],
+    )
+
+
+state.register_cache(_merged_family_events.cache_clear)
 
 
 # Military-related keywords for detecting service
@@ -278,26 +303,22 @@ _MILITARY_KEYWORDS = {
 }
 
 
+# All keywords in one pattern, so each text is scanned once rather than once per keyword.
+# Texts are lowercased before searching: that is several times faster than re.IGNORECASE,
+# which case-folds every character it compares.
+_MILITARY_PATTERN = re.compile("|".join(sorted(map(re.escape, _MILITARY_KEYWORDS))))
+
+
 def _is_military_event(event: Event) -> bool:
     """Check if an event is military-related."""
     # Check event type
     if event.type in ("MILT", "SERV", "_MILT", "_SERV"):
         return True
 
-    # Check description for military keywords
-    description = (event.description or "").lower()
-    for keyword in _MILITARY_KEYWORDS:
-        if keyword in description:
-            return True
-
-    # Check notes for military keywords
-    for note in event.notes:
-        note_lower = note.lower()
-        for keyword in _MILITARY_KEYWORDS:
-            if keyword in note_lower:
-                return True
-
-    return False
+    # Check description and notes for military keywords
+    if event.description and _MILITARY_PATTERN.search(event.description.lower()):
+        return True
+    return any(_MILITARY_PATTERN.search(note.lower()) for note in event.notes)
 
 
 def _get_military_service() -> dict:
@@ -0,0 +1,172 @@
+"""Latitude-sorted spatial index over geocoded places for radius queries.
+
+Geocoded places are held in numpy arrays sorted by latitude. A radius query
+binary-searches the latitude band the circle can reach, masks that band by the
+circle's longitude extent, and only then computes great-circle distances for
+the remaining candidates in one vectorized pass, so a search touches the handful
+of nearby places instead of every place in the tree.
+
+Places gain coordinates over time (background geocoding, geocode_place), so each
+writer bumps state.place_coords_version and the index is rebuilt lazily on the
+next query after a change.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from haversine import Unit
+
+from . import state
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Mean Earth radius and unit conversions, as used by the haversine package
+_EARTH_RADIUS_KM = 6371.0088
+_EARTH_RADIUS = {Unit.KILOMETERS: _EARTH_RADIUS_KM, Unit.MILES: _EARTH_RADIUS_KM * 0.621371192}
+
+# Coordinates are stored as float32: ~1e-5 degrees (about a metre) of resolution, far
+# finer than geocoding accuracy, at half the memory traffic of float64. The candidate
+# window is widened by this margin so float32 rounding never drops a boundary place;
+# distances are checked afterwards.
+_WINDOW_SLACK_DEG = 1e-4
+
+
+class _PlaceIndex(NamedTuple):
+    version: int
+    place_ids: list[str]  # geocoded places, sorted by latitude
+    positions: NDArray[np.int32]  # each place's position in state.places
+    latitudes: NDArray[np.float32]
+    longitudes: NDArray[np.float32]
+
+
+_index: _PlaceIndex | None = None
+
+
+def _build_index() -> _PlaceIndex:
+    """Snapshot the coordinates of every geocoded place, sorted by latitude."""
+    version = state.place_coords_version
+    rows = [
+        (pos, place.id, place.latitude, place.longitude)
+        for pos, place in enumerate(state.places.values())
+        if place.latitude is not None and place.longitude is not None
+    ]
+    rows.sort(key=lambda row: row[2])
+    return _PlaceIndex(
+        version=version,
+        place_ids=[row[1] for row in rows],
+        positions=np.array([row[0] for row in rows], dtype=np.int32),
+        latitudes=np.array([row[2] for row in rows], dtype=np.float32),
+        longitudes=np.array([row[3] for row in rows], dtype=np.float32),
+    )
+
+
+def _get_index() -> _PlaceIndex:
+    """The current index, rebuilt if any place has gained coordinates since it was built."""
+    global _index
+    index = _index
+    if index is None or index.version != state.place_coords_version:
+        index = _build_index()
+        _index = index
+    return index
+
+
+def refresh_index() -> None:
+    """Build the index now if places gained coordinates, so the next query doesn't pay for it."""
+    _get_index()
+
+
+@state.register_cache
+def clear_index() -> None:
+    """Drop the index so the next query rebuilds it from state.places."""
+    global _index
+    _index = None
+
+
+def _haversine(
+    lat0: float, lon0: float, lats: NDArray[np.float64], lons: NDArray[np.float64], unit: Unit
+) -> NDArray[np.float64]:
+    """Great-circle distances from one point to many, vectorized haversine() in the given unit."""
+    phi0 = math.radians(lat0)
+    phi = np.radians(lats)
+    dphi = phi - phi0
+    dlambda = np.radians(lons) - math.radians(lon0)
+    d = np.sin(dphi * 0.5) ** 2 + math.cos(phi0) * np.cos(phi) * np.sin(dlambda * 0.5) ** 2
+    return 2 * _EARTH_RADIUS[unit] * np.arcsin(np.sqrt(d))
+
+
+def places_within(
+    center: tuple[float, float], radius: float, unit: Unit = Unit.MILES
+) -> list[tuple[str, float]]:
+    """Geocoded places within radius of center, as (place_id, distance) pairs.
+
+    Distances are haversine distances in the given unit, matching haversine() on each
+    place evaluated at its float32-rounded coordinates (within a metre or so).
+    Places are returned in state.places order.
+    """
+    index = _get_index()
+    if not index.place_ids or radius < 0:
+        return []
+
+    lat0, lon0 = center
+    angle = radius / _EARTH_RADIUS[unit]  # angular radius in radians
+    dlat = math.degrees(angle) + _WINDOW_SLACK_DEG
+    lo = int(np.searchsorted(index.latitudes, lat0 - dlat, side="left"))
+    hi = int(np.searchsorted(index.latitudes, lat0 + dlat, side="right"))
+    if lo >= hi:
+        return []
+
+    band = np.arange(lo, hi)
+    # Longitude half-width of the circle; unbounded if it reaches a pole
+    if angle < math.pi / 2 and abs(lat0) + dlat < 90:
+        dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat0)))))
+        offsets = np.abs((index.longitudes[band] - lon0 + 180.0) % 360.0 - 180.0)
+        band = band[offsets <= dlon + _WINDOW_SLACK_DEG]
+
+    # Trig in float64: float32 would cost about a metre per thousand miles of distance
+    dists = _haversine(
+        lat0,
+        lon0,
+        index.latitudes[band].astype(np.float64),
+        index.longitudes[band].astype(np.float64),
+        unit,
+    )
+    inside = dists <= radius
+    band, dists = band[inside], dists[inside]
+    # Back to state.places order
+    order = np.argsort(index.positions[band], kind="stable")
+    return [
+        (index.place_ids[k], dist)
+        for k, dist in zip(band[order].tolist(), dists[order].tolist(), strict=True)
+    ]
+
+
+def _point_in_bbox(lat: float, lon: float, bbox: dict) -> bool:
+    """Check if a point falls within a bounding box (south, north, west, east), edges included."""
+    return bbox["south"] <= lat <= bbox["north"] and bbox["west"] <= lon <= bbox["east"]
+
+
+def places_in_bbox(bbox: dict) -> list[str]:
+    """Geocoded places inside a bounding box (south, north, west, east), in state.places order.
+
+    Containment is inclusive and checked on each place's stored (unrounded) coordinates.
+    """
+    index = _get_index()
+    lo = int(np.searchsorted(index.latitudes, bbox["south"] - _WINDOW_SLACK_DEG, side="left"))
+    hi = int(np.searchsorted(index.latitudes, bbox["north"] + _WINDOW_SLACK_DEG, side="right"))
+    band = np.arange(lo, hi)
+    lons = index.longitudes[band]
+    band = band[
+        (lons >= bbox["west"] - _WINDOW_SLACK_DEG) & (lons <= bbox["east"] + _WINDOW_SLACK_DEG)
+    ]
+
+    found = []
+    for k in band[np.argsort(index.positions[band], kind="stable")].tolist():
+        place = state.places[index.place_ids[k]]
+        lat, lon = place.latitude, place.longitude
+        if lat is not None and lon is not None and _point_in_bbox(lat, lon, bbox):
+            found.append(place.id)
+    return found
@@ -1,9 +1,16 @@
 """Utility functions for GEDCOM parsing and data manipulation."""
 
+import functools
 import hashlib
 import re
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
 
 import geonamescache
+import jellyfish
 
 from .constants import PLACE_ABBREVIATIONS
 from .models import Place
@@ -21,17 +28,20 @@ def extract_year(date_str: str | None) -> int | None:
 
 
 def normalize_id(ref) -> str | None:
-    """Normalize a GEDCOM reference to a consistent ID string with @ symbols."""
+    """Normalize a GEDCOM reference to a consistent ID string with @ symbols.
+
+    IDs are interned so references share one string object with the record's own key.
+    """
     if ref is None:
         return None
     if hasattr(ref, "xref_id"):
-        return ref.xref_id
+        return sys.intern(ref.xref_id)
     s = str(ref)
     if not s:
         return None
     # Ensure consistent format with @ symbols
     stripped = s.strip("@")
-    return f"@{stripped}@" if stripped else None
+    return sys.intern(f"@{stripped}@") if stripped else None
 
 
 def get_record_value(record, tag: str) -> str | None:
@@ -46,7 +56,7 @@ def get_record_value(record, tag: str) -> str | None:
 
 
 def get_event_details(record, event_tag: str) -> tuple[str | None, str | None]:
-    """Get date and place from an event record."""
+    """Get date and place from an event record; the place is interned."""
     date_val = None
     place_val = None
     try:
@@ -57,16 +67,49 @@ def get_event_details(record, event_tag: str) -> tuple[str | None, str | None]:
                 date_val = str(date_sub.value)
             place_sub = event.sub_tag("PLAC")
             if place_sub and place_sub.value:
-                place_val = str(place_sub.value)
+                place_val = sys.intern(str(place_sub.value))
     except (AttributeError, KeyError):
         pass
     return date_val, place_val
 
 
+def trigrams(text: str) -> set[str]:
+    """Distinct 3-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def build_trigram_index(texts: Iterable[str]) -> dict[str, set[int]]:
+    """Map each trigram to the positions of the texts containing it.
+
+    Texts should already be lowercased; positions follow iteration order.
+    """
+    index: dict[str, set[int]] = defaultdict(set)
+    for position, text in enumerate(texts):
+        for gram in trigrams(text):
+            index[gram].add(position)
+    return dict(index)
+
+
+def trigram_candidates(index: dict[str, set[int]], query: str) -> list[int] | None:
+    """Positions (ascending) whose text may contain query as a substring.
+
+    Every trigram of a substring is a trigram of the text, so this is a superset of the
+    true matches; callers still verify each candidate. Returns None when the query is
+    shorter than three characters and the index can't narrow the search.
+    """
+    grams = trigrams(query)
+    if not grams:
+        return None
+    postings = sorted((index.get(gram, set()) for gram in grams), key=len)
+    return sorted(postings[0].intersection(*postings[1:]))
+
+
+@functools.lru_cache(maxsize=65536)
 def normalize_place_string(place: str) -> str:
     """Normalize a place string for matching.
 
-    Applies lowercasing, abbreviation expansion, and whitespace cleanup.
+    Applies lowercasing, abbreviation expansion, and whitespace cleanup. Memoized: the
+    same few place strings recur across every event and many queries.
     """
     result = place.lower().strip()
 
@@ -87,12 +130,52 @@ def parse_place_components(place: str) -> list[str]:
     return components
 
 
+@functools.lru_cache(maxsize=65536)
 def get_place_id(place: str) -> str:
-    """Generate a unique ID for a place based on its normalized form."""
+    """Generate a unique ID for a place based on its normalized form (memoized, see above)."""
     normalized = normalize_place_string(place)
     return hashlib.md5(normalized.encode()).hexdigest()[:12]
 
 
+def gedcom_file_hash(gedcom_file: Path | None) -> str:
+    """SHA256 hash of a GEDCOM file, for invalidating caches built from it."""
+    if gedcom_file is None:
+        return ""
+    with open(gedcom_file, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def gedcom_file_stamp(gedcom_file: Path | None) -> list[int]:
+    """[mtime in ns, size] of a GEDCOM file: if unchanged, the file need not be rehashed."""
+    if gedcom_file is None:
+        return [0, 0]
+    stat = gedcom_file.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def gedcom_cache_fields(gedcom_file: Path | None) -> dict[str, Any]:
+    """Fields a cache stores to identify the GEDCOM file it was built from."""
+    # Stamp before hashing, so a change in between fails the stamp check on load
+    stamp = gedcom_file_stamp(gedcom_file)
+    return {"gedcom_hash": gedcom_file_hash(gedcom_file), "gedcom_stamp": stamp}
+
+
+def gedcom_cache_valid(gedcom_file: Path | None, data: dict[str, Any]) -> bool:
+    """Whether cache data saved with gedcom_cache_fields() still matches the GEDCOM file.
+
+    The file's mtime and size are checked first; the full hash only when they differ.
+    """
+    if data.get("gedcom_stamp") == gedcom_file_stamp(gedcom_file):
+        return True
+    return data.get("gedcom_hash", "") == gedcom_file_hash(gedcom_file)
+
+
+def place_phonetic_key(place: str) -> str | None:
+    """Metaphone code of a place's first word (usually the city), or None if it has none."""
+    words = place.split(",")[0].strip().split()
+    return jellyfish.metaphone(words[0]) if words else None
+
+
 def create_place(place_str: str) -> Place:
     """Create a Place object from a place string."""
     place_id = get_place_id(place_str)
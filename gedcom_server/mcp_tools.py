@@ -1,30 +1,194 @@
 """MCP tool definitions for the GEDCOM genealogy server."""
 
+import functools
+import typing
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from fastmcp.tools import ToolResult
+from mcp.types import TextContent
+
+from . import state
 from .associates import _find_associates
 from .core import (
     _detect_pedigree_collapse,
     _get_ancestors,
     _get_children,
     _get_descendants,
+    _get_families_batch,
     _get_family,
     _get_home_person,
     _get_individual,
+    _get_individuals_batch,
     _get_parents,
     _get_relationship,
     _get_siblings,
     _get_spouses,
     _get_statistics,
     _get_surname_origins,
+    _inverse_relationship_name,
+    _normalize_lookup_id,
     _search_individuals,
     _traverse,
 )
 from .events import _get_military_service, _get_timeline
-from .narrative import _get_biography
+from .narrative import _get_biographies_batch, _get_biography
 from .places import _get_place_cluster
 from .query import _query
 from .semantic import _semantic_search
 from .spatial import _search_nearby
 
+# lru_cache-wrapped tool functions (cached_tool() lookups and searches), cleared by
+# clear_all_caches()
+_tool_caches: list[Any] = []
+
+
+def cached_tool(maxsize: int = 4096) -> Callable[[Callable[[str], Any]], Callable[[str], Any]]:
+    """Memoize a read-only single-ID lookup on its normalized GEDCOM ID.
+
+    "I123" and "@I123@" share one cache entry. Cached results are shared between
+    callers and must not be mutated.
+    """
+
+    def decorator(func: Callable[[str], Any]) -> Callable[[str], Any]:
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        _tool_caches.append(cached)
+
+        @functools.wraps(func)
+        def wrapper(record_id: str) -> Any:
+            return cached(_normalize_lookup_id(record_id))
+
+        return wrapper
+
+    return decorator
+
+
+def json_result(func: Callable[..., Any], *, plain: bool = False) -> Callable[..., Any]:
+    """Serialize a tool's (large) result with orjson instead of FastMCP's pydantic passes.
+
+    FastMCP converts a returned value to JSON-compatible data, dumps it for the text
+    content and then re-validates it as structured content; for bulk results (trees,
+    search hits) that dominates the call. The wrapper returns a ready ToolResult with
+    the same text and structured content, so clients see no difference. The wrapped
+    function keeps its signature, so the tool's output schema is unchanged.
+
+    Memoized tools return the same object for repeated calls; the most recent result
+    is kept with its payload, so returning that payload again skips re-encoding.
+
+    With plain=True the payload must already be plain JSON data (dicts with str keys,
+    lists, str, numbers, bool, None); it then serves as the structured content itself
+    instead of a decoded copy, so a large result is not held twice.
+    """
+    # FastMCP wraps non-object results as {"result": ...}; only a dict return type
+    # (plain or parameterized) produces an object output schema.
+    hint = typing.get_type_hints(func).get("return")
+    wrap = (typing.get_origin(hint) or hint) is not dict
+
+    # (payload, result) of the latest call; holding the payload keeps its identity unique
+    last: tuple[Any, ToolResult] | None = None
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        nonlocal last
+        payload = func(*args, **kwargs)
+        previous = last
+        if previous is not None and previous[0] is payload:
+            return previous[1]
+
+        text = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        structured = payload if plain else orjson.loads(text)
+        # FastMCP sends no content block for None or an empty list
+        empty = payload is None or (isinstance(payload, list | tuple) and not payload)
+        content = [] if empty else [TextContent(type="text", text=text.decode())]
+        # model_construct: the payload is already plain JSON data, skip re-validation
+        result = ToolResult.model_construct(
+            content=content,
+            structured_content={"result": structured} if wrap else structured,
+            meta={"fastmcp": {"wrap_result": True}} if wrap else None,
+            is_error=False,
+        )
+        last = (payload, result)
+        return result
+
+    return wrapper
+
+
+# Single-ID lookups keep their encoded tool result, so a repeated call for an ID skips
+# both the lookup and FastMCP's result conversion
+_cached_individual = cached_tool()(json_result(_get_individual))
+_cached_biography = cached_tool()(json_result(_get_biography, plain=True))
+_cached_family = cached_tool()(json_result(_get_family))
+_cached_parents = cached_tool()(json_result(_get_parents))
+_cached_children = cached_tool()(json_result(_get_children))
+_cached_spouses = cached_tool()(json_result(_get_spouses))
+_cached_siblings = cached_tool()(json_result(_get_siblings))
+_cached_timeline = cached_tool()(json_result(_get_timeline))
+
+
+# Search results for a loaded tree, keyed on the tool arguments. Name search is
+# case-insensitive, so it is keyed on the lowercased query; the other searches echo
+# the query back in their result and are keyed on it verbatim.
+@functools.lru_cache(maxsize=512)
+def _cached_search_individuals(name_lower: str, max_results: int) -> list[dict]:
+    return _search_individuals(name_lower, max_results)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_place_cluster(place: str, max_results: int) -> dict:
+    return _get_place_cluster(place, max_results)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_surname_origins(surname: str) -> dict:
+    return _get_surname_origins(surname)
+
+
+_tool_caches.extend([_cached_search_individuals, _cached_place_cluster, _cached_surname_origins])
+
+
+@functools.lru_cache(maxsize=16384)
+def _cached_relationship(id1: str, id2: str, max_generations: int | None) -> dict:
+    """Relationship for a canonically ordered (id1 <= id2) pair of normalized IDs."""
+    return _get_relationship(id1, id2, max_generations)
+
+
+def _relationship(id1: str, id2: str, max_generations: int | None) -> dict:
+    """Memoized _get_relationship() sharing one cache entry per unordered pair."""
+    lookup_id1 = _normalize_lookup_id(id1)
+    lookup_id2 = _normalize_lookup_id(id2)
+    if lookup_id1 <= lookup_id2:
+        return _cached_relationship(lookup_id1, lookup_id2, max_generations)
+
+    # Computed as (id2, id1): swap the individuals back and relabel asymmetric roles
+    result = _cached_relationship(lookup_id2, lookup_id1, max_generations)
+    return {
+        **result,
+        "individual_1": result["individual_2"],
+        "individual_2": result["individual_1"],
+        "relationship": _inverse_relationship_name(result["relationship"]),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_home_person() -> dict | None:
+    """Home person record, computed once per loaded tree."""
+    return _get_home_person()
+
+
+def clear_home_person_cache() -> None:
+    """Forget the cached home person (called when a new GEDCOM is loaded)."""
+    _cached_home_person.cache_clear()
+
+
+@state.register_cache
+def clear_all_caches() -> None:
+    """Drop every tool-level cache (called when a new GEDCOM is loaded)."""
+    clear_home_person_cache()
+    _cached_relationship.cache_clear()
+    for cached in _tool_caches:
+        cached.cache_clear()
+
 
 def register_tools(mcp):
     """Register all MCP tools with the server."""
@@ -42,9 +206,10 @@ def register_tools(mcp):
         Returns:
             Full individual record for the home person
         """
-        return _get_home_person()
+        return _cached_home_person()
 
     @mcp.tool()
+    @json_result
     def get_statistics() -> dict:
         """
         Get statistics about the genealogy tree.
@@ -57,7 +222,7 @@ def register_tools(mcp):
         """
         return _get_statistics()
 
-    # ============== LOOKUP TOOLS (3) ==============
+    # ============== LOOKUP TOOLS (6) ==============
 
     @mcp.tool()
     def get_individual(individual_id: str) -> dict | None:
@@ -73,7 +238,7 @@ def register_tools(mcp):
         Returns:
             Individual record with name, dates, places, and family IDs
         """
-        return _get_individual(individual_id)
+        return _cached_individual(individual_id)
 
     @mcp.tool()
     def get_biography(individual_id: str) -> dict | None:
@@ -96,7 +261,7 @@ def register_tools(mcp):
         Returns:
             Complete biography dict or None if not found
         """
-        return _get_biography(individual_id)
+        return _cached_biography(individual_id)
 
     @mcp.tool()
     def get_family(family_id: str) -> dict | None:
@@ -111,7 +276,57 @@ def register_tools(mcp):
         Returns:
             Family record with husband, wife, children IDs and marriage info
         """
-        return _get_family(family_id)
+        return _cached_family(family_id)
+
+    @mcp.tool()
+    @json_result
+    def get_individuals(individual_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Get basic details for several individuals in one call.
+
+        Same records as get_individual(), for fetching a whole generation or
+        search result set without a round trip per person.
+
+        Args:
+            individual_ids: GEDCOM IDs (e.g., ["I123", "@I456@"])
+
+        Returns:
+            Dict mapping each normalized ID to its record (or None if not found)
+        """
+        return _get_individuals_batch(individual_ids)
+
+    @mcp.tool()
+    @json_result
+    def get_biographies(individual_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Get comprehensive narrative packages for several people in one call.
+
+        Same content as get_biography() for each person. Heavy - prefer
+        get_individuals() when scanning many people.
+
+        Args:
+            individual_ids: GEDCOM IDs (e.g., ["I123", "@I456@"])
+
+        Returns:
+            Dict mapping each normalized ID to its biography (or None if not found)
+        """
+        return _get_biographies_batch(individual_ids)
+
+    @mcp.tool()
+    @json_result
+    def get_families(family_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Get several family units in one call.
+
+        Same records as get_family() for each family.
+
+        Args:
+            family_ids: GEDCOM family IDs (e.g., ["F123", "@F456@"])
+
+        Returns:
+            Dict mapping each normalized ID to its family record (or None if not found)
+        """
+        return _get_families_batch(family_ids)
 
     # ============== NAVIGATION TOOLS (6) ==============
 
@@ -126,7 +341,7 @@ def register_tools(mcp):
         Returns:
             Dictionary with father and mother info, or None if not found
         """
-        return _get_parents(individual_id)
+        return _cached_parents(individual_id)
 
     @mcp.tool()
     def get_children(individual_id: str) -> list[dict]:
@@ -139,7 +354,7 @@ def register_tools(mcp):
         Returns:
             List of children with summary info
         """
-        return _get_children(individual_id)
+        return _cached_children(individual_id)
 
     @mcp.tool()
     def get_spouses(individual_id: str) -> list[dict]:
@@ -152,7 +367,7 @@ def register_tools(mcp):
         Returns:
             List of spouses with summary info and marriage details
         """
-        return _get_spouses(individual_id)
+        return _cached_spouses(individual_id)
 
     @mcp.tool()
     def get_siblings(individual_id: str) -> list[dict]:
@@ -165,9 +380,10 @@ def register_tools(mcp):
         Returns:
             List of siblings with summary info
         """
-        return _get_siblings(individual_id)
+        return _cached_siblings(individual_id)
 
     @mcp.tool()
+    @json_result
     def get_ancestors(
         individual_id: str,
         generations: int = 4,
@@ -194,6 +410,7 @@ def register_tools(mcp):
         return _get_ancestors(individual_id, generations, filter)
 
     @mcp.tool()
+    @json_result
     def get_descendants(individual_id: str, generations: int = 4) -> dict:
         """
         Get descendant tree up to N generations.
@@ -210,6 +427,7 @@ def register_tools(mcp):
     # ============== SEARCH TOOLS (1) ==============
 
     @mcp.tool()
+    @json_result
     def search_individuals(name: str, max_results: int = 50) -> list[dict]:
         """
         Search for individuals by name (partial match on given name or surname).
@@ -221,7 +439,7 @@ def register_tools(mcp):
         Returns:
             List of matching individuals with summary info
         """
-        return _search_individuals(name, max_results)
+        return _cached_search_individuals(name.lower(), max_results)
 
     # ============== RELATIONSHIP TOOLS (2) ==============
 
@@ -256,7 +474,7 @@ def register_tools(mcp):
             get_relationship("@I123@", "@I456@")  # Default 10-generation search
             get_relationship("@I123@", "@I456@", null)  # Unlimited search depth
         """
-        return _get_relationship(id1, id2, max_generations)
+        return _relationship(id1, id2, max_generations)
 
     @mcp.tool()
     def detect_pedigree_collapse(individual_id: str, max_generations: int = 10) -> dict:
@@ -280,6 +498,7 @@ def register_tools(mcp):
     # ============== PRIMITIVES (1) ==============
 
     @mcp.tool()
+    @json_result
     def traverse(
         individual_id: str,
         direction: str,
@@ -375,6 +594,7 @@ def register_tools(mcp):
     # ============== GIS SEARCH (1) ==============
 
     @mcp.tool()
+    @json_result
     def search_nearby(
         location: str,
         radius_miles: float = 50,
@@ -445,7 +665,7 @@ def register_tools(mcp):
         Returns:
             List of events sorted chronologically, each with type, date, place, description
         """
-        return _get_timeline(individual_id)
+        return _cached_timeline(individual_id)
 
     @mcp.tool()
     def get_military_service() -> dict:
@@ -471,6 +691,7 @@ def register_tools(mcp):
     # ============== PLACE ANALYSIS (1) ==============
 
     @mcp.tool()
+    @json_result
     def get_place_cluster(place: str, max_results: int = 100) -> dict:
         """
         Get all individuals connected to a location with event breakdown.
@@ -493,11 +714,12 @@ def register_tools(mcp):
             - place_variants: Similar place spellings found in tree
             - event_breakdown: Counts by event type (BIRT, DEAT, RESI, etc.)
         """
-        return _get_place_cluster(place, max_results)
+        return _cached_place_cluster(place, max_results)
 
     # ============== SURNAME ANALYSIS (1) ==============
 
     @mcp.tool()
+    @json_result
     def get_surname_origins(surname: str) -> dict:
         """
         Analyze surname distribution and detect geographic origins.
@@ -520,11 +742,12 @@ def register_tools(mcp):
             - place_timeline: Place → [years] showing spread over time
             - statistics: earliest/latest birth, span, common places
         """
-        return _get_surname_origins(surname)
+        return _cached_surname_origins(surname)
 
     # ============== ASSOCIATES / FAN CLUB (1) ==============
 
     @mcp.tool()
+    @json_result
     def find_associates(
         individual_id: str,
         place: str | None = None,
@@ -3,7 +3,7 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Individual:
     id: str
     given_name: str = ""
@@ -17,10 +17,15 @@ class Individual:
     families_as_spouse: list[str] = field(default_factory=list)  # FAMS references
     events: list["Event"] = field(default_factory=list)  # All life events
     notes: list[str] = field(default_factory=list)  # Biographical notes
+    # Joined once at construction; names are not changed after parsing
+    _full_name: str = field(init=False, repr=False, compare=False)
 
-    def full_name(self) -> str:
+    def __post_init__(self) -> None:
         parts = [self.given_name, self.surname]
-        return " ".join(p for p in parts if p)
+        self._full_name = " ".join(p for p in parts if p)
+
+    def full_name(self) -> str:
+        return self._full_name
 
     def to_dict(self) -> dict:
         return {
@@ -48,7 +53,7 @@ class Individual:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Family:
     id: str
     husband_id: str | None = None
@@ -68,7 +73,7 @@ class Family:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Source:
     id: str
     title: str | None = None
@@ -96,13 +101,15 @@ class Source:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Citation:
     source_id: str
     source_title: str | None = None
     page: str | None = None
     text: str | None = None
     url: str | None = None
+    # Built on first use; citations are not changed after parsing
+    _biography_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         return {
@@ -113,8 +120,24 @@ class Citation:
             "url": self.url,
         }
 
+    def to_biography_dict(self) -> dict:
+        """Compact form used in biographies: the source plus whichever details are set.
+
+        The same dict is returned on every call and must not be mutated.
+        """
+        if self._biography_dict is None:
+            data: dict = {"source": self.source_title or self.source_id}
+            if self.page:
+                data["page"] = self.page
+            if self.text:
+                data["text"] = self.text
+            if self.url:
+                data["url"] = self.url
+            self._biography_dict = data
+        return self._biography_dict
 
-@dataclass
+
+@dataclass(slots=True)
 class Repository:
     id: str
     name: str | None = None
@@ -130,7 +153,7 @@ class Repository:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     type: str  # BIRT, DEAT, RESI, OCCU, IMMI, etc.
     date: str | None = None
@@ -138,6 +161,9 @@ class Event:
     description: str | None = None  # For EVEN type records
     citations: list[Citation] = field(default_factory=list)
     notes: list[str] = field(default_factory=list)
+    place_id: str | None = None  # get_place_id(place), set by parse_event
+    # Built on first use; events are not changed after parsing
+    _biography_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
         return {
@@ -149,8 +175,24 @@ class Event:
             "notes": self.notes,
         }
 
+    def to_biography_dict(self) -> dict:
+        """Form used in biographies: optional details and citations only when present.
+
+        The same dict is returned on every call and must not be mutated.
+        """
+        if self._biography_dict is None:
+            data: dict = {"type": self.type, "date": self.date, "place": self.place}
+            if self.description:
+                data["description"] = self.description
+            if self.notes:
+                data["notes"] = self.notes
+            if self.citations:
+                data["citations"] = [c.to_biography_dict() for c in self.citations]
+            self._biography_dict = data
+        return self._biography_dict
+
 
-@dataclass
+@dataclass(slots=True)
 class Place:
     """A unique place with normalized form and optional coordinates."""
 
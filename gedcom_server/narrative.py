@@ -1,7 +1,42 @@
 """Narrative content functions for LLM-friendly biography generation."""
 
+import bisect
+import functools
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
 from . import state
 from .core import _normalize_lookup_id
+from .helpers import trigram_candidates
+from .models import Citation, Event, Individual
+from .pedigree import children_of
+
+
+def _vital_template(flags: int) -> str:
+    """Format string for a vital summary, e.g. "Born {bd} in {bp}. Died {dd}."
+
+    flags has a bit set for each known fact: birth date (8), birth place (4),
+    death date (2) and death place (1).
+    """
+    parts = []
+    for verb, date, place, date_bit, place_bit in (
+        ("Born", "bd", "bp", 8, 4),
+        ("Died", "dd", "dp", 2, 1),
+    ):
+        if flags & (date_bit | place_bit):
+            part = verb
+            if flags & date_bit:
+                part += f" {{{date}}}"
+            if flags & place_bit:
+                part += f" in {{{place}}}"
+            parts.append(part)
+    return ". ".join(parts) + "." if parts else ""
+
+
+_VITAL_TEMPLATES = tuple(_vital_template(flags) for flags in range(16))
 
 
 def _get_biography(individual_id: str) -> dict | None:
@@ -13,29 +48,28 @@ def _get_biography(individual_id: str) -> dict | None:
     - Family context with names (not IDs)
     - All events with full citation details including URLs
     - All biographical notes
+
+    Built once per normalized ID (or for everyone at load, see
+    build_all_biographies) and shared by every caller (the get_biography tool,
+    batch lookups and the query agent); the result must not be mutated.
     """
     lookup_id = _normalize_lookup_id(individual_id)
+    if state.biographies:
+        return state.biographies.get(lookup_id)
+    return _biography(lookup_id)
+
+
+@functools.lru_cache(maxsize=4096)
+def _biography(lookup_id: str) -> dict | None:
+    """Build the biography for a normalized ID (see _get_biography)."""
     indi = state.individuals.get(lookup_id)
     if not indi:
         return None
 
-    # Build vital summary
-    vital_parts = []
-    if indi.birth_date or indi.birth_place:
-        birth_info = "Born"
-        if indi.birth_date:
-            birth_info += f" {indi.birth_date}"
-        if indi.birth_place:
-            birth_info += f" in {indi.birth_place}"
-        vital_parts.append(birth_info)
-    if indi.death_date or indi.death_place:
-        death_info = "Died"
-        if indi.death_date:
-            death_info += f" {indi.death_date}"
-        if indi.death_place:
-            death_info += f" in {indi.death_place}"
-        vital_parts.append(death_info)
-    vital_summary = ". ".join(vital_parts) + "." if vital_parts else ""
+    # Build vital summary from the template for the facts that are known
+    bd, bp, dd, dp = indi.birth_date, indi.birth_place, indi.death_date, indi.death_place
+    flags = bool(bd) << 3 | bool(bp) << 2 | bool(dd) << 1 | bool(dp)
+    vital_summary = _VITAL_TEMPLATES[flags].format(bd=bd, bp=bp, dd=dd, dp=dp)
 
     # Get parents' names
     parents = []
@@ -52,7 +86,7 @@ def _get_biography(individual_id: str) -> dict | None:
     for fam_id in indi.families_as_spouse:
         fam = state.families.get(fam_id)
         if fam:
-            spouse_id = fam.wife_id if fam.husband_id == lookup_id else fam.husband_id
+            spouse_id = state.spouse_of[(lookup_id, fam_id)]
             if spouse_id and spouse_id in state.individuals:
                 spouse_data = {"name": state.individuals[spouse_id].full_name()}
                 if fam.marriage_date:
@@ -61,47 +95,13 @@ def _get_biography(individual_id: str) -> dict | None:
                     spouse_data["marriage_place"] = fam.marriage_place
                 spouses_info.append(spouse_data)
 
-    # Get children's names
-    children_names = []
-    seen_children = set()
-    for fam_id in indi.families_as_spouse:
-        fam = state.families.get(fam_id)
-        if fam:
-            for child_id in fam.children_ids:
-                if child_id not in seen_children and child_id in state.individuals:
-                    seen_children.add(child_id)
-                    children_names.append(state.individuals[child_id].full_name())
+    # Get children's names, each child once across all families
+    ids = state.individual_ids
+    children = dict.fromkeys(children_of(state.individual_index[lookup_id]))
+    children_names = [state.individuals[ids[c]].full_name() for c in children]
 
-    # Build events with full citation details
-    events_data: list[dict] = []
-    for event in indi.events:
-        event_dict: dict = {
-            "type": event.type,
-            "date": event.date,
-            "place": event.place,
-        }
-        if event.description:
-            event_dict["description"] = event.description
-        if event.notes:
-            event_dict["notes"] = event.notes
-
-        # Include citations with full details
-        citations_data: list[dict] = []
-        for citation in event.citations:
-            cite_data: dict = {
-                "source": citation.source_title or citation.source_id,
-            }
-            if citation.page:
-                cite_data["page"] = citation.page
-            if citation.text:
-                cite_data["text"] = citation.text
-            if citation.url:
-                cite_data["url"] = citation.url
-            citations_data.append(cite_data)
-        if citations_data:
-            event_dict["citations"] = citations_data
-
-        events_data.append(event_dict)
+    # Events with full citation details, each built once and shared between rebuilds
+    events_data = [event.to_biography_dict() for event in indi.events]
 
     return {
         "id": indi.id,
@@ -118,6 +118,40 @@ def _get_biography(individual_id: str) -> dict | None:
     }
 
 
+state.register_cache(_biography.cache_clear)
+
+
+def prebuild_enabled() -> bool:
+    """Check if biographies are built for everyone at load via environment variable."""
+    return os.getenv("BIOGRAPHY_PREBUILD_ENABLED", "false").lower() == "true"
+
+
+def build_all_biographies() -> None:
+    """Build the biography of every individual into state.biographies.
+
+    Called at startup after GEDCOM parsing. Trades load time and memory (a
+    biography per individual) for get_biography becoming a dict lookup, so it
+    is off unless BIOGRAPHY_PREBUILD_ENABLED is true.
+    """
+    state.biographies.clear()
+    if not prebuild_enabled():
+        return
+    for indi_id in state.individuals:
+        biography = _biography.__wrapped__(indi_id)
+        if biography is not None:
+            state.biographies[indi_id] = biography
+
+
+# Maximum threads used to build a batch of biographies on free-threaded Python
+_BATCH_WORKERS = 8
+
+
+def _gil_enabled() -> bool:
+    """Whether the GIL is active (always True before Python 3.13's free-threaded build)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
 def _get_biographies_batch(individual_ids: list[str]) -> dict[str, dict | None]:
     """Get full biographies for multiple individuals in one call.
 
@@ -127,11 +161,19 @@ def _get_biographies_batch(individual_ids: list[str]) -> dict[str, dict | None]:
     Returns:
         Dict mapping each ID → biography dict (or None if not found)
     """
-    results: dict[str, dict | None] = {}
-    for id_str in individual_ids:
-        lookup_id = _normalize_lookup_id(id_str)
-        results[lookup_id] = _get_biography(lookup_id)
-    return results
+    # Repeated IDs (in either "I1" or "@I1@" form) are built once
+    unique_ids = list(dict.fromkeys(map(_normalize_lookup_id, individual_ids)))
+
+    # Biographies are independent read-only builds, but pure-Python work only runs
+    # in parallel when the interpreter isn't holding the GIL
+    if len(unique_ids) > 1 and not _gil_enabled():
+        workers = min(_BATCH_WORKERS, len(unique_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            biographies = list(executor.map(_get_biography, unique_ids))
+    else:
+        biographies = [_get_biography(lookup_id) for lookup_id in unique_ids]
+
+    return dict(zip(unique_ids, biographies, strict=True))
 
 
 def _search_narrative(query: str, max_results: int = 50) -> dict:
@@ -144,76 +186,7 @@ def _search_narrative(query: str, max_results: int = 50) -> dict:
     - Source titles
     """
     query_lower = query.lower()
-    results: list[dict] = []
-
-    for indi in state.individuals.values():
-        if len(results) >= max_results:
-            break
-
-        # Search individual-level notes
-        for note in indi.notes:
-            if query_lower in note.lower():
-                # Create snippet with context
-                snippet = _create_snippet(note, query_lower)
-                results.append(
-                    {
-                        "individual_id": indi.id,
-                        "individual_name": indi.full_name(),
-                        "source": "note",
-                        "snippet": snippet,
-                        "full_text": note,
-                    }
-                )
-                if len(results) >= max_results:
-                    break
-
-        if len(results) >= max_results:
-            break
-
-        # Search event notes and citation text
-        for event in indi.events:
-            if len(results) >= max_results:
-                break
-
-            # Event notes
-            for note in event.notes:
-                if query_lower in note.lower():
-                    snippet = _create_snippet(note, query_lower)
-                    results.append(
-                        {
-                            "individual_id": indi.id,
-                            "individual_name": indi.full_name(),
-                            "source": "event_note",
-                            "event_type": event.type,
-                            "event_date": event.date,
-                            "snippet": snippet,
-                            "full_text": note,
-                        }
-                    )
-                    if len(results) >= max_results:
-                        break
-
-            if len(results) >= max_results:
-                break
-
-            # Citation text
-            for citation in event.citations:
-                if citation.text and query_lower in citation.text.lower():
-                    snippet = _create_snippet(citation.text, query_lower)
-                    results.append(
-                        {
-                            "individual_id": indi.id,
-                            "individual_name": indi.full_name(),
-                            "source": "citation_text",
-                            "event_type": event.type,
-                            "source_title": citation.source_title,
-                            "snippet": snippet,
-                            "full_text": citation.text,
-                        }
-                    )
-                    if len(results) >= max_results:
-                        break
-
+    results = list(islice(_narrative_hits(query_lower), max(max_results, 0)))
     return {
         "query": query,
         "result_count": len(results),
@@ -221,28 +194,96 @@ def _search_narrative(query: str, max_results: int = 50) -> dict:
     }
 
 
-def _create_snippet(text: str, query: str, context_chars: int = 50) -> str:
-    """Create a snippet with the query highlighted and surrounded by context."""
-    text_lower = text.lower()
-    pos = text_lower.find(query)
+def _narrative_hits(query_lower: str) -> Iterator[dict]:
+    """Search results for a lowercased query, in individual and text order."""
+    # Every narrative text sits in one lowercased buffer, so a short query is a single
+    # scan of it; the trigram index narrows longer queries to the candidates' texts
+    offsets = state.narrative_text_offsets
+    candidates = trigram_candidates(state.narrative_trigram_index, query_lower)
+    if candidates is None:
+        hits = _texts_containing(query_lower, 0, len(state.narrative_text_starts))
+    else:
+        hits = chain.from_iterable(
+            _texts_containing(query_lower, offsets[i], offsets[i + 1]) for i in candidates
+        )
+
+    for k, pos in hits:
+        indi = state.individuals[state.individual_ids[bisect.bisect_right(offsets, k) - 1]]
+        source, event, citation, text = state.narrative_sources[k]
+        result: dict[str, str | None] = {
+            "individual_id": indi.id,
+            "individual_name": indi.full_name(),
+            "source": source,
+        }
+        if event is not None:
+            result["event_type"] = event.type
+        if citation is not None:
+            result["source_title"] = citation.source_title
+        elif event is not None:
+            result["event_date"] = event.date
+        result["snippet"] = _create_snippet(text, query_lower, pos=pos)
+        result["full_text"] = text
+        yield result
+
+
+def _narrative_sources(indi: Individual) -> list[tuple[str, Event | None, Citation | None, str]]:
+    """Every text _search_narrative looks at for one individual, in result order.
+
+    Each entry is (source, event, citation, text): individual notes first, then each
+    event's notes followed by the text of its citations.
+    """
+    sources: list[tuple[str, Event | None, Citation | None, str]] = [
+        ("note", None, None, note) for note in indi.notes
+    ]
+    for event in indi.events:
+        sources.extend(("event_note", event, None, note) for note in event.notes)
+        sources.extend(
+            ("citation_text", event, citation, citation.text)
+            for citation in event.citations
+            if citation.text
+        )
+    return sources
+
+
+def _texts_containing(query: str, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+    """Narrative texts lo..hi-1 containing query, as (text index, offset of the first match).
+
+    Texts are located in state.narrative_text by state.narrative_text_starts; a match
+    must lie within a single text.
+    """
+    if lo >= hi:
+        return
+    buffer, starts = state.narrative_text, state.narrative_text_starts
+    end = starts[hi] - 1 if hi < len(starts) else len(buffer)
+    pos = buffer.find(query, starts[lo], end)
+    while pos != -1:
+        k = bisect.bisect_right(starts, pos, lo, hi) - 1
+        text_end = starts[k + 1] - 1 if k + 1 < len(starts) else len(buffer)
+        if pos + len(query) <= text_end:
+            yield k, pos - starts[k]
+        # Any later match in this text starts no earlier, so move on to the next one
+        if k + 1 >= hi:
+            return
+        pos = buffer.find(query, starts[k + 1], end)
+
+
+def _create_snippet(text: str, query: str, context_chars: int = 50, pos: int | None = None) -> str:
+    """Create a snippet with the query highlighted and surrounded by context.
+
+    pos is where the (lowercased) query first occurs in the text, if already known.
+    """
+    if pos is None:
+        pos = text.lower().find(query)
     if pos == -1:
         return text[:100] + "..." if len(text) > 100 else text
 
+    match_end = pos + len(query)
     start = max(0, pos - context_chars)
-    end = min(len(text), pos + len(query) + context_chars)
-
-    snippet = ""
-    if start > 0:
-        snippet += "..."
+    end = min(len(text), match_end + context_chars)
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if end < len(text) else ""
     # Keep original case but mark the match
-    before = text[start:pos]
-    match = text[pos : pos + len(query)]
-    after = text[pos + len(query) : end]
-    snippet += f"{before}**{match}**{after}"
-    if end < len(text):
-        snippet += "..."
-
-    return snippet
+    return f"{prefix}{text[start:pos]}**{text[pos:match_end]}**{text[match_end:end]}{suffix}"
 
 
 def _get_repositories() -> list[dict]:
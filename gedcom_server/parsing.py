@@ -1,12 +1,16 @@
 """GEDCOM file parsing functions."""
 
 import os
+import sys
+from itertools import pairwise
 
 from ged4py import GedcomReader
 
 from . import state
+from .columns import build_columns
 from .constants import EVENT_TAGS
 from .helpers import (
+    build_trigram_index,
     create_place,
     extract_year,
     geocode_place_coords,
@@ -14,8 +18,13 @@ from .helpers import (
     get_place_id,
     get_record_value,
     normalize_id,
+    place_phonetic_key,
 )
 from .models import Citation, Event, Family, Individual, Repository, Source
+from .pedigree import build_pedigree
+
+# Citations read before the source they cite; their titles are filled in after loading
+_pending_citations: list[Citation] = []
 
 
 def parse_citation(cite_record) -> Citation | None:
@@ -29,31 +38,38 @@ def parse_citation(cite_record) -> Citation | None:
         text = None
         url = None
 
-        # Get page reference
-        page_sub = cite_record.sub_tag("PAGE")
+        # Page reference and DATA sub-record, in one pass (the first of each tag counts)
+        page_sub = data_sub = None
+        for sub in cite_record.sub_records:
+            if sub.tag == "PAGE" and page_sub is None:
+                page_sub = sub
+            elif sub.tag == "DATA" and data_sub is None:
+                data_sub = sub
         if page_sub and page_sub.value:
             page = str(page_sub.value)
 
         # Get text/URL from DATA sub-record
-        data_sub = cite_record.sub_tag("DATA")
         if data_sub:
-            text_sub = data_sub.sub_tag("TEXT")
+            text_sub = url_sub = None
+            for sub in data_sub.sub_records:
+                if sub.tag == "TEXT" and text_sub is None:
+                    text_sub = sub
+                elif sub.tag == "WWW" and url_sub is None:
+                    url_sub = sub
             if text_sub and text_sub.value:
                 text = str(text_sub.value)
-            url_sub = data_sub.sub_tag("WWW")
             if url_sub and url_sub.value:
                 url = str(url_sub.value)
 
-        # Look up source title from global sources index (may not be populated yet)
-        source_title = None
+        citation = Citation(source_id=source_id, page=page, text=text, url=url)
 
-        return Citation(
-            source_id=source_id,
-            source_title=source_title,
-            page=page,
-            text=text,
-            url=url,
-        )
+        # Take the title from the sources index; sources later in the file are filled in after
+        source = state.sources.get(source_id)
+        if source:
+            citation.source_title = source.title
+        else:
+            _pending_citations.append(citation)
+        return citation
     except (AttributeError, KeyError):
         return None
 
@@ -68,30 +84,38 @@ def parse_event(event_record) -> Event:
     notes = []
 
     try:
+        # One pass over the sub-records: citations (SOUR references) and notes, plus the
+        # first DATE, PLAC and TYPE
+        date_sub = place_sub = type_sub = None
+        for sub in event_record.sub_records:
+            tag = sub.tag
+            if tag == "SOUR":
+                citation = parse_citation(sub)
+                if citation:
+                    citations.append(citation)
+            elif tag == "NOTE":
+                if sub.value:
+                    notes.append(str(sub.value))
+            elif tag == "DATE":
+                if date_sub is None:
+                    date_sub = sub
+            elif tag == "PLAC":
+                if place_sub is None:
+                    place_sub = sub
+            elif tag == "TYPE" and type_sub is None:
+                type_sub = sub
+
         # Get date
-        date_sub = event_record.sub_tag("DATE")
         if date_sub and date_sub.value:
             date_val = str(date_sub.value)
 
-        # Get place
-        place_sub = event_record.sub_tag("PLAC")
+        # Get place (interned: the same few places recur across thousands of events)
         if place_sub and place_sub.value:
-            place_val = str(place_sub.value)
+            place_val = sys.intern(str(place_sub.value))
 
         # Get description (for EVEN type records)
-        if event_type == "EVEN":
-            type_sub = event_record.sub_tag("TYPE")
-            if type_sub and type_sub.value:
-                description = str(type_sub.value)
-
-        # Parse citations (SOUR references)
-        for sub in event_record.sub_records:
-            if sub.tag == "SOUR":
-                citation = parse_citation(sub)
-                if citation:
-                    citations.append(citation)
-            elif sub.tag == "NOTE" and sub.value:
-                notes.append(str(sub.value))
+        if event_type == "EVEN" and type_sub and type_sub.value:
+            description = str(type_sub.value)
 
     except (AttributeError, KeyError):
         pass
@@ -103,6 +127,7 @@ def parse_event(event_record) -> Event:
         description=description,
         citations=citations,
         notes=notes,
+        place_id=sys.intern(get_place_id(place_val)) if place_val else None,
     )
 
 
@@ -119,8 +144,14 @@ def parse_events_from_record(record) -> list[Event]:
     return events
 
 
+def record_id(record) -> str | None:
+    """The record's xref ID, interned like the references normalize_id() returns."""
+    xref_id = record.xref_id
+    return sys.intern(xref_id) if xref_id else xref_id
+
+
 def parse_name(record) -> tuple[str, str]:
-    """Parse name from GEDCOM record, returning (given_name, surname)."""
+    """Parse name from GEDCOM record, returning (given_name, surname), both interned."""
     given = ""
     surname = ""
     try:
@@ -128,23 +159,290 @@ def parse_name(record) -> tuple[str, str]:
         if name_rec and name_rec.value:
             name_str = str(name_rec.value)
             # GEDCOM format: "Given /Surname/"
-            if "/" in name_str:
-                parts = name_str.split("/")
-                given = parts[0].strip()
-                if len(parts) > 1:
-                    surname = parts[1].strip()
-            else:
-                given = name_str.strip()
-        # Also check for explicit GIVN and SURN tags
-        givn = name_rec.sub_tag("GIVN") if name_rec else None
+            given_part, slash, rest = name_str.partition("/")
+            given = given_part.strip()
+            if slash:
+                surname = rest.partition("/")[0].strip()
+        # Also check for explicit GIVN and SURN tags (the first of each counts)
+        givn = surn = None
+        for sub in name_rec.sub_records if name_rec else ():
+            if sub.tag == "GIVN" and givn is None:
+                givn = sub
+            elif sub.tag == "SURN" and surn is None:
+                surn = sub
         if givn and givn.value:
             given = str(givn.value)
-        surn = name_rec.sub_tag("SURN") if name_rec else None
         if surn and surn.value:
             surname = str(surn.value)
     except (AttributeError, KeyError):
         pass
-    return given, surname
+    return sys.intern(given), sys.intern(surname)
+
+
+def build_search_indexes() -> None:
+    """Build the trigram, year, place and spouse indexes used by search and lookup tools.
+
+    Individual positions refer to state.individual_ids, so build_pedigree() must run first.
+    """
+    indis = [state.individuals[indi_id] for indi_id in state.individual_ids]
+
+    state.name_search_keys[:] = [indi.full_name().lower() for indi in indis]
+    state.name_trigram_index.clear()
+    state.name_trigram_index.update(build_trigram_index(state.name_search_keys))
+
+    # Every narrative text, lowercased, in one buffer; each individual's texts form a run
+    from .narrative import _narrative_sources
+
+    state.narrative_sources.clear()
+    state.narrative_text_offsets[:] = [0]
+    for indi in indis:
+        state.narrative_sources.extend(_narrative_sources(indi))
+        state.narrative_text_offsets.append(len(state.narrative_sources))
+    texts = [text.lower() for *_, text in state.narrative_sources]
+    state.narrative_text = "\n".join(texts)
+    state.narrative_text_starts.clear()
+    offset = 0
+    for text in texts:
+        state.narrative_text_starts.append(offset)
+        offset += len(text) + 1
+    state.narrative_trigram_index.clear()
+    state.narrative_trigram_index.update(
+        build_trigram_index(
+            "\n".join(texts[lo:hi]) for lo, hi in pairwise(state.narrative_text_offsets)
+        )
+    )
+
+    # The other spouse in each family an individual married into
+    state.spouse_of.clear()
+    for indi in indis:
+        for fam_id in indi.families_as_spouse:
+            fam = state.families.get(fam_id)
+            if fam:
+                spouse_id = fam.wife_id if fam.husband_id == indi.id else fam.husband_id
+                state.spouse_of[(indi.id, fam_id)] = spouse_id
+
+    # Events bucketed by year, in scan order (individual position, then event position)
+    state.event_year_index.clear()
+    for i, indi in enumerate(indis):
+        for e, event in enumerate(indi.events):
+            event_year = extract_year(event.date)
+            if event_year:
+                state.event_year_index.setdefault(event_year, []).append((i, e))
+
+    # Individuals by place, each listed once per place in load order
+    state.place_individuals.clear()
+    for indi_id, place_ids in state.individual_places.items():
+        for place_id in dict.fromkeys(place_ids):
+            state.place_individuals.setdefault(place_id, []).append(indi_id)
+
+    # Every indexed place in one buffer, for substring search in a single scan
+    state.place_index_keys[:] = list(state.place_index)
+    state.place_index_text = "\n".join(state.place_index_keys)
+    state.place_index_starts.clear()
+    offset = 0
+    for key in state.place_index_keys:
+        state.place_index_starts.append(offset)
+        offset += len(key) + 1
+
+    # Fuzzy place-match choices, parallel to place_ids
+    state.place_ids[:] = list(state.places)
+    state.place_positions.clear()
+    state.place_positions.update((place_id, k) for k, place_id in enumerate(state.place_ids))
+    state.place_normalized[:] = [place.normalized for place in state.places.values()]
+    state.place_trigram_index.clear()
+    state.place_trigram_index.update(build_trigram_index(state.place_normalized))
+
+    # Places by the metaphone code of their first word, in place order
+    state.place_metaphone.clear()
+    for place in state.places.values():
+        code = place_phonetic_key(place.original)
+        if code is not None:
+            state.place_metaphone.setdefault(code, []).append(place.id)
+
+    state.source_ids[:] = list(state.sources)
+    state.source_trigram_index.clear()
+    state.source_trigram_index.update(
+        build_trigram_index(
+            f"{source.title or ''}\n{source.author or ''}".lower()
+            for source in state.sources.values()
+        )
+    )
+
+    # Every record ID in both accepted spellings ("I1" and "@I1@"), for lookups at the
+    # tool boundary; each maps to what _normalize_lookup_id computes for it
+    from .core import _normalize_lookup_id
+
+    lookup_ids = {
+        form: _normalize_lookup_id(form)
+        for records in (state.individuals, state.families, state.sources, state.repositories)
+        for record_id in records
+        for form in (record_id, record_id.strip("@"))
+    }
+    state.lookup_ids.clear()
+    state.lookup_ids.update(lookup_ids)
+
+
+def _load_repository(record) -> None:
+    """Parse a level-0 REPO record into state.repositories."""
+    repo_id = record_id(record)
+    name = get_record_value(record, "NAME")
+    address = None
+    url = None
+
+    # Get address and URL
+    for sub in record.sub_records:
+        if sub.tag == "ADDR" and sub.value:
+            address = str(sub.value)
+        elif sub.tag == "WWW" and sub.value:
+            url = str(sub.value)
+
+    repo = Repository(
+        id=repo_id,  # type: ignore[arg-type]
+        name=name,
+        address=address,
+        url=url,
+    )
+    state.repositories[repo_id] = repo  # type: ignore[index]
+
+
+def _load_source(record) -> None:
+    """Parse a level-0 SOUR record into state.sources."""
+    source_id = record_id(record)
+    title = get_record_value(record, "TITL")
+    author = get_record_value(record, "AUTH")
+    publication = get_record_value(record, "PUBL")
+    repo_id = None
+    note = None
+
+    # Get repository reference and note
+    for sub in record.sub_records:
+        if sub.tag == "REPO" and sub.value:
+            repo_id = normalize_id(sub.value)
+        elif sub.tag == "NOTE" and sub.value:
+            note = str(sub.value)
+
+    source = Source(
+        id=source_id,  # type: ignore[arg-type]
+        title=title,
+        author=author,
+        publication=publication,
+        repository_id=repo_id,
+        note=note,
+    )
+    state.sources[source_id] = source  # type: ignore[index]
+
+
+def _load_individual(record) -> None:
+    """Parse a level-0 INDI record into state.individuals and the name/year/place indexes."""
+    indi_id = record_id(record)
+    given, surname = parse_name(record)
+
+    # Parse all events with citations and notes; birth and death are the first of each
+    events = parse_events_from_record(record)
+    birth = next((event for event in events if event.type == "BIRT"), None)
+    death = next((event for event in events if event.type == "DEAT"), None)
+    birth_date, birth_place = (birth.date, birth.place) if birth else (None, None)
+    death_date, death_place = (death.date, death.place) if death else (None, None)
+
+    # Get sex, family references and individual-level notes
+    sex_sub = None
+    famc = None
+    fams_list = []
+    indi_notes = []
+    for sub in record.sub_records:
+        if sub.tag == "FAMC" and sub.value:
+            famc = normalize_id(sub.value)
+        elif sub.tag == "FAMS" and sub.value:
+            fams_list.append(normalize_id(sub.value))
+        elif sub.tag == "NOTE" and sub.value:
+            # Individual-level note (level 1) - biographical content
+            indi_notes.append(str(sub.value))
+        elif sub.tag == "SEX" and sex_sub is None:
+            sex_sub = sub
+    sex = str(sex_sub.value) if sex_sub and sex_sub.value else None
+
+    indi = Individual(
+        id=indi_id,  # type: ignore[arg-type]
+        given_name=given,
+        surname=surname,
+        sex=sex,
+        birth_date=birth_date,
+        birth_place=birth_place,
+        death_date=death_date,
+        death_place=death_place,
+        family_as_child=famc,
+        families_as_spouse=fams_list,  # type: ignore[arg-type]
+        events=events,
+        notes=indi_notes,
+    )
+    state.individuals[indi_id] = indi  # type: ignore[index]
+
+    # Build indexes
+    if surname:
+        state.surname_index[surname.lower()].append(indi_id)  # type: ignore[arg-type]
+
+    birth_year = extract_year(birth_date)
+    if birth_year:
+        state.birth_year_index[birth_year].append(indi_id)  # type: ignore[arg-type]
+
+    # Index all places (from birth/death and all events); events carry their place IDs
+    all_places = [
+        (event.place, event.place_id)
+        for event in (birth, death)
+        if event and event.place and event.place_id
+    ]
+    for event in events:
+        if event.place and event.place_id:
+            all_places.append((event.place, event.place_id))
+
+    for place_str, place_id in all_places:
+        # Listed once per place: this individual's IDs are appended consecutively, so a
+        # repeat of the same place is always the last entry
+        indexed = state.place_index[place_str.lower()]
+        if not indexed or indexed[-1] != indi_id:
+            indexed.append(indi_id)  # type: ignore[arg-type]
+
+        # Build Place object and add to places index
+        if place_id not in state.places:
+            state.places[place_id] = create_place(place_str)
+        state.individual_places[indi_id].append(place_id)  # type: ignore[index]
+
+
+def _load_family(record) -> None:
+    """Parse a level-0 FAM record into state.families."""
+    fam_id = record_id(record)
+    husb_id = None
+    wife_id = None
+    child_ids = []
+
+    for sub in record.sub_records:
+        if sub.tag == "HUSB" and sub.value:
+            husb_id = normalize_id(sub.value)
+        elif sub.tag == "WIFE" and sub.value:
+            wife_id = normalize_id(sub.value)
+        elif sub.tag == "CHIL" and sub.value:
+            child_ids.append(normalize_id(sub.value))
+
+    marr_date, marr_place = get_event_details(record, "MARR")
+
+    fam = Family(
+        id=fam_id,  # type: ignore[arg-type]
+        husband_id=husb_id,
+        wife_id=wife_id,
+        children_ids=child_ids,  # type: ignore[arg-type]
+        marriage_date=marr_date,
+        marriage_place=marr_place,
+    )
+    state.families[fam_id] = fam  # type: ignore[index]
+
+
+# Level-0 record tag -> loader; other records (HEAD, NOTE, OBJE, ...) are skipped
+_RECORD_LOADERS = {
+    "REPO": _load_repository,
+    "SOUR": _load_source,
+    "INDI": _load_individual,
+    "FAM": _load_family,
+}
 
 
 def load_gedcom():
@@ -157,159 +455,28 @@ def load_gedcom():
     if not state.GEDCOM_FILE.exists():
         raise FileNotFoundError(f"GEDCOM file not found: {state.GEDCOM_FILE}")
 
+    _pending_citations.clear()
+
+    # One pass over the level-0 records in file order. The tag comes from the reader's
+    # offset index, so records nobody loads are never parsed.
     with GedcomReader(str(state.GEDCOM_FILE)) as reader:
-        # Parse repositories (level-0 REPO records)
-        for record in reader.records0("REPO"):
-            repo_id = record.xref_id
-            name = get_record_value(record, "NAME")
-            address = None
-            url = None
-
-            # Get address and URL
-            for sub in record.sub_records:
-                if sub.tag == "ADDR" and sub.value:
-                    address = str(sub.value)
-                elif sub.tag == "WWW" and sub.value:
-                    url = str(sub.value)
-
-            repo = Repository(
-                id=repo_id,  # type: ignore[arg-type]
-                name=name,
-                address=address,
-                url=url,
-            )
-            state.repositories[repo_id] = repo  # type: ignore[index]
-
-        # Parse sources (level-0 SOUR records)
-        for record in reader.records0("SOUR"):
-            source_id = record.xref_id
-            title = get_record_value(record, "TITL")
-            author = get_record_value(record, "AUTH")
-            publication = get_record_value(record, "PUBL")
-            repo_id = None
-            note = None
-
-            # Get repository reference and note
-            for sub in record.sub_records:
-                if sub.tag == "REPO" and sub.value:
-                    repo_id = normalize_id(sub.value)
-                elif sub.tag == "NOTE" and sub.value:
-                    note = str(sub.value)
-
-            source = Source(
-                id=source_id,  # type: ignore[arg-type]
-                title=title,
-                author=author,
-                publication=publication,
-                repository_id=repo_id,
-                note=note,
-            )
-            state.sources[source_id] = source  # type: ignore[index]
-
-        # Parse individuals
-        for record in reader.records0("INDI"):
-            indi_id = record.xref_id
-            given, surname = parse_name(record)
-            sex = get_record_value(record, "SEX")
-            birth_date, birth_place = get_event_details(record, "BIRT")
-            death_date, death_place = get_event_details(record, "DEAT")
-
-            # Parse all events with citations and notes
-            events = parse_events_from_record(record)
-
-            # Get family references and individual-level notes
-            famc = None
-            fams_list = []
-            indi_notes = []
-            for sub in record.sub_records:
-                if sub.tag == "FAMC" and sub.value:
-                    famc = normalize_id(sub.value)
-                elif sub.tag == "FAMS" and sub.value:
-                    fams_list.append(normalize_id(sub.value))
-                elif sub.tag == "NOTE" and sub.value:
-                    # Individual-level note (level 1) - biographical content
-                    indi_notes.append(str(sub.value))
-
-            indi = Individual(
-                id=indi_id,  # type: ignore[arg-type]
-                given_name=given,
-                surname=surname,
-                sex=sex,
-                birth_date=birth_date,
-                birth_place=birth_place,
-                death_date=death_date,
-                death_place=death_place,
-                family_as_child=famc,
-                families_as_spouse=fams_list,  # type: ignore[arg-type]
-                events=events,
-                notes=indi_notes,
-            )
-            state.individuals[indi_id] = indi  # type: ignore[index]
-
-            # Build indexes
-            if surname:
-                state.surname_index[surname.lower()].append(indi_id)  # type: ignore[arg-type]
-
-            birth_year = extract_year(birth_date)
-            if birth_year:
-                state.birth_year_index[birth_year].append(indi_id)  # type: ignore[arg-type]
-
-            # Index all places (from birth/death and all events)
-            all_places = [birth_place, death_place]
-            for event in events:
-                if event.place:
-                    all_places.append(event.place)
-
-            for place_str in all_places:
-                if place_str:
-                    place_lower = place_str.lower()
-                    state.place_index[place_lower].append(indi_id)  # type: ignore[arg-type]
-
-                    # Build Place object and add to places index
-                    place_id = get_place_id(place_str)
-                    if place_id not in state.places:
-                        state.places[place_id] = create_place(place_str)
-                    state.individual_places[indi_id].append(place_id)  # type: ignore[index]
-
-        # Parse families
-        for record in reader.records0("FAM"):
-            fam_id = record.xref_id
-            husb_id = None
-            wife_id = None
-            child_ids = []
-
-            for sub in record.sub_records:
-                if sub.tag == "HUSB" and sub.value:
-                    husb_id = normalize_id(sub.value)
-                elif sub.tag == "WIFE" and sub.value:
-                    wife_id = normalize_id(sub.value)
-                elif sub.tag == "CHIL" and sub.value:
-                    child_ids.append(normalize_id(sub.value))
-
-            marr_date, marr_place = get_event_details(record, "MARR")
-
-            fam = Family(
-                id=fam_id,  # type: ignore[arg-type]
-                husband_id=husb_id,
-                wife_id=wife_id,
-                children_ids=child_ids,  # type: ignore[arg-type]
-                marriage_date=marr_date,
-                marriage_place=marr_place,
-            )
-            state.families[fam_id] = fam  # type: ignore[index]
-
-            # Index marriage place
-            if marr_place:
-                place_id = get_place_id(marr_place)
-                if place_id not in state.places:
-                    state.places[place_id] = create_place(marr_place)
-
-    # Second pass: populate source titles in citations
-    for indi in state.individuals.values():
-        for event in indi.events:
-            for citation in event.citations:
-                if citation.source_id and citation.source_id in state.sources:
-                    citation.source_title = state.sources[citation.source_id].title
+        for offset, tag in reader.index0:
+            loader = _RECORD_LOADERS.get(tag)
+            if loader and (record := reader.read_record(offset)):
+                loader(record)
+
+    # Index marriage places after all individuals' places, keeping state.places in that order
+    for fam in state.families.values():
+        if fam.marriage_place:
+            place_id = get_place_id(fam.marriage_place)
+            if place_id not in state.places:
+                state.places[place_id] = create_place(fam.marriage_place)
+
+    # Fill in titles for citations read before their source
+    for citation in _pending_citations:
+        if citation.source_id in state.sources:
+            citation.source_title = state.sources[citation.source_id].title
+    _pending_citations.clear()
 
     # Third pass: geocode places (lazily - only on first spatial query)
     # This is done lazily to avoid slowing down startup
@@ -321,10 +488,26 @@ def load_gedcom():
     else:
         state.HOME_PERSON_ID = state._detect_home_person()
 
-    # Build semantic search embeddings (if enabled)
-    from .semantic import build_embeddings
+    # Number individuals densely and build the parent/child adjacency arrays
+    build_pedigree()
+    build_columns()
+    build_search_indexes()
+
+    # Drop any memoized results computed against a previously loaded tree
+    state.clear_caches()
+
+    # Precompute pedigree collapse for the home person, the usual starting point
+    from .core import _precompute_pedigree_collapse
+
+    _precompute_pedigree_collapse()
+
+    # Build every biography up front (if enabled)
+    from .narrative import build_all_biographies
+
+    build_all_biographies()
 
-    build_embeddings()
+    # Semantic search embeddings are built on the first semantic search (see
+    # semantic.ensure_embeddings), so they never delay startup
 
     # Start background geocoding for GIS search (if enabled)
     from .spatial import start_geocoding_thread
@@ -342,3 +525,4 @@ def geocode_all_places():
             coords = geocode_place_coords(place.normalized)
             if coords:
                 place.latitude, place.longitude = coords
+                state.place_coords_version += 1
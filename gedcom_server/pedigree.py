@@ -0,0 +1,320 @@
+"""Integer-indexed parent/child graph for ancestor and descendant traversal.
+
+Individuals are numbered densely in load order (state.individual_ids) and the
+parent/child links are stored as CSR (compressed sparse row) int32 arrays, so a
+traversal step is an array slice instead of an Individual -> Family -> Individual
+dictionary walk. Rebuilt by load_gedcom() via build_pedigree().
+
+Breadth-first walks are level-synchronous: each generation's frontier is expanded
+with a handful of vectorized array operations rather than a Python loop per person.
+
+Each individual also gets a DFS interval label (post-order rank and the lowest rank
+among its descendants). An ancestor's interval always contains its descendants'
+intervals, so a pair whose intervals are not nested is ruled out as lineal with two
+array loads. A pedigree is a DAG rather than a tree, so nesting alone does not prove
+ancestry; may_be_ancestor() is a filter in front of the real traversal.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import state
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# CSR adjacency (set by build_pedigree). Row i of the parents table is
+# _parents_idx[_parents_offsets[i]:_parents_offsets[i + 1]] (father first, then mother);
+# the children table lists children family by family, as _get_children does.
+_parents_offsets: NDArray[np.int32] = np.zeros(1, dtype=np.int32)
+_parents_idx: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+_children_offsets: NDArray[np.int32] = np.zeros(1, dtype=np.int32)
+_children_idx: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+
+# Sibships (set by build_pedigree): one CSR row per family listing its children in
+# family order, and each individual's row (the family_as_child), -1 when none
+_sibship_offsets: NDArray[np.int32] = np.zeros(1, dtype=np.int32)
+_sibship_idx: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+_sibship_of: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+
+# Father and mother of each individual, -1 when unknown or not in the tree
+_fathers: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+_mothers: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+
+# Interval labels (set by build_pedigree). If a is an ancestor of d then
+# _interval_low[a] <= _interval_low[d] and _interval_rank[d] <= _interval_rank[a].
+# Only valid when the parent/child links contain no cycle (bad data can have one).
+_interval_rank: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+_interval_low: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+_intervals_valid = False
+
+
+def _to_csr(rows: list[list[int]]) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Pack per-node neighbour lists into (offsets, indices) arrays."""
+    offsets = np.zeros(len(rows) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(row) for row in rows], dtype=np.int32)
+    indices = np.fromiter(
+        (node for row in rows for node in row), dtype=np.int32, count=int(offsets[-1])
+    )
+    return offsets, indices
+
+
+def _label_intervals(
+    parent_rows: list[list[int]], child_rows: list[list[int]]
+) -> tuple[NDArray[np.int32], NDArray[np.int32], bool]:
+    """Post-order ranks and descendant-minimum ranks from an iterative DFS down child links.
+
+    The DFS starts from every individual without parents, then from anyone left over
+    (only reachable through a cycle). Returns (ranks, lows, acyclic).
+    """
+    count = len(child_rows)
+    rank = [-1] * count
+    low = [count] * count
+    on_stack = [False] * count
+    acyclic = True
+    next_rank = 0
+
+    roots = [i for i, parents in enumerate(parent_rows) if not parents]
+    for start in roots + list(range(count)):
+        if rank[start] >= 0:
+            continue
+        on_stack[start] = True
+        stack = [(start, iter(child_rows[start]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if on_stack[child]:
+                    acyclic = False  # someone is their own ancestor
+                elif rank[child] < 0:
+                    on_stack[child] = True
+                    stack.append((child, iter(child_rows[child])))
+                    break
+                elif low[child] < low[node]:
+                    low[node] = low[child]
+            else:
+                stack.pop()
+                on_stack[node] = False
+                rank[node] = next_rank
+                low[node] = min(low[node], next_rank)
+                next_rank += 1
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+    return np.array(rank, dtype=np.int32), np.array(low, dtype=np.int32), acyclic
+
+
+def build_pedigree() -> None:
+    """Assign dense integer IDs and build the parent/child CSR arrays.
+
+    Parents follow each individual's family_as_child (husband, then wife) and children
+    follow families_as_spouse, matching the dictionary-based lookups in core.
+    Links to IDs that are not in the tree are dropped.
+    """
+    global _parents_offsets, _parents_idx, _children_offsets, _children_idx, _fathers, _mothers
+    global _interval_rank, _interval_low, _intervals_valid
+    global _sibship_offsets, _sibship_idx, _sibship_of
+
+    state.individual_ids[:] = list(state.individuals)
+    state.individual_index.clear()
+    state.individual_index.update((indi_id, i) for i, indi_id in enumerate(state.individual_ids))
+    index = state.individual_index
+
+    sibship_rows = [
+        [index[c] for c in fam.children_ids if c in index] for fam in state.families.values()
+    ]
+    family_rows = {fam_id: row for row, fam_id in enumerate(state.families)}
+
+    parent_rows: list[list[int]] = []
+    child_rows: list[list[int]] = []
+    sibships: list[int] = []
+    fathers: list[int] = []
+    mothers: list[int] = []
+    for indi in state.individuals.values():
+        father = mother = -1
+        fam = state.families.get(indi.family_as_child) if indi.family_as_child else None
+        if fam:
+            father = index.get(fam.husband_id, -1) if fam.husband_id else -1
+            mother = index.get(fam.wife_id, -1) if fam.wife_id else -1
+        fathers.append(father)
+        mothers.append(mother)
+        sibships.append(family_rows[fam.id] if fam else -1)
+        parent_rows.append([p for p in (father, mother) if p >= 0])
+
+        children: list[int] = []
+        for fam_id in indi.families_as_spouse:
+            fam = state.families.get(fam_id)
+            if fam:
+                children.extend(index[c] for c in fam.children_ids if c in index)
+        child_rows.append(children)
+
+    _sibship_offsets, _sibship_idx = _to_csr(sibship_rows)
+    _sibship_of = np.array(sibships, dtype=np.int32)
+    _fathers = np.array(fathers, dtype=np.int32)
+    _mothers = np.array(mothers, dtype=np.int32)
+    _parents_offsets, _parents_idx = _to_csr(parent_rows)
+    _children_offsets, _children_idx = _to_csr(child_rows)
+    _interval_rank, _interval_low, _intervals_valid = _label_intervals(parent_rows, child_rows)
+
+
+def parents_of(i: int) -> list[int]:
+    """Dense IDs of individual i's parents (father first)."""
+    return _parents_idx[_parents_offsets[i] : _parents_offsets[i + 1]].tolist()
+
+
+def father_of(i: int) -> int:
+    """Dense ID of individual i's father, or -1."""
+    return int(_fathers[i])
+
+
+def mother_of(i: int) -> int:
+    """Dense ID of individual i's mother, or -1."""
+    return int(_mothers[i])
+
+
+def children_of(i: int) -> list[int]:
+    """Dense IDs of individual i's children across all of their families."""
+    return _children_idx[_children_offsets[i] : _children_offsets[i + 1]].tolist()
+
+
+def siblings_of(i: int) -> list[int]:
+    """Dense IDs of the other children of individual i's family_as_child, in family order."""
+    row = int(_sibship_of[i])
+    if row < 0:
+        return []
+    sibship = _sibship_idx[_sibship_offsets[row] : _sibship_offsets[row + 1]]
+    return sibship[sibship != i].tolist()
+
+
+def may_be_ancestor(a: int, d: int) -> bool:
+    """False if individual a is certainly not an ancestor of individual d.
+
+    True means the interval labels allow it, not that it is so: confirm with a walk.
+    """
+    if not _intervals_valid:
+        return True
+    return bool(_interval_low[a] <= _interval_low[d] and _interval_rank[d] <= _interval_rank[a])
+
+
+def _expand(
+    frontier: NDArray[np.int32], offsets: NDArray[np.int32], indices: NDArray[np.int32]
+) -> NDArray[np.int32]:
+    """Concatenate the CSR rows of every node in the frontier."""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return indices[:0]
+    # Each gathered slot is its row's start plus its rank within the row
+    row_shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[row_shift + np.arange(total, dtype=np.int32)]
+
+
+def bfs_levels(
+    i: int, max_depth: int, towards_parents: bool
+) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Breadth-first walk from individual i along parent or child links, up to max_depth.
+
+    Returns parallel arrays (dense IDs, levels) in discovery order: level by level,
+    each level in the order its members are first reached from the previous one.
+    Every individual appears once, at its first level; i itself is never returned.
+    """
+    offsets, indices = (
+        (_parents_offsets, _parents_idx) if towards_parents else (_children_offsets, _children_idx)
+    )
+    visited = np.zeros(len(offsets) - 1, dtype=np.bool_)
+    visited[i] = True
+    frontier = np.array([i], dtype=np.int32)
+    found: list[NDArray[np.int32]] = []
+    levels: list[NDArray[np.int32]] = []
+
+    for level in range(1, max_depth + 1):
+        reached = _expand(frontier, offsets, indices)
+        reached = reached[~visited[reached]]
+        # First occurrence of each, in the order reached
+        _, first = np.unique(reached, return_index=True)
+        frontier = reached[np.sort(first)]
+        if not len(frontier):
+            break
+        visited[frontier] = True
+        found.append(frontier)
+        levels.append(np.full(len(frontier), level, dtype=np.int32))
+
+    if not found:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+    return np.concatenate(found), np.concatenate(levels)
+
+
+def ancestor_depths(i: int, max_generations: int) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Every ancestor of individual i within max_generations, at its closest generation.
+
+    Returns parallel arrays (dense IDs, generations), ordered by generation and then
+    by dense ID. Each ancestor appears once even if reachable through several lines.
+    """
+    visited = np.zeros(len(_parents_offsets) - 1, dtype=np.bool_)
+    frontier = np.array([i], dtype=np.int32)
+    found: list[NDArray[np.int32]] = []
+    generations: list[NDArray[np.int32]] = []
+
+    for generation in range(1, max_generations + 1):
+        parents = _expand(frontier, _parents_offsets, _parents_idx)
+        frontier = np.unique(parents[~visited[parents]])
+        if not len(frontier):
+            break
+        visited[frontier] = True
+        found.append(frontier)
+        generations.append(np.full(len(frontier), generation, dtype=np.int32))
+
+    if not found:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+    return np.concatenate(found), np.concatenate(generations)
+
+
+def closest_common_ancestor(i: int, j: int, max_generations: int) -> tuple[int, int, int] | None:
+    """The nearest shared ancestor of individuals i and j within max_generations of each.
+
+    Returns (ancestor, generations from i, generations from j) minimizing the total,
+    ties going to the fewest generations from i and then the lowest dense ID; None if
+    they share no ancestor. Both ancestries are walked a generation at a time, nearer
+    side first, and the walk stops as soon as no deeper ancestor could be closer, so
+    close kin cost a few generations rather than max_generations on both sides.
+    """
+    size = len(_parents_offsets) - 1
+    depths = (np.full(size, -1, dtype=np.int32), np.full(size, -1, dtype=np.int32))
+    frontiers = [np.array([i], dtype=np.int32), np.array([j], dtype=np.int32)]
+    walked = [0, 0]
+    best: tuple[int, int, int] | None = None  # (total, generations from i, ancestor)
+
+    while True:
+        # Sides that can still find ancestors at generation walked[side] + 1
+        open_sides = [s for s in (0, 1) if len(frontiers[s]) and walked[s] < max_generations]
+        # Any common ancestor not yet seen is beyond a walked depth on some open side
+        bound = min((walked[s] + 2 for s in open_sides), default=None)
+        if bound is None or (best is not None and best[0] < bound):
+            break
+
+        side = min(open_sides, key=lambda s: walked[s])
+        depth, other = depths[side], depths[1 - side]
+        parents = _expand(frontiers[side], _parents_offsets, _parents_idx)
+        frontier = np.unique(parents[depth[parents] < 0])
+        walked[side] += 1
+        depth[frontier] = walked[side]
+        frontiers[side] = frontier
+
+        shared = frontier[other[frontier] >= 0]
+        if len(shared):
+            gens_i = depths[0][shared]
+            totals = gens_i + depths[1][shared]
+            # shared is ascending, so lexsort keeps the lowest ID among equal keys
+            k = int(np.lexsort((shared, gens_i, totals))[0])
+            candidate = (int(totals[k]), int(gens_i[k]), int(shared[k]))
+            if best is None or candidate < best:
+                best = candidate
+
+    if best is None:
+        return None
+    total, gen_i, ancestor = best
+    return ancestor, gen_i, total - gen_i
@@ -1,17 +1,25 @@
 """Fuzzy place search and geocoding functions."""
 
-import jellyfish
-from haversine import Unit, haversine
+import bisect
+import heapq
+import re
+from collections.abc import Iterator
+
+from haversine import Unit
 from rapidfuzz import fuzz, process
 
 from . import state
 from .constants import HISTORICAL_MAPPINGS
+from .geoindex import places_within
 from .helpers import (
     geocode_place_coords,
     get_place_id,
     normalize_place_string,
     parse_place_components,
+    place_phonetic_key,
+    trigram_candidates,
 )
+from .models import Individual, Place
 
 
 def _get_historical_variants(place: str) -> list[str]:
@@ -35,43 +43,63 @@ def _get_historical_variants(place: str) -> list[str]:
     return list(set(variants))
 
 
+def _compile_alternation(words: list[str]) -> re.Pattern[str] | None:
+    """Compile literal words into one pattern that finds any of them in lowercase text."""
+    if not words:
+        return None
+    return re.compile("|".join(sorted({re.escape(word.lower()) for word in words})))
+
+
+def _place_keys_matching(query: str | re.Pattern[str]) -> Iterator[int]:
+    """Positions in state.place_index_keys of the keys containing query (a substring or a
+    compiled pattern), in order.
+
+    Keys are located in state.place_index_text by state.place_index_starts; a match
+    must lie within a single key.
+    """
+    text, starts = state.place_index_text, state.place_index_starts
+    if not starts:
+        return
+
+    def find(start: int) -> tuple[int, int] | None:
+        if isinstance(query, str):
+            pos = text.find(query, start)
+            return (pos, pos + len(query)) if pos != -1 else None
+        match = query.search(text, start)
+        return match.span() if match else None
+
+    span = find(0)
+    while span:
+        k = bisect.bisect_right(starts, span[0]) - 1
+        key_end = starts[k + 1] - 1 if k + 1 < len(starts) else len(text)
+        if span[1] <= key_end:
+            yield k
+        # Any later match in this key starts no earlier, so move on to the next one
+        if k + 1 >= len(starts):
+            return
+        span = find(starts[k + 1])
+
+
 def _fuzzy_match_places(query: str, threshold: int = 70) -> list[tuple[str, float]]:
     """Find places matching query with fuzzy string matching.
 
     Returns list of (original_place, score) tuples sorted by score descending.
     """
     query_norm = normalize_place_string(query)
-
-    # Get unique place strings from the places index
-    unique_places = [p.original for p in state.places.values()]
-
-    if not unique_places:
+    if not state.place_ids:
         return []
 
-    # Also normalize the choices for better matching
-    choices_normalized = {p.original: p.normalized for p in state.places.values()}
-
-    # Use rapidfuzz to find matches
+    # Score against the normalized forms prebuilt at load; each match carries its position
     matches = process.extract(
         query_norm,
-        [choices_normalized[p] for p in unique_places],
+        state.place_normalized,
         scorer=fuzz.WRatio,
         limit=100,
         score_cutoff=threshold,
     )
 
     # Map back to original place strings
-    result = []
-    for match in matches:
-        # Find the original string for this normalized match
-        normalized_match = match[0]
-        score = match[1]
-        for orig, norm in choices_normalized.items():
-            if norm == normalized_match:
-                result.append((orig, score))
-                break
-
-    return result
+    return [(state.places[state.place_ids[index]].original, score) for _, score, index in matches]
 
 
 def _phonetic_match_places(query: str) -> list[str]:
@@ -79,23 +107,14 @@ def _phonetic_match_places(query: str) -> list[str]:
 
     Returns list of original place strings that match phonetically.
     """
-    # Get metaphone code for query (first significant word)
-    query_words = query.split(",")[0].strip().split()
-    if not query_words:
+    # Compare metaphone codes of the first word (usually the city name)
+    query_code = place_phonetic_key(query)
+    if query_code is None:
         return []
 
-    query_code = jellyfish.metaphone(query_words[0])
-    matches = []
-
-    for place in state.places.values():
-        # Check first word of place (usually city name)
-        place_words = place.original.split(",")[0].strip().split()
-        if place_words:
-            place_code = jellyfish.metaphone(place_words[0])
-            if place_code == query_code:
-                matches.append(place.original)
-
-    return matches
+    return [
+        state.places[place_id].original for place_id in state.place_metaphone.get(query_code, ())
+    ]
 
 
 def _fuzzy_search_place(place: str, threshold: int = 70, max_results: int = 50) -> list[dict]:
@@ -112,17 +131,30 @@ def _fuzzy_search_place(place: str, threshold: int = 70, max_results: int = 50)
     seen_individuals: set[str] = set()
     place_scores: dict[str, float] = {}  # place -> best score
 
-    # Strategy 1: Exact substring match (highest score)
-    place_lower = place.lower()
-    for indexed_place in state.place_index:
-        if place_lower in indexed_place:
-            place_scores[indexed_place] = 100.0
-
-    # Strategy 2: Normalized match
+    # Strategies 1 and 5 are both substring tests against the place index, run as scans of
+    # its joined keys: the query itself, and all historical variants compiled into one pattern
+    keys = state.place_index_keys
+    exact = list(_place_keys_matching(place.lower()))
+    for k in exact:
+        place_scores[keys[k]] = 100.0  # Strategy 1: exact substring match
+    variant_pattern = _compile_alternation(_get_historical_variants(place))
+    variant_matches: list[str] = []
+    if variant_pattern:
+        exact_keys = set(exact)
+        variant_matches = [
+            keys[k] for k in _place_keys_matching(variant_pattern) if k not in exact_keys
+        ]
+
+    # Strategy 2: Normalized match, against the normalized forms prebuilt at load; the
+    # trigram index narrows longer queries to the places that can contain them
     place_normalized = normalize_place_string(place)
-    for p in state.places.values():
-        if place_normalized in p.normalized and p.original.lower() not in place_scores:
-            place_scores[p.original.lower()] = 95.0
+    normalized_forms = state.place_normalized
+    candidates = trigram_candidates(state.place_trigram_index, place_normalized)
+    for index in range(len(normalized_forms)) if candidates is None else candidates:
+        if place_normalized in normalized_forms[index]:
+            key = state.places[state.place_ids[index]].original.lower()
+            if key not in place_scores:
+                place_scores[key] = 95.0
 
     # Strategy 3: Fuzzy string match
     fuzzy_matches = _fuzzy_match_places(place, threshold)
@@ -138,29 +170,35 @@ def _fuzzy_search_place(place: str, threshold: int = 70, max_results: int = 50)
         if key not in place_scores:
             place_scores[key] = 60.0  # Base score for phonetic match
 
-    # Strategy 5: Historical variants
-    variants = _get_historical_variants(place)
-    for variant in variants:
-        variant_lower = variant.lower()
-        for indexed_place in state.place_index:
-            if variant_lower in indexed_place and indexed_place not in place_scores:
-                place_scores[indexed_place] = 80.0  # Historical match score
-
-    # Collect individuals from matching places
-    for matching_place, score in sorted(place_scores.items(), key=lambda x: -x[1]):
-        if matching_place in state.place_index:
-            for indi_id in state.place_index[matching_place]:
-                if indi_id not in seen_individuals and indi_id in state.individuals:
-                    seen_individuals.add(indi_id)
-                    indi = state.individuals[indi_id]
-                    info = indi.to_summary()
-                    info["birth_place"] = indi.birth_place
-                    info["death_place"] = indi.death_place
-                    info["match_score"] = score
-                    info["matched_place"] = matching_place
-                    results.append(info)
-                    if len(results) >= max_results:
-                        return results
+    # Strategy 5: Historical variants (matched during the strategy 1 scan)
+    for indexed_place in variant_matches:
+        if indexed_place not in place_scores:
+            place_scores[indexed_place] = 80.0  # Historical match score
+
+    # Collect individuals from matching places, best score first (ties in match order).
+    # Places are popped off a heap as needed, since max_results is usually reached long
+    # before every matching place is visited; indexes are bound locally for the inner loop
+    place_index, individuals = state.place_index, state.individuals
+    ranked = [(-score, k, place) for k, (place, score) in enumerate(place_scores.items())]
+    heapq.heapify(ranked)
+    while ranked:
+        neg_score, _, matching_place = heapq.heappop(ranked)
+        score = -neg_score
+        for indi_id in place_index.get(matching_place, ()):
+            if indi_id in seen_individuals:
+                continue
+            indi = individuals.get(indi_id)
+            if not indi:
+                continue
+            seen_individuals.add(indi_id)
+            info = indi.to_summary()
+            info["birth_place"] = indi.birth_place
+            info["death_place"] = indi.death_place
+            info["match_score"] = score
+            info["matched_place"] = matching_place
+            results.append(info)
+            if len(results) >= max_results:
+                return results
 
     return results
 
@@ -220,42 +258,28 @@ def _get_place_variants(place: str) -> list[dict]:
 
     Groups places that normalize to the same form or match phonetically.
     """
-    target_normalized = normalize_place_string(place)
-    target_phonetic = (
-        jellyfish.metaphone(place.split(",")[0].strip().split()[0])
-        if place.split(",")[0].strip()
-        else ""
+    target_phonetic = place_phonetic_key(place)
+    matches = dict.fromkeys(
+        state.place_metaphone.get(target_phonetic, ()) if target_phonetic else (), "phonetic"
     )
+    # Place IDs hash the normalized form, so at most one place normalizes the same way
+    same = state.places.get(get_place_id(place))
+    if same is not None and same.normalized == normalize_place_string(place):
+        matches[same.id] = "normalized"
 
     variants = []
     seen = set()
 
-    for p in state.places.values():
-        # Check if normalizes to same form
-        if p.normalized == target_normalized:
-            if p.original not in seen:
-                seen.add(p.original)
-                variants.append(
-                    {
-                        "place": p.original,
-                        "match_type": "normalized",
-                    }
-                )
-            continue
-
-        # Check phonetic match
-        if target_phonetic:
-            place_words = p.original.split(",")[0].strip().split()
-            if place_words:
-                place_phonetic = jellyfish.metaphone(place_words[0])
-                if place_phonetic == target_phonetic and p.original not in seen:
-                    seen.add(p.original)
-                    variants.append(
-                        {
-                            "place": p.original,
-                            "match_type": "phonetic",
-                        }
-                    )
+    for place_id in sorted(matches, key=state.place_positions.__getitem__):
+        p = state.places[place_id]
+        if p.original not in seen:
+            seen.add(p.original)
+            variants.append(
+                {
+                    "place": p.original,
+                    "match_type": matches[place_id],
+                }
+            )
 
     # Also check for fuzzy matches with high threshold
     fuzzy_matches = _fuzzy_match_places(place, threshold=85)
@@ -314,6 +338,7 @@ def _geocode_place(place: str) -> dict | None:
         if place_id in state.places:
             state.places[place_id].latitude = coords[0]
             state.places[place_id].longitude = coords[1]
+            state.place_coords_version += 1
         return {
             "place": place,
             "latitude": coords[0],
@@ -425,43 +450,49 @@ def _search_nearby(
     if not ref_coords:
         return []
 
+    # Sort by distance, limit results; only the kept matches are turned into dicts
+    nearest = heapq.nsmallest(
+        max_results,
+        _nearby_matches(ref_coords, radius_km, event_types),
+        key=lambda match: match[0],
+    )
     results = []
-    seen_individuals: set[str] = set()
+    for dist, indi, p in nearest:
+        info = indi.to_summary()
+        info["place"] = p.original
+        info["distance_km"] = dist
+        results.append(info)
+    return results
 
-    for place_id, p in state.places.items():
-        if p.latitude is None or p.longitude is None:
-            continue
 
-        dist = haversine(ref_coords, (p.latitude, p.longitude), unit=Unit.KILOMETERS)
-        if dist <= radius_km:
-            # Find individuals at this place
-            for indi_id, indi_place_ids in state.individual_places.items():
-                if place_id not in indi_place_ids:
-                    continue
-                if indi_id in seen_individuals:
-                    continue
-                indi = state.individuals.get(indi_id)
-                if not indi:
-                    continue
+def _nearby_matches(
+    ref_coords: tuple[float, float], radius_km: float, event_types: list[str] | None
+) -> Iterator[tuple[float, Individual, Place]]:
+    """Yield (rounded distance, individual, place) for each individual within the radius.
 
-                # Check event types if specified
-                if event_types:
-                    has_matching_event = False
-                    for event in indi.events:
-                        if event.type in event_types and event.place:
-                            event_place_id = get_place_id(event.place)
-                            if event_place_id == place_id:
-                                has_matching_event = True
-                                break
-                    if not has_matching_event:
-                        continue
-
-                seen_individuals.add(indi_id)
-                info = indi.to_summary()
-                info["place"] = p.original
-                info["distance_km"] = round(dist, 1)
-                results.append(info)
-
-    # Sort by distance, limit results
-    results.sort(key=lambda x: x["distance_km"])
-    return results[:max_results]
+    Individuals are matched once, at their first matching place in state.places order.
+    """
+    seen_individuals: set[str] = set()
+    wanted_types = frozenset(event_types) if event_types else None
+    # Indexes bound locally for the inner loop
+    places, individuals = state.places, state.individuals
+    place_individuals = state.place_individuals
+
+    for place_id, dist in places_within(ref_coords, radius_km, unit=Unit.KILOMETERS):
+        p = places[place_id]
+        # Find individuals at this place
+        for indi_id in place_individuals.get(place_id, ()):
+            if indi_id in seen_individuals:
+                continue
+            indi = individuals.get(indi_id)
+            if not indi:
+                continue
+
+            # Check event types if specified
+            if wanted_types and not any(
+                event.place_id == place_id and event.type in wanted_types for event in indi.events
+            ):
+                continue
+
+            seen_individuals.add(indi_id)
+            yield round(dist, 1), indi, p
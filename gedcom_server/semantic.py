@@ -6,15 +6,17 @@ Disabled by default; enable with SEMANTIC_SEARCH_ENABLED=true.
 
 from __future__ import annotations
 
-import hashlib
+import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 from . import state
+from .helpers import gedcom_cache_fields, gedcom_cache_valid
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -23,12 +25,18 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 MODEL_NAME = "all-MiniLM-L6-v2"
+# ONNX export loaded with SEMANTIC_SEARCH_BACKEND=onnx unless SEMANTIC_SEARCH_ONNX_FILE is set
+ONNX_MODEL_FILE = "onnx/model.onnx"
 
 # Module-level state (set by build_embeddings)
-_encoder = None
+_encoder = None  # loaded on first use, see _get_encoder()
+_encoder_key = MODEL_NAME  # model identity of the loaded encoder, see _model_key()
+_encoder_lock = threading.Lock()
 _embeddings: NDArray[np.float32] | None = None
 _embedding_ids: list[str] = []
 _embedding_texts: list[str] = []
+_embeddings_ready = False  # build_embeddings() has run for the loaded tree
+_embeddings_lock = threading.Lock()
 
 
 def is_enabled() -> bool:
@@ -36,71 +44,146 @@ def is_enabled() -> bool:
     return os.getenv("SEMANTIC_SEARCH_ENABLED", "false").lower() == "true"
 
 
+def _backend() -> str:
+    """Inference backend from SEMANTIC_SEARCH_BACKEND: "torch" (default) or "onnx"."""
+    return os.getenv("SEMANTIC_SEARCH_BACKEND", "torch").lower()
+
+
+def _onnx_model_file() -> str:
+    """ONNX export to load, from SEMANTIC_SEARCH_ONNX_FILE (default: the portable model.onnx).
+
+    The model also publishes int8-quantized exports tuned per CPU, such as
+    onnx/model_qint8_avx512_vnni.onnx, onnx/model_quint8_avx2.onnx and
+    onnx/model_qint8_arm64.onnx.
+    """
+    return os.getenv("SEMANTIC_SEARCH_ONNX_FILE", ONNX_MODEL_FILE)
+
+
+def _model_key() -> str:
+    """Model identity stored with cached embeddings; each ONNX export embeds slightly differently.
+
+    Taken from the encoder that actually loaded, so embeddings built after falling back
+    to PyTorch are cached as PyTorch embeddings.
+    """
+    return _encoder_key
+
+
+def _get_encoder():
+    """The sentence-transformers model, loaded on first use.
+
+    Importing sentence-transformers and loading the model is slow, so it only happens
+    when embeddings are built or a query is encoded. Returns None if the package is not
+    installed. The lock keeps concurrent first calls from loading the model twice.
+
+    With SEMANTIC_SEARCH_BACKEND=onnx the ONNX export from _onnx_model_file() runs on ONNX
+    Runtime (needs sentence-transformers 3.2+ with its onnx extra), falling back to
+    PyTorch if that is unavailable.
+    """
+    global _encoder, _encoder_key
+    with _encoder_lock:
+        if _encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                return None
+            if _backend() == "onnx":
+                onnx_file = _onnx_model_file()
+                try:
+                    # Missing optimum/onnxruntime raises a bare Exception
+                    _encoder = SentenceTransformer(
+                        MODEL_NAME, backend="onnx", model_kwargs={"file_name": onnx_file}
+                    )
+                    _encoder_key = f"{MODEL_NAME}:{onnx_file}"
+                except Exception as e:
+                    logger.warning(
+                        f"ONNX backend unavailable ({e}), using PyTorch. "
+                        "Install with: pip install 'sentence-transformers[onnx]'"
+                    )
+            if _encoder is None:
+                _encoder = SentenceTransformer(MODEL_NAME)
+                _encoder_key = MODEL_NAME
+        return _encoder
+
+
 def _get_cache_path() -> Path | None:
     """Get path for embeddings cache file based on GEDCOM file location."""
     if state.GEDCOM_FILE is None:
         return None
-    return state.GEDCOM_FILE.with_suffix(state.GEDCOM_FILE.suffix + ".embeddings.npz")
+    return state.GEDCOM_FILE.with_suffix(state.GEDCOM_FILE.suffix + ".embeddings.npy")
 
 
-def _compute_gedcom_hash() -> str:
-    """Compute SHA256 hash of the GEDCOM file for cache invalidation."""
+def _get_cache_meta_path() -> Path | None:
+    """Get path for the JSON sidecar holding the cached embeddings' IDs, texts and hash."""
     if state.GEDCOM_FILE is None:
-        return ""
-    sha256 = hashlib.sha256()
-    with open(state.GEDCOM_FILE, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        return None
+    return state.GEDCOM_FILE.with_suffix(state.GEDCOM_FILE.suffix + ".embeddings.json")
 
 
 def _load_cache() -> bool:
-    """Load embeddings from cache if valid. Returns True on success."""
+    """Load embeddings from cache if valid. Returns True on success.
+
+    The embeddings are memory-mapped rather than read: pages are loaded on demand by
+    the OS and shared between server processes using the same cache.
+    """
     global _embeddings, _embedding_ids, _embedding_texts
 
     cache_path = _get_cache_path()
-    if cache_path is None or not cache_path.exists():
+    meta_path = _get_cache_meta_path()
+    if cache_path is None or meta_path is None:
+        return False
+    if not cache_path.exists() or not meta_path.exists():
         return False
 
     try:
-        with np.load(cache_path, allow_pickle=True) as data:
-            cached_hash = str(data["gedcom_hash"])
-            cached_model = str(data["model_name"])
-
-            # Validate cache
-            current_hash = _compute_gedcom_hash()
-            if cached_hash != current_hash:
-                logger.info("Cache invalidated: GEDCOM file changed")
-                return False
-            if cached_model != MODEL_NAME:
-                logger.info("Cache invalidated: model changed")
-                return False
-
-            # Load embeddings
-            _embeddings = data["embeddings"]
-            _embedding_ids = list(data["ids"])
-            _embedding_texts = list(data["texts"])
-            return True
+        with open(meta_path) as f:
+            data = json.load(f)
+
+        if not gedcom_cache_valid(state.GEDCOM_FILE, data):
+            logger.info("Cache invalidated: GEDCOM file changed")
+            return False
+        if data.get("model_name") != _model_key():
+            logger.info("Cache invalidated: model changed")
+            return False
+
+        embeddings = np.load(cache_path, mmap_mode="r")
+        if len(embeddings) != len(data["ids"]):
+            logger.info("Cache invalidated: embeddings and IDs out of step")
+            return False
+
+        _embeddings = embeddings
+        _embedding_ids = data["ids"]
+        _embedding_texts = data["texts"]
+        return True
     except Exception as e:
         logger.warning(f"Failed to load embeddings cache: {e}")
         return False
 
 
 def _save_cache() -> None:
-    """Persist embeddings to cache file."""
+    """Persist embeddings to cache files.
+
+    Both files are written under temporary names and renamed into place, so another
+    process still mapping the previous embeddings keeps reading the old file intact.
+    """
     cache_path = _get_cache_path()
-    if cache_path is None or _embeddings is None:
+    meta_path = _get_cache_meta_path()
+    if cache_path is None or meta_path is None or _embeddings is None:
         return
 
     try:
-        np.savez_compressed(
-            cache_path,
-            gedcom_hash=_compute_gedcom_hash(),
-            model_name=MODEL_NAME,
-            embeddings=_embeddings,
-            ids=np.array(_embedding_ids, dtype=object),
-            texts=np.array(_embedding_texts, dtype=object),
-        )
+        data = {
+            **gedcom_cache_fields(state.GEDCOM_FILE),
+            "model_name": _model_key(),
+            "ids": _embedding_ids,
+            "texts": _embedding_texts,
+        }
+        tmp_path = cache_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, np.asarray(_embeddings, dtype=np.float32))
+        os.replace(tmp_path, cache_path)
+        tmp_path = meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, meta_path)
         logger.info(f"Saved embeddings cache to {cache_path}")
     except Exception as e:
         logger.warning(f"Failed to save embeddings cache: {e}")
@@ -156,7 +239,7 @@ def _build_embedding_text(indi_id: str) -> str:
     for fam_id in indi.families_as_spouse:
         fam = state.families.get(fam_id)
         if fam:
-            spouse_id = fam.wife_id if fam.husband_id == indi_id else fam.husband_id
+            spouse_id = state.spouse_of[(indi_id, fam_id)]
             if spouse_id and spouse_id in state.individuals:
                 spouse_name = state.individuals[spouse_id].full_name()
                 marriage_info = f"Married {spouse_name}"
@@ -194,35 +277,36 @@ def _build_embedding_text(indi_id: str) -> str:
 def build_embeddings() -> None:
     """Build or load embeddings for all individuals.
 
-    Called at startup after GEDCOM parsing. If SEMANTIC_SEARCH_ENABLED is false,
-    this function returns immediately without building embeddings.
+    Called by ensure_embeddings() on the first semantic search after a GEDCOM file is
+    loaded. If SEMANTIC_SEARCH_ENABLED is false, this function returns immediately
+    without building embeddings.
 
     Cache strategy:
-    - First checks for valid cache at {gedcom_file}.embeddings.npz
-    - Cache invalidated if GEDCOM file hash or model name changes
+    - First checks for valid cache at {gedcom_file}.embeddings.npy (+ .embeddings.json)
+    - Cache invalidated if GEDCOM file hash or the loaded model (see _model_key) changes
     - If no valid cache, builds embeddings and saves to cache
     """
-    global _encoder, _embeddings, _embedding_ids, _embedding_texts
+    global _embeddings, _embedding_ids, _embedding_texts
 
     if not is_enabled():
         logger.debug("Semantic search disabled")
         return
 
-    # Try to load from cache first
-    if _load_cache():
-        logger.info(f"Loaded {len(_embedding_ids)} embeddings from cache")
-        return
-
-    # Import sentence-transformers only when needed (lazy load)
-    try:
-        from sentence_transformers import SentenceTransformer
-    except ImportError:
+    # Load the encoder first: the cache must match the backend that actually loaded,
+    # and every search needs it to encode the query anyway
+    encoder = _get_encoder()
+    if encoder is None:
         logger.warning(
             "sentence-transformers not installed. Semantic search disabled. "
             "Install with: pip install sentence-transformers"
         )
         return
 
+    # Try to load from cache first
+    if _load_cache():
+        logger.info(f"Loaded {len(_embedding_ids)} embeddings from cache")
+        return
+
     logger.info("Building embeddings (first run or GEDCOM changed)...")
 
     # Build texts for all individuals
@@ -238,13 +322,15 @@ def build_embeddings() -> None:
         logger.warning("No individuals to embed")
         return
 
-    # Load model and encode
-    _encoder = SentenceTransformer(MODEL_NAME)
-    _embeddings = _encoder.encode(
-        texts,
-        normalize_embeddings=True,
-        show_progress_bar=True,
-        convert_to_numpy=True,
+    # Encode; a C-contiguous float32 matrix lets scoring run as a single BLAS sgemv
+    _embeddings = np.ascontiguousarray(
+        encoder.encode(
+            texts,
+            normalize_embeddings=True,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+        ),
+        dtype=np.float32,
     )
     _embedding_ids = ids
     _embedding_texts = texts
@@ -255,6 +341,30 @@ def build_embeddings() -> None:
     _save_cache()
 
 
+def ensure_embeddings() -> None:
+    """Build or load the embeddings once per loaded tree, on first use.
+
+    Startup does not wait for embeddings; the first semantic search pays for them
+    instead. The lock keeps concurrent first searches from building them twice.
+    """
+    global _embeddings_ready
+    with _embeddings_lock:
+        if not _embeddings_ready:
+            build_embeddings()
+            _embeddings_ready = True
+
+
+@state.register_cache
+def clear_embeddings() -> None:
+    """Drop the embeddings so the next semantic search builds them for the loaded tree."""
+    global _embeddings, _embedding_ids, _embedding_texts, _embeddings_ready
+    with _embeddings_lock:
+        _embeddings = None
+        _embedding_ids = []
+        _embedding_texts = []
+        _embeddings_ready = False
+
+
 def _semantic_search(query: str, max_results: int = 20) -> dict:
     """Perform semantic search over individual embeddings.
 
@@ -265,11 +375,10 @@ def _semantic_search(query: str, max_results: int = 20) -> dict:
     Returns:
         Dictionary with query, result_count, and results list
     """
-    global _encoder
-
     if not is_enabled():
         return {"error": "Semantic search not enabled", "results": []}
 
+    ensure_embeddings()
     if _embeddings is None or len(_embedding_ids) == 0:
         return {"error": "Embeddings not built", "results": []}
 
@@ -277,26 +386,24 @@ def _semantic_search(query: str, max_results: int = 20) -> dict:
     max_results = min(max(1, max_results), 100)
 
     # Lazy load encoder if needed (for queries after server restart without rebuild)
-    if _encoder is None:
-        try:
-            from sentence_transformers import SentenceTransformer
-
-            _encoder = SentenceTransformer(MODEL_NAME)
-        except ImportError:
-            return {"error": "sentence-transformers not installed", "results": []}
+    encoder = _get_encoder()
+    if encoder is None:
+        return {"error": "sentence-transformers not installed", "results": []}
 
-    # Encode query
-    query_embedding = _encoder.encode(
+    # Encode query; as float32, so a float64 vector cannot upcast the whole matrix
+    query_embedding = encoder.encode(
         [query],
         normalize_embeddings=True,
         convert_to_numpy=True,
-    )[0]
+    )[0].astype(np.float32, copy=False)
 
     # Compute similarities (dot product of normalized vectors = cosine similarity)
     similarities = np.dot(_embeddings, query_embedding)
 
-    # Get top-k indices
-    top_indices = np.argsort(similarities)[::-1][:max_results]
+    # Get top-k indices: select the k best, then sort only those
+    k = min(max_results, len(similarities))
+    top_indices = np.argpartition(-similarities, k - 1)[:k]
+    top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
 
     # Build results
     results: list[dict] = []
@@ -2,6 +2,7 @@
 
 from . import state
 from .core import _normalize_lookup_id
+from .helpers import trigram_candidates
 
 
 def _get_sources(max_results: int = 100) -> list[dict]:
@@ -26,7 +27,14 @@ def _search_sources(query: str, max_results: int = 50) -> list[dict]:
     query_lower = query.lower()
     results = []
 
-    for source in state.sources.values():
+    candidates = trigram_candidates(state.source_trigram_index, query_lower)
+    matches = (
+        state.sources.values()
+        if candidates is None
+        else (state.sources[state.source_ids[i]] for i in candidates)
+    )
+
+    for source in matches:
         title_match = source.title and query_lower in source.title.lower()
         author_match = source.author and query_lower in source.author.lower()
 
@@ -12,7 +12,7 @@ Geocoding uses three tiers:
 
 from __future__ import annotations
 
-import hashlib
+import heapq
 import json
 import logging
 import os
@@ -21,12 +21,15 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
-from haversine import Unit, haversine
+from haversine import Unit
 from rapidfuzz import fuzz, process
 
 from . import state
+from .geoindex import places_in_bbox, places_within, refresh_index
 from .helpers import (
     _get_geonames_cache,
+    gedcom_cache_fields,
+    gedcom_cache_valid,
     get_place_id,
     normalize_place_string,
     parse_place_components,
@@ -78,17 +81,6 @@ def _get_cache_path() -> Path | None:
     return state.GEDCOM_FILE.with_suffix(".geocache.json")
 
 
-def _compute_gedcom_hash() -> str:
-    """Compute SHA256 hash of the GEDCOM file for cache invalidation."""
-    if state.GEDCOM_FILE is None:
-        return ""
-    sha256 = hashlib.sha256()
-    with open(state.GEDCOM_FILE, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
-
-
 def _load_geocache() -> bool:
     """Load geocoding cache from disk if valid. Returns True on success."""
     global _geocache
@@ -101,10 +93,7 @@ def _load_geocache() -> bool:
         with open(cache_path) as f:
             data = json.load(f)
 
-        # Validate cache
-        cached_hash = data.get("gedcom_hash", "")
-        current_hash = _compute_gedcom_hash()
-        if cached_hash != current_hash:
+        if not gedcom_cache_valid(state.GEDCOM_FILE, data):
             logger.info("Geocache invalidated: GEDCOM file changed")
             return False
 
@@ -127,7 +116,7 @@ def _save_geocache() -> None:
 
     try:
         data = {
-            "gedcom_hash": _compute_gedcom_hash(),
+            **gedcom_cache_fields(state.GEDCOM_FILE),
             "geocoded": _geocache,
         }
         with open(cache_path, "w") as f:
@@ -324,6 +313,7 @@ def _geocode_place_full(
     coords, confidence = _geocode_via_geonamescache(place.normalized)
     if coords:
         place.latitude, place.longitude = coords
+        state.place_coords_version += 1
         _geocache[place_id] = {
             "lat": coords[0],
             "lon": coords[1],
@@ -337,6 +327,7 @@ def _geocode_place_full(
     coords, confidence = _geocode_via_nominatim(place.original)
     if coords:
         place.latitude, place.longitude = coords
+        state.place_coords_version += 1
         _geocache[place_id] = {
             "lat": coords[0],
             "lon": coords[1],
@@ -410,6 +401,9 @@ def _geocode_worker() -> None:
     if _geocache_dirty:
         _save_geocache()
 
+    # Index the new coordinates before reporting completion
+    refresh_index()
+
     with _geocoding_lock:
         _geocoding_progress["status"] = "complete"
         _geocoding_progress["geocoded"] = geocoded_count
@@ -465,35 +459,31 @@ def _resolve_location(
                 return coords, place.original, source, confidence
 
     # Strategy 2: Fuzzy match in GEDCOM places
-    place_names = {p.id: p.normalized for p in state.places.values()}
-    if place_names:
+    if state.place_ids:
         matches = process.extract(
             query_normalized,
-            list(place_names.values()),
+            state.place_normalized,
             scorer=fuzz.WRatio,
             limit=5,
             score_cutoff=80,
         )
 
-        for match_name, score, _ in matches:
-            # Find the place with this normalized name
-            for place in state.places.values():
-                if place.normalized == match_name:
-                    if place.latitude is not None and place.longitude is not None:
-                        confidence = "high" if score >= 95 else "medium"
-                        return (
-                            (place.latitude, place.longitude),
-                            place.original,
-                            "gedcom",
-                            confidence,
-                        )
-                    # Geocode the matched place
-                    coords, source, geo_confidence = _geocode_place_full(place)
-                    if coords:
-                        # Lower confidence if fuzzy match
-                        confidence = geo_confidence if score >= 95 else "medium"
-                        return coords, place.original, source, confidence
-                    break
+        for _, score, index in matches:
+            place = state.places[state.place_ids[index]]
+            if place.latitude is not None and place.longitude is not None:
+                confidence = "high" if score >= 95 else "medium"
+                return (
+                    (place.latitude, place.longitude),
+                    place.original,
+                    "gedcom",
+                    confidence,
+                )
+            # Geocode the matched place
+            coords, source, geo_confidence = _geocode_place_full(place)
+            if coords:
+                # Lower confidence if fuzzy match
+                confidence = geo_confidence if score >= 95 else "medium"
+                return coords, place.original, source, confidence
 
     # Strategy 3: Direct geocoding of query
     coords, confidence = _geocode_via_geonamescache(query_normalized)
@@ -583,11 +573,6 @@ def _resolve_location_with_bbox(
     }
 
 
-def _point_in_bbox(lat: float, lon: float, bbox: dict) -> bool:
-    """Check if a point falls within a bounding box."""
-    return bbox["south"] <= lat <= bbox["north"] and bbox["west"] <= lon <= bbox["east"]
-
-
 def _search_within_bbox(
     bbox: dict,
     event_types: list[str] | None = None,
@@ -606,20 +591,9 @@ def _search_within_bbox(
     results: list[dict] = []
     seen_individuals: set[str] = set()
 
-    for place in state.places.values():
-        if place.latitude is None or place.longitude is None:
-            continue
-
-        # Check if place is inside the bounding box
-        if not _point_in_bbox(place.latitude, place.longitude, bbox):
-            continue
-
+    for place_id in places_in_bbox(bbox):
         # Find individuals associated with this place
-        place_id = place.id
-        for indi_id, indi_place_ids in state.individual_places.items():
-            if place_id not in indi_place_ids:
-                continue
-
+        for indi_id in state.place_individuals.get(place_id, ()):
             indi = state.individuals.get(indi_id)
             if not indi:
                 continue
@@ -627,21 +601,19 @@ def _search_within_bbox(
             # Collect matching events at this place
             matching_events: list[dict] = []
             for event in indi.events:
-                if event.place:
-                    event_place_id = get_place_id(event.place)
-                    if event_place_id == place_id:
-                        if event_types and event.type not in event_types:
-                            continue
-                        cached = _geocache.get(place_id, {})
-                        matching_events.append(
-                            {
-                                "place": event.place,
-                                "event": event.type,
-                                "date": event.date,
-                                "geocode_confidence": cached.get("confidence", "unknown"),
-                                "geocode_source": cached.get("source", "unknown"),
-                            }
-                        )
+                if event.place_id == place_id:
+                    if event_types and event.type not in event_types:
+                        continue
+                    cached = _geocache.get(place_id, {})
+                    matching_events.append(
+                        {
+                            "place": event.place,
+                            "event": event.type,
+                            "date": event.date,
+                            "geocode_confidence": cached.get("confidence", "unknown"),
+                            "geocode_source": cached.get("source", "unknown"),
+                        }
+                    )
 
             # Check birth/death places
             if indi.birth_place:
@@ -882,28 +854,14 @@ def _search_proximity_mode(
 
     # Search for individuals near the reference point
     results: list[dict] = []
-    seen_individuals: set[str] = set()
-
-    for place in state.places.values():
-        if place.latitude is None or place.longitude is None:
-            continue
-
-        # Calculate distance
-        dist = haversine(
-            ref_coords,
-            (place.latitude, place.longitude),
-            unit=Unit.KILOMETERS if unit == "km" else Unit.MILES,
-        )
-
-        if dist > radius_display:
-            continue
+    results_by_id: dict[str, dict] = {}
 
+    nearby_places = places_within(
+        ref_coords, radius_display, unit=Unit.KILOMETERS if unit == "km" else Unit.MILES
+    )
+    for place_id, dist in nearby_places:
         # Find individuals associated with this place
-        place_id = place.id
-        for indi_id, indi_place_ids in state.individual_places.items():
-            if place_id not in indi_place_ids:
-                continue
-
+        for indi_id in state.place_individuals.get(place_id, ()):
             indi = state.individuals.get(indi_id)
             if not indi:
                 continue
@@ -911,23 +869,21 @@ def _search_proximity_mode(
             # Collect matching events at this place
             matching_events: list[dict] = []
             for event in indi.events:
-                if event.place:
-                    event_place_id = get_place_id(event.place)
-                    if event_place_id == place_id:
-                        # Filter by event type if specified
-                        if event_types and event.type not in event_types:
-                            continue
-                        # Get geocode info for this place
-                        cached = _geocache.get(place_id, {})
-                        matching_events.append(
-                            {
-                                "place": event.place,
-                                "event": event.type,
-                                "date": event.date,
-                                "geocode_confidence": cached.get("confidence", "unknown"),
-                                "geocode_source": cached.get("source", "unknown"),
-                            }
-                        )
+                if event.place_id == place_id:
+                    # Filter by event type if specified
+                    if event_types and event.type not in event_types:
+                        continue
+                    # Get geocode info for this place
+                    cached = _geocache.get(place_id, {})
+                    matching_events.append(
+                        {
+                            "place": event.place,
+                            "event": event.type,
+                            "date": event.date,
+                            "geocode_confidence": cached.get("confidence", "unknown"),
+                            "geocode_source": cached.get("source", "unknown"),
+                        }
+                    )
 
             # Also check birth/death places
             if indi.birth_place:
@@ -961,33 +917,29 @@ def _search_proximity_mode(
             if not matching_events:
                 continue
 
-            if indi_id in seen_individuals:
+            r = results_by_id.get(indi_id)
+            if r is not None:
                 # Add new matching places to existing result
-                for r in results:
-                    if r["individual_id"] == indi_id:
-                        # Update distance if closer
-                        if dist < r["distance_miles"]:
-                            r["distance_miles"] = round(dist, 1)
-                        # Add new matching events
-                        existing_places = {(e["place"], e["event"]) for e in r["matching_places"]}
-                        for me in matching_events:
-                            if (me["place"], me["event"]) not in existing_places:
-                                r["matching_places"].append(me)
-                        break
+                # Update distance if closer
+                if dist < r["distance_miles"]:
+                    r["distance_miles"] = round(dist, 1)
+                # Add new matching events
+                existing_places = {(e["place"], e["event"]) for e in r["matching_places"]}
+                for me in matching_events:
+                    if (me["place"], me["event"]) not in existing_places:
+                        r["matching_places"].append(me)
             else:
-                seen_individuals.add(indi_id)
-                results.append(
-                    {
-                        "individual_id": indi_id,
-                        "name": indi.full_name(),
-                        "distance_miles": round(dist, 1),
-                        "matching_places": matching_events,
-                    }
-                )
+                r = {
+                    "individual_id": indi_id,
+                    "name": indi.full_name(),
+                    "distance_miles": round(dist, 1),
+                    "matching_places": matching_events,
+                }
+                results_by_id[indi_id] = r
+                results.append(r)
 
-    # Sort by distance
-    results.sort(key=lambda x: x["distance_miles"])
-    results = results[:max_results]
+    # Nearest first; only the kept results are ordered
+    results = heapq.nsmallest(max_results, results, key=lambda x: x["distance_miles"])
 
     # Build response
     response = {
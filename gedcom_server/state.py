@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import os
 from collections import defaultdict
+from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 
 if TYPE_CHECKING:
-    from .models import Family, Individual, Place, Repository, Source
+    from .models import Citation, Event, Family, Individual, Place, Repository, Source
 
 # Configuration (set by configure() at startup)
 GEDCOM_FILE: Path | None = None
@@ -24,14 +25,70 @@ repositories: dict[str, Repository] = {}
 surname_index: dict[str, list[str]] = defaultdict(list)
 birth_year_index: dict[int, list[str]] = defaultdict(list)
 place_index: dict[str, list[str]] = defaultdict(list)  # place (lowercase) -> individual IDs
+place_index_keys: list[str] = []  # keys of place_index, in order
+place_index_text: str = ""  # place_index_keys, newline-joined
+place_index_starts: list[int] = []  # offset of each key within place_index_text
+event_year_index: dict[int, list[tuple[int, int]]] = {}  # year -> (individual pos, event pos)
 
 # Place indexes for fuzzy search and geocoding
 places: dict[str, Place] = {}  # place_id -> Place
 individual_places: dict[str, list[str]] = defaultdict(list)  # individual_id -> list of place_ids
-
+place_individuals: dict[str, list[str]] = {}  # place_id -> individual IDs (inverse of the above)
+place_metaphone: dict[str, list[str]] = {}  # metaphone of first word -> place_ids
+place_ids: list[str] = []  # place positions for place_normalized
+place_positions: dict[str, int] = {}  # place_id -> position in place_ids
+place_normalized: list[str] = []  # normalized form of each place, fuzzy-match choices
+place_trigram_index: dict[str, set[int]] = {}  # positions in place_ids (normalized forms)
+place_coords_version: int = 0  # bumped whenever a place gains coordinates (see geoindex.py)
+
+# Every individual's biography, built at load when BIOGRAPHY_PREBUILD_ENABLED=true
+# (see narrative.build_all_biographies); empty otherwise
+biographies: dict[str, dict] = {}
+
+# Accepted spellings of every record ID -> normalized ID (see core._normalize_lookup_id)
+lookup_ids: dict[str, str] = {}
+
+# (individual ID, family ID) -> the other spouse in that family, for each FAMS link
+spouse_of: dict[tuple[str, str], str | None] = {}
+
+# Dense integer numbering of individuals (load order), used by array-backed indexes
+individual_ids: list[str] = []  # dense index -> individual ID
+individual_index: dict[str, int] = {}  # individual ID -> dense index
+
+# Trigram postings for substring search (trigram -> positions; see helpers.build_trigram_index)
+name_trigram_index: dict[str, set[int]] = {}  # positions in individual_ids (full names)
+name_search_keys: list[str] = []  # lowercased full name per position in individual_ids
+narrative_trigram_index: dict[str, set[int]] = {}  # positions in individual_ids (notes, citations)
+narrative_text: str = ""  # every lowercased narrative text, newline-joined in individual_ids order
+narrative_text_starts: list[int] = []  # offset of each text within narrative_text
+# (source, event, citation, original text) of each text in narrative_text, in the same order
+narrative_sources: list[tuple[str, Event | None, Citation | None, str]] = []
+narrative_text_offsets: list[int] = []  # individual position -> its first text (CSR, n + 1 long)
+source_ids: list[str] = []  # source positions for source_trigram_index
+source_trigram_index: dict[str, set[int]] = {}  # positions in source_ids (title, author)
+
+# Note: Parent/child CSR arrays are managed in pedigree.py module
 # Note: Semantic search state is managed in semantic.py module
 # (embeddings, embedding_ids, embedding_texts)
 
+# Cache-clearing hooks for memoized lookups, run by load_gedcom() after a tree is loaded
+_cache_clear_hooks: list[Callable[[], None]] = []
+
+
+def register_cache(clear: Callable[[], None]) -> Callable[[], None]:
+    """Register a hook that drops memoized results derived from the loaded tree.
+
+    Returns the hook unchanged so it can be used as a decorator.
+    """
+    _cache_clear_hooks.append(clear)
+    return clear
+
+
+def clear_caches() -> None:
+    """Invalidate every registered cache. Called whenever a GEDCOM file is (re)loaded."""
+    for clear in _cache_clear_hooks:
+        clear()
+
 
 def _resolve_gedcom_path() -> Path:
     """Get GEDCOM path from GEDCOM_FILE env var.
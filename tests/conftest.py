@@ -1,6 +1,7 @@
 """Shared fixtures for GEDCOM server tests."""
 
 import os
+import random
 from pathlib import Path
 
 import pytest
@@ -126,3 +127,207 @@ def individual_with_notes():
             if event.notes:
                 return indi
     pytest.skip("No individual with notes found")
+
+
+# A synthetic tree for equivalence tests of the indexes, which the six-person sample.ged
+# barely exercises: a few hundred people over several generations, with cousin marriages
+# (pedigree collapse, several common ancestors at the same distance), remarriages
+# (half-siblings), overlapping surnames and place spellings, notes and citations.
+_GIVEN_NAMES = {
+    "M": ["John", "Johann", "James", "Robert", "Michael", "Patrick", "Thomas", "Hans", "Jan"],
+    "F": ["Mary", "Maria", "Anna", "Ann", "Sarah", "Emily", "Bridget", "Rose", "Johanna"],
+}
+_SURNAMES = ["Smith", "Smithson", "Goldsmith", "Anderson", "Andersen", "Sanders", "Miller"]
+_SURNAMES += ["Muller", "O'Brien", "Brien", "MacDonald", "Donaldson", "Kowalski", "Nowak"]
+_PLACES = [
+    "Boston, Suffolk, Massachusetts, USA",
+    "Boston, MA, USA",
+    "South Boston, Suffolk, Massachusetts, USA",
+    "New York, New York, USA",
+    "New York, NY, USA",
+    "Brooklyn, Kings, New York, USA",
+    "Danzig, West Prussia, Germany",
+    "Gdansk, Pomorskie, Poland",
+    "Breslau, Silesia, Germany",
+    "Wroclaw, Dolnoslaskie, Poland",
+    "Cork, County Cork, Ireland",
+    "St. Louis, Missouri, USA",
+    "Saint Louis, MO, USA",
+    "Springfield, Illinois, USA",
+    "Springfield, Massachusetts, USA",
+    "Dublin, Ireland",
+    "Dublin, Ohio, USA",
+]
+_OCCUPATIONS = ["Coal miner", "Farmer", "Blacksmith", "Teacher", "Seamstress", "Sailor"]
+_MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+
+def _write_generated_tree(path: Path, seed: int = 1, generations: int = 6) -> None:
+    """Write a deterministic synthetic GEDCOM file to path."""
+    rng = random.Random(seed)
+    people: list[dict] = []
+    fams: list[dict] = []
+
+    def person(sex: str, surname: str, year: int, famc: str | None = None) -> dict:
+        p = {
+            "id": f"@I{len(people) + 1}@",
+            "sex": sex,
+            "given": rng.choice(_GIVEN_NAMES[sex]),
+            "surname": surname,
+            "year": year,
+            "famc": famc,
+            "fams": [],
+        }
+        people.append(p)
+        return p
+
+    def family(husband: dict, wife: dict, year: int) -> dict:
+        fam = {"id": f"@F{len(fams) + 1}@", "husb": husband, "wife": wife, "year": year}
+        fam["children"] = []
+        fams.append(fam)
+        husband["fams"].append(fam["id"])
+        wife["fams"].append(fam["id"])
+        return fam
+
+    def outsider(sex: str, year: int) -> dict:
+        return person(sex, rng.choice(_SURNAMES), year + rng.randint(-4, 4))
+
+    # Founding couples, then each generation marries within itself (cousins included) or
+    # to outsiders, and some remarry
+    generation = []
+    for _ in range(8):
+        year = rng.randint(1780, 1800)
+        generation.append(family(outsider("M", year), outsider("F", year), year + 22))
+    for _ in range(generations):
+        children: list[dict] = []
+        for fam in generation:
+            born = fam["year"] + 1
+            for _ in range(rng.randint(1, 4)):
+                sex = rng.choice("MF")
+                child = person(sex, fam["husb"]["surname"], born, fam["id"])
+                fam["children"].append(child)
+                children.append(child)
+                born += rng.randint(1, 3)
+        rng.shuffle(children)
+        men = [c for c in children if c["sex"] == "M"]
+        women = [c for c in children if c["sex"] == "F"]
+        generation = []
+        while (men or women) and len(generation) < 18:
+            husband = (
+                men.pop() if men and rng.random() < 0.8 else outsider("M", children[0]["year"])
+            )
+            wife = women.pop() if women and rng.random() < 0.8 else outsider("F", husband["year"])
+            if husband["famc"] is not None and husband["famc"] == wife["famc"]:
+                wife = outsider("F", husband["year"])  # never siblings
+            generation.append(family(husband, wife, max(husband["year"], wife["year"]) + 22))
+            if rng.random() < 0.15:
+                second = outsider("F", husband["year"])
+                generation.append(family(husband, second, husband["year"] + 30))
+
+    lines = ["0 HEAD", "1 SOUR TestGen", "1 GEDC", "2 VERS 5.5.1", "1 CHAR UTF-8"]
+    lines += ["0 @S1@ SOUR", "1 TITL Parish Registers", "1 AUTH Diocese of Cork"]
+    lines += ["0 @S2@ SOUR", "1 TITL US Census Records", "1 AUTH US Census Bureau"]
+
+    def event(tag: str, year: int, note: str | None = None) -> None:
+        lines.append(f"1 {tag}")
+        if rng.random() < 0.9:
+            day, month = rng.randint(1, 28), rng.choice(_MONTHS)
+            lines.append(
+                f"2 DATE {day} {month} {year}" if rng.random() < 0.8 else f"2 DATE ABT {year}"
+            )
+        if rng.random() < 0.9:
+            lines.append(f"2 PLAC {rng.choice(_PLACES)}")
+        if note:
+            lines.append(f"2 NOTE {note}")
+        if rng.random() < 0.3:
+            lines.extend([f"2 SOUR @S{rng.randint(1, 2)}@", f"3 PAGE Page {rng.randint(1, 400)}"])
+            if rng.random() < 0.5:
+                lines.extend(["3 DATA", f"4 TEXT Entry for the {tag.lower()} in {year}"])
+
+    for p in people:
+        lines += [f"0 {p['id']} INDI", f"1 NAME {p['given']} /{p['surname']}/", f"1 SEX {p['sex']}"]
+        event("BIRT", p["year"])
+        if rng.random() < 0.4:
+            occupation = rng.choice(_OCCUPATIONS)
+            event("OCCU", p["year"] + 20, f"Worked as a {occupation.lower()}")
+        if rng.random() < 0.3:
+            event("RESI", p["year"] + rng.randint(10, 40), "Emigrated with the family")
+        if rng.random() < 0.7:
+            event("DEAT", p["year"] + rng.randint(30, 90))
+        if rng.random() < 0.2:
+            lines.append(f"1 NOTE {p['given']} was remembered as a devoted parent.")
+        if p["famc"]:
+            lines.append(f"1 FAMC {p['famc']}")
+        lines += [f"1 FAMS {fam_id}" for fam_id in p["fams"]]
+    for fam in fams:
+        lines += [
+            f"0 {fam['id']} FAM",
+            f"1 HUSB {fam['husb']['id']}",
+            f"1 WIFE {fam['wife']['id']}",
+        ]
+        lines += [f"1 CHIL {child['id']}" for child in fam["children"]]
+        event("MARR", fam["year"])
+    lines.append("0 TRLR")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _load_tree(path: Path) -> None:
+    """Replace the loaded tree with the GEDCOM file at path."""
+    from gedcom_server import state
+    from gedcom_server.parsing import load_gedcom
+
+    # load_gedcom() adds to the record dicts and their parse-time indexes; the rest it rebuilds
+    for index in (
+        state.individuals,
+        state.families,
+        state.sources,
+        state.repositories,
+        state.surname_index,
+        state.birth_year_index,
+        state.place_index,
+        state.places,
+        state.individual_places,
+    ):
+        index.clear()
+    state.GEDCOM_FILE = path
+    state.place_coords_version += 1
+    load_gedcom()
+
+
+@pytest.fixture(scope="session")
+def generated_gedcom(tmp_path_factory):
+    """Path of the synthetic GEDCOM file."""
+    path = tmp_path_factory.mktemp("generated") / "generated.ged"
+    _write_generated_tree(path)
+    return path
+
+
+@pytest.fixture
+def generated_tree(generated_gedcom, monkeypatch):
+    """Load the synthetic tree in place of sample.ged for one test."""
+    # No background geocoding of the synthetic places
+    monkeypatch.setenv("GIS_SEARCH_ENABLED", "false")
+    _load_tree(generated_gedcom)
+    monkeypatch.undo()
+    yield generated_gedcom
+    _load_tree(_TEST_GEDCOM)
+
+
+@pytest.fixture
+def empty_tree(tmp_path, monkeypatch):
+    """Load a GEDCOM file with no records in place of sample.ged for one test."""
+    path = tmp_path / "empty.ged"
+    path.write_text("0 HEAD\n1 GEDC\n2 VERS 5.5.1\n1 CHAR UTF-8\n0 TRLR\n")
+    monkeypatch.setenv("GIS_SEARCH_ENABLED", "false")
+    _load_tree(path)
+    monkeypatch.undo()
+    yield path
+    _load_tree(_TEST_GEDCOM)
+
+
+@pytest.fixture(params=["sample", "generated"])
+def tree(request):
+    """Run a test against sample.ged and against the synthetic tree."""
+    if request.param == "generated":
+        request.getfixturevalue("generated_tree")
+    return request.param
@@ -2,7 +2,7 @@
 
 import pytest
 
-from gedcom_server.core import _get_relationship_matrix, _get_surname_group
+from gedcom_server.core import _get_relationship, _get_relationship_matrix, _get_surname_group
 from gedcom_server.events import _get_events_batch
 from gedcom_server.narrative import _get_biographies_batch
 from gedcom_server.state import families, individuals, surname_index
@@ -44,6 +44,12 @@ class TestGetEventsBatch:
         # Result should use normalized form
         assert f"@{stripped_id}@" in result
 
+    def test_duplicate_ids_collapse(self, sample_individual_id):
+        """Repeated IDs in either form should yield one entry."""
+        stripped_id = sample_individual_id.strip("@")
+        result = _get_events_batch([sample_individual_id, stripped_id, sample_individual_id])
+        assert list(result) == [sample_individual_id]
+
 
 class TestGetBiographiesBatch:
     """Tests for _get_biographies_batch."""
@@ -81,6 +87,34 @@ class TestGetBiographiesBatch:
         for parent in bio["parents"]:
             assert not parent.startswith("@")
 
+    def test_duplicate_ids_built_once(self, sample_individual_id, monkeypatch):
+        """Each unique ID should be built once however often it is repeated."""
+        from gedcom_server import narrative
+
+        calls = []
+        original = narrative._get_biography
+
+        def counting(individual_id):
+            calls.append(individual_id)
+            return original(individual_id)
+
+        monkeypatch.setattr(narrative, "_get_biography", counting)
+        stripped_id = sample_individual_id.strip("@")
+        result = _get_biographies_batch([sample_individual_id, stripped_id, sample_individual_id])
+        assert list(result) == [sample_individual_id]
+        assert calls == [sample_individual_id]
+
+    def test_parallel_path_matches_serial(self, monkeypatch):
+        """The thread-pool path (free-threaded Python) should return the same result."""
+        from gedcom_server import narrative
+
+        ids = list(individuals.keys())
+        serial = _get_biographies_batch(ids)
+        monkeypatch.setattr(narrative, "_gil_enabled", lambda: False)
+        parallel = _get_biographies_batch(ids)
+        assert parallel == serial
+        assert list(parallel) == list(serial)
+
 
 class TestGetSurnameGroup:
     """Tests for _get_surname_group."""
@@ -99,6 +133,21 @@ class TestGetSurnameGroup:
         assert result["count"] > 0
         assert len(result["individuals"]) == result["count"]
 
+    def test_cached_per_surname_case_insensitively(self, sample_surname):
+        """Different casings should share the cached statistics but keep their own label."""
+        lower = _get_surname_group(sample_surname.lower())
+        upper = _get_surname_group(sample_surname.upper())
+        assert upper["surname"] == sample_surname.upper()
+        assert upper["statistics"] is lower["statistics"]
+        assert upper["individuals"] == lower["individuals"]
+
+    def test_include_spouses_is_separate_cache_entry(self, sample_surname):
+        """include_spouses should not be served from the plain group's entry."""
+        plain = _get_surname_group(sample_surname)
+        with_spouses = _get_surname_group(sample_surname, include_spouses=True)
+        assert all(not d.get("is_spouse") for d in plain["individuals"])
+        assert len(with_spouses["individuals"]) >= len(plain["individuals"])
+
     def test_returns_empty_for_invalid_surname(self):
         """Should return empty list for unknown surname."""
         result = _get_surname_group("ZZZZNOTASURNAME")
@@ -197,6 +246,14 @@ class TestGetRelationshipMatrix:
         rel = result["relationships"][0]
         assert rel["relationship"] in ("parent", "child")
 
+    def test_matches_pairwise_relationship(self, tree):
+        """Matrix entries should agree with _get_relationship for every pair."""
+        ids = list(individuals.keys())[:: 1 if tree == "sample" else 6]
+        result = _get_relationship_matrix(ids)
+        for rel in result["relationships"]:
+            expected = _get_relationship(rel["id1"], rel["id2"])["relationship"]
+            assert rel["relationship"] == expected
+
     def test_relationship_includes_both_ids(self):
         """Each relationship should include both IDs."""
         ids = list(individuals.keys())[:3]
@@ -0,0 +1,68 @@
+"""Tests for the per-individual column arrays."""
+
+from gedcom_server import columns
+from gedcom_server.core import _get_statistics, _search_by_birth
+from gedcom_server.helpers import extract_year
+from gedcom_server.state import individual_ids, individuals
+
+
+class TestColumns:
+    """Tests for the values extracted by build_columns."""
+
+    def test_lengths_match_dense_ids(self):
+        """Every column should have one entry per individual."""
+        assert len(columns.birth_years) == len(individual_ids)
+        assert len(columns.sex_codes) == len(individual_ids)
+        assert len(columns.birth_place_codes) == len(individual_ids)
+
+    def test_values_match_individuals(self):
+        """Columns should hold each individual's birth year, sex and birth place."""
+        sexes = {"M": columns.SEX_MALE, "F": columns.SEX_FEMALE}
+        for i, indi_id in enumerate(individual_ids):
+            indi = individuals[indi_id]
+            assert columns.birth_years[i] == (extract_year(indi.birth_date) or 0)
+            assert columns.sex_codes[i] == sexes.get(indi.sex or "", columns.SEX_UNKNOWN)
+            code = columns.birth_place_codes[i]
+            if indi.birth_place:
+                assert columns.birth_place_names[code] == indi.birth_place
+            else:
+                assert code == -1
+
+    def test_positions_born_between(self):
+        """Year windows should select known birth years in load order."""
+        expected = [
+            i
+            for i, indi_id in enumerate(individual_ids)
+            if (year := extract_year(individuals[indi_id].birth_date)) and 1850 <= year <= 1900
+        ]
+        assert columns.positions_born_between(1850, 1900).tolist() == expected
+
+    def test_timelines_are_stable_sorts_of_events(self):
+        """Each timeline should order all of an individual's events by year, then date string."""
+        assert len(columns.timeline_offsets) == len(individual_ids) + 1
+        for i, indi_id in enumerate(individual_ids):
+            events = individuals[indi_id].events
+            expected = sorted(
+                range(len(events)),
+                key=lambda e: (extract_year(events[e].date) or 9999, events[e].date or ""),
+            )
+            assert columns.timeline_of(i) == expected
+
+
+class TestColumnConsumers:
+    """Tests for results computed from the columns."""
+
+    def test_statistics_sex_counts(self):
+        """Sex counts should match a direct count over individuals."""
+        stats = _get_statistics()
+        assert stats["males"] == sum(1 for i in individuals.values() if i.sex == "M")
+        assert stats["females"] == sum(1 for i in individuals.values() if i.sex == "F")
+        assert isinstance(stats["males"], int)
+
+    def test_search_by_birth_year_window(self):
+        """Birth search by year should return individuals in load order."""
+        result = _search_by_birth(year=1900, year_range=50, max_results=10000)
+        ids = [r["id"] for r in result]
+        assert ids == [i for i in individual_ids if i in set(ids)]
+        for r in result:
+            assert 1850 <= extract_year(individuals[r["id"]].birth_date) <= 1950
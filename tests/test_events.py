@@ -10,9 +10,9 @@ from gedcom_server.events import (
     _get_timeline,
     _search_events,
 )
-from gedcom_server.helpers import extract_year
+from gedcom_server.helpers import extract_year, get_place_id
 from gedcom_server.models import Citation, Event
-from gedcom_server.state import HOME_PERSON_ID, families, individuals
+from gedcom_server.state import HOME_PERSON_ID, families, individuals, places
 
 
 class TestCitationDataclass:
@@ -34,6 +34,13 @@ class TestCitationDataclass:
         assert d["text"] == "Extracted text"
         assert d["url"] == "https://example.com"
 
+    def test_citation_to_biography_dict(self):
+        """Should keep only the set details, falling back to the source ID, built once."""
+        citation = Citation(source_id="@S1@", page="Page 42")
+        d = citation.to_biography_dict()
+        assert d == {"source": "@S1@", "page": "Page 42"}
+        assert citation.to_biography_dict() is d
+
     def test_citation_defaults(self):
         """Should have sensible defaults."""
         citation = Citation(source_id="@S1@")
@@ -66,6 +73,18 @@ class TestEventDataclass:
         assert d["citations"][0]["source_id"] == "@S1@"
         assert d["notes"] == ["A note"]
 
+    def test_event_to_biography_dict(self):
+        """Should omit empty details, include compact citations, and be built once."""
+        event = Event(type="BIRT", date="1900", citations=[Citation(source_id="@S1@")])
+        d = event.to_biography_dict()
+        assert d == {
+            "type": "BIRT",
+            "date": "1900",
+            "place": None,
+            "citations": [{"source": "@S1@"}],
+        }
+        assert event.to_biography_dict() is d
+
     def test_event_defaults(self):
         """Should have sensible defaults."""
         event = Event(type="BIRT")
@@ -91,6 +110,16 @@ class TestEventsLoaded:
                 assert event.type is not None
                 assert event.type in EVENT_TAGS
 
+    def test_events_carry_place_ids(self):
+        """Each event's place ID should be set at parse time and point into the places index."""
+        for indi in individuals.values():
+            for event in indi.events:
+                if event.place:
+                    assert event.place_id == get_place_id(event.place)
+                    assert event.place_id in places
+                else:
+                    assert event.place_id is None
+
 
 class TestGetEvents:
     """Tests for the get_events function."""
@@ -151,6 +180,24 @@ class TestSearchEvents:
             assert "individual_id" in result[0]
             assert "individual_name" in result[0]
 
+    def test_year_search_matches_full_scan(self, tree):
+        """Year-indexed search should return what a full scan returns, in scan order."""
+        years = {extract_year(e.date) for i in individuals.values() for e in i.events} - {None}
+        for year in sorted(years):
+            for year_range in (0, 5):
+                expected = []
+                for indi in individuals.values():
+                    for event in indi.events:
+                        event_year = extract_year(event.date)
+                        if event_year and abs(event_year - year) <= year_range:
+                            result = event.to_dict()
+                            result["individual_id"] = indi.id
+                            result["individual_name"] = indi.full_name()
+                            expected.append(result)
+                assert _search_events(year=year, year_range=year_range, max_results=1000) == (
+                    expected
+                )
+
 
 class TestGetCitations:
     """Tests for the get_citations function."""
@@ -383,3 +430,35 @@ class TestGetFamilyTimeline:
             unique_individuals = {e["individual_id"] for e in result}
             # Should have events from multiple individuals
             assert len(unique_individuals) >= 2
+
+    def test_year_windows_match_filtering_the_full_merge(self, tree):
+        """Every year window should equal filtering and sorting the events directly."""
+
+        def reference(ids, start_year, end_year):
+            events = []
+            for indi in (individuals[i] for i in ids):
+                for event in indi.events:
+                    year = extract_year(event.date)
+                    if start_year and year and year < start_year:
+                        continue
+                    if end_year and year and year > end_year:
+                        continue
+                    events.append({**event.to_dict(), "individual_id": indi.id})
+            events.sort(
+                key=lambda e: (extract_year(e["date"]) or 9999, e["date"] or ""),
+            )
+            return [(e["individual_id"], e["type"], e["date"]) for e in events]
+
+        ids = [indi.id for indi in individuals.values() if indi.events][:15]
+        windows = [(None, None), (1900, None), (None, 1950), (1900, 1950), (1950, 1900)]
+        windows += [(year, year + 10) for year in range(1800, 2030, 25)]
+        for start_year, end_year in windows:
+            result = _get_family_timeline(ids, start_year=start_year, end_year=end_year)
+            got = [(e["individual_id"], e["type"], e["date"]) for e in result]
+            assert got == reference(ids, start_year, end_year)
+
+    def test_duplicate_ids_included_once(self):
+        """Repeating an ID (in either form) should not repeat its events."""
+        indi = next(indi for indi in individuals.values() if indi.events)
+        bare_id = indi.id.strip("@")
+        assert _get_family_timeline([indi.id, bare_id, indi.id]) == _get_family_timeline([indi.id])
@@ -41,6 +41,14 @@ class TestLoadedData:
         """Should build surname index."""
         assert len(surname_index) > 0
 
+    def test_repeated_strings_share_one_object(self):
+        """Equal surnames and places should be stored once (interned on load)."""
+        by_value: dict[str, str] = {}
+        for indi in individuals.values():
+            values = [indi.surname, indi.birth_place, *(e.place for e in indi.events)]
+            for value in filter(None, values):
+                assert by_value.setdefault(value, value) is value
+
 
 class TestStatistics:
     """Tests for the get_statistics function."""
@@ -69,6 +77,16 @@ class TestStatistics:
         assert stats["total_individuals"] > 0
         assert stats["total_families"] > 0
 
+    def test_statistics_computed_once_per_load(self):
+        """Repeated calls share one result until the caches are cleared on load."""
+        from gedcom_server import state
+
+        stats = _get_statistics()
+        assert _get_statistics() is stats
+        state.clear_caches()
+        assert _get_statistics() is not stats
+        assert _get_statistics() == stats
+
 
 class TestSearchIndividuals:
     """Tests for the search_individuals function."""
@@ -94,6 +112,23 @@ class TestSearchIndividuals:
         # Both should find the same people
         assert len(upper) == len(lower)
 
+    def test_indexed_search_matches_full_scan(self, tree):
+        """Indexed and scanned search should find exactly what a full scan finds, in order."""
+        from gedcom_server.state import individuals
+
+        queries = ("Smith", "ohn", "MATT", "an", "zzz", "n S", "", "a", "Q", "h ")
+        for query in (*queries, "smiths", "Anders", "o'b", "mac", "ria mu", "donald"):
+            q = query.lower()
+            expected = [
+                indi.to_summary() for indi in individuals.values() if q in indi.full_name().lower()
+            ]
+            assert _search_individuals(query, max_results=1000) == expected
+
+    def test_search_of_empty_tree(self, empty_tree):
+        assert _search_individuals("") == []
+        assert _search_individuals("a") == []
+        assert _search_individuals("smith") == []
+
 
 class TestGetIndividual:
     """Tests for the get_individual function."""
@@ -196,6 +231,41 @@ class TestAncestorDescendant:
         result = _get_descendants(indi_id, generations=2)
         assert isinstance(result, dict)
 
+    def test_descendant_tree_matches_plain_recursion(self):
+        """Sharing repeated subtrees should not change any descendant tree."""
+
+        def expected(indi_id, gen):
+            result = individuals[indi_id].to_summary()
+            if gen > 1:
+                children = []
+                for fam_id in individuals[indi_id].families_as_spouse:
+                    fam = families.get(fam_id)
+                    if fam:
+                        children.extend(c for c in fam.children_ids if c in individuals)
+                if children:
+                    result["children"] = [expected(c, gen - 1) for c in children]
+            return result
+
+        for indi_id in individuals:
+            assert _get_descendants(indi_id, generations=4) == expected(indi_id, 5)
+
+    def test_ancestor_tree_matches_plain_recursion(self):
+        """Sharing repeated subtrees should not change any ancestor tree."""
+
+        def expected(indi_id, gen):
+            if not indi_id or gen <= 0 or indi_id not in individuals:
+                return None
+            indi = individuals[indi_id]
+            result = indi.to_summary()
+            fam = families.get(indi.family_as_child) if indi.family_as_child else None
+            if gen > 1 and fam:
+                result["father"] = expected(fam.husband_id, gen - 1)
+                result["mother"] = expected(fam.wife_id, gen - 1)
+            return result
+
+        for indi_id in individuals:
+            assert _get_ancestors(indi_id, generations=4) == expected(indi_id, 5)
+
 
 class TestSearchByBirth:
     """Tests for birth search function."""
@@ -213,6 +283,15 @@ class TestSearchByBirth:
         # Exact year match should still work
         assert isinstance(results, list)
 
+    def test_results_follow_load_order(self):
+        """Year-bucketed results should come back in tree load order."""
+        from gedcom_server.state import individual_index
+
+        for year in birth_year_index:
+            results = _search_by_birth(year=year, year_range=50)
+            positions = [individual_index[r["id"]] for r in results]
+            assert positions == sorted(positions)
+
 
 class TestSearchByPlace:
     """Tests for place search function."""
@@ -302,6 +381,21 @@ class TestGetSurnameOrigins:
         assert "span_years" in stats
         assert "common_places" in stats
 
+    def test_surname_origins_timeline_order(self):
+        """Places run by earliest birth with distinct ascending years; the first is the origin."""
+        for surname in surname_index:
+            result = _get_surname_origins(surname)
+            timeline = list(result["place_timeline"].items())
+            for _place, years in timeline:
+                assert years == sorted(set(years))
+            earliest = [years[0] for _place, years in timeline]
+            assert earliest == sorted(earliest)
+            if timeline:
+                place, years = timeline[0]
+                assert result["primary_origin"] == {"place": place, "earliest_year": years[0]}
+            else:
+                assert result["primary_origin"] is None
+
     def test_surname_origins_nonexistent(self):
         result = _get_surname_origins("ZZZZNONEXISTENT")
         assert result["count"] == 0
@@ -330,3 +424,14 @@ class TestGetMilitaryService:
             assert "name" in person
             assert "military_events" in person
             assert isinstance(person["military_events"], list)
+
+    def test_keyword_match_in_description_or_note(self):
+        """Any keyword, in any case, in a description or note marks the event military."""
+        from gedcom_server.events import _MILITARY_KEYWORDS, _is_military_event
+        from gedcom_server.models import Event
+
+        for keyword in _MILITARY_KEYWORDS:
+            assert _is_military_event(Event("EVEN", description=f"Joined the {keyword.upper()}"))
+            assert _is_military_event(Event("RESI", notes=["x", f"see {keyword} records"]))
+        assert not _is_military_event(Event("EVEN", description="Farmer", notes=["Church"]))
+        assert _is_military_event(Event("_MILT"))
@@ -1,7 +1,19 @@
 """Tests for helper functions."""
 
+import os
+from unittest.mock import patch
+
 from gedcom_server.core import _normalize_lookup_id
-from gedcom_server.helpers import extract_year, normalize_id
+from gedcom_server.helpers import (
+    build_trigram_index,
+    extract_year,
+    gedcom_cache_fields,
+    gedcom_cache_valid,
+    gedcom_file_hash,
+    normalize_id,
+    trigram_candidates,
+    trigrams,
+)
 from gedcom_server.models import Family, Individual
 
 
@@ -48,6 +60,81 @@ class TestExtractYear:
         assert extract_year("(29 Nov. 1886)") == 1886
 
 
+class TestTrigramIndex:
+    """Tests for the trigram substring-search helpers."""
+
+    def test_trigrams(self):
+        """Should return distinct 3-character substrings."""
+        assert trigrams("anna") == {"ann", "nna"}
+        assert trigrams("ab") == set()
+
+    def test_build_index_maps_positions(self):
+        """Each trigram should map to the positions of texts containing it."""
+        index = build_trigram_index(["smith", "smythe", "mitchell"])
+        assert index["smi"] == {0}
+        assert index["mit"] == {0, 2}
+
+    def test_candidates_superset_of_matches(self):
+        """Candidates should include every text containing the query."""
+        texts = ["john smith", "joan smyth", "johnson", "mary jones"]
+        index = build_trigram_index(texts)
+        for query in ("joh", "smith", "son", "ones", "xyz"):
+            candidates = trigram_candidates(index, query)
+            assert candidates is not None
+            assert [i for i, t in enumerate(texts) if query in t] == [
+                i for i in candidates if query in texts[i]
+            ]
+
+    def test_short_query_returns_none(self):
+        """Queries under three characters can't use the index."""
+        index = build_trigram_index(["smith"])
+        assert trigram_candidates(index, "sm") is None
+        assert trigram_candidates(index, "") is None
+
+
+class TestGedcomCacheFields:
+    """Tests for identifying the GEDCOM file a cache was built from."""
+
+    def test_file_hash_is_stable(self, tmp_path):
+        """The same content should hash the same, as a SHA256 hex digest."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n1 SOUR Test\n")
+        assert gedcom_file_hash(test_ged) == gedcom_file_hash(test_ged)
+        assert len(gedcom_file_hash(test_ged)) == 64
+
+    def test_unchanged_file_is_not_rehashed(self, tmp_path):
+        """A matching mtime and size should validate the cache without hashing."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n")
+        fields = gedcom_cache_fields(test_ged)
+        with patch("gedcom_server.helpers.gedcom_file_hash") as mock_hash:
+            assert gedcom_cache_valid(test_ged, fields) is True
+            mock_hash.assert_not_called()
+
+    def test_touched_file_falls_back_to_hash(self, tmp_path):
+        """A new mtime with the same content should still validate, by hash."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n")
+        fields = gedcom_cache_fields(test_ged)
+        os.utime(test_ged, ns=(0, 0))
+        assert gedcom_cache_valid(test_ged, fields) is True
+
+    def test_changed_file_is_invalid(self, tmp_path):
+        """Changed content should invalidate the cache."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n")
+        fields = gedcom_cache_fields(test_ged)
+        test_ged.write_text("0 HEAD\n1 SOUR Modified\n")
+        assert gedcom_cache_valid(test_ged, fields) is False
+
+    def test_cache_without_stamp_is_checked_by_hash(self, tmp_path):
+        """Caches written before stamps were stored should validate by hash alone."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n")
+        assert gedcom_cache_valid(test_ged, {"gedcom_hash": gedcom_file_hash(test_ged)}) is True
+        assert gedcom_cache_valid(test_ged, {}) is False
+
+
 class TestNormalizeId:
     """Tests for the normalize_id function."""
 
@@ -103,6 +190,34 @@ class TestNormalizeLookupId:
         # The spaces remain inside the @s
         assert "@" in result
 
+    def test_returns_stored_key_object(self):
+        """Normalized lookups should be the very string objects used as dict keys."""
+        from gedcom_server import state
+
+        for indi_id in list(state.individuals)[:20]:
+            lookup_id = _normalize_lookup_id(indi_id.strip("@"))
+            assert lookup_id is next(k for k in state.individuals if k == lookup_id)
+
+    def test_lookup_table_matches_normalization(self):
+        """Precomputed lookups should cover both spellings of every record ID."""
+        from gedcom_server import state
+
+        for records in (state.individuals, state.families, state.sources):
+            for record_id in records:
+                assert state.lookup_ids[record_id] == record_id
+                assert state.lookup_ids[record_id.strip("@")] == record_id
+        assert "@@I123@@" not in state.lookup_ids
+
+    def test_family_references_share_key_objects(self):
+        """Member IDs stored on families should be the individuals' own key objects."""
+        from gedcom_server import state
+
+        keys = {indi_id: indi_id for indi_id in state.individuals}
+        for fam in state.families.values():
+            for member_id in (fam.husband_id, fam.wife_id, *fam.children_ids):
+                if member_id in keys:
+                    assert member_id is keys[member_id]
+
 
 class TestIndividualModel:
     """Tests for the Individual dataclass methods."""
@@ -0,0 +1,247 @@
+"""Tests for MCP tool-layer caching and result serialization."""
+
+from fastmcp.tools import Tool, ToolResult
+
+from gedcom_server import state
+from gedcom_server.core import (
+    _get_descendants,
+    _get_home_person,
+    _get_individual,
+    _get_individuals_batch,
+    _get_relationship,
+    _get_surname_origins,
+    _search_individuals,
+)
+from gedcom_server.events import _get_timeline
+from gedcom_server.mcp_tools import (
+    _cached_biography,
+    _cached_home_person,
+    _cached_individual,
+    _cached_place_cluster,
+    _cached_relationship,
+    _cached_search_individuals,
+    _cached_surname_origins,
+    _cached_timeline,
+    _relationship,
+    cached_tool,
+    clear_all_caches,
+    clear_home_person_cache,
+    json_result,
+)
+from gedcom_server.narrative import _get_biography
+from gedcom_server.places import _get_place_cluster
+
+
+class TestHomePersonCache:
+    """Tests for the memoized home person lookup."""
+
+    def test_matches_uncached_lookup(self):
+        """Cached result should equal a fresh lookup."""
+        clear_home_person_cache()
+        assert _cached_home_person() == _get_home_person()
+
+    def test_repeated_calls_hit_cache(self):
+        """Repeated calls should return the same cached object."""
+        clear_home_person_cache()
+        first = _cached_home_person()
+        assert _cached_home_person() is first
+        assert _cached_home_person.cache_info().hits >= 1
+
+    def test_clear_caches_invalidates(self):
+        """state.clear_caches() (run on tree load) should drop the cached entry."""
+        _cached_home_person()
+        state.clear_caches()
+        assert _cached_home_person.cache_info().currsize == 0
+
+
+def _payload(result):
+    """The value a tool returned, decoded if json_result encoded it."""
+    if not isinstance(result, ToolResult):
+        return result
+    structured = result.structured_content
+    return structured["result"] if result.meta else structured
+
+
+class TestCachedTool:
+    """Tests for the cached_tool decorator."""
+
+    def test_matches_uncached_lookup(self, sample_individual_id):
+        """Cached lookup should equal a fresh lookup."""
+        expected = _get_individual(sample_individual_id)
+        assert _payload(_cached_individual(sample_individual_id)) == expected
+
+    def test_id_forms_share_cache_entry(self):
+        """'I1' and '@I1@' should be served from the same entry."""
+        calls = []
+
+        @cached_tool(maxsize=8)
+        def lookup(record_id):
+            calls.append(record_id)
+            return record_id
+
+        assert lookup("I1") == "@I1@"
+        assert lookup("@I1@") == "@I1@"
+        assert calls == ["@I1@"]
+
+    def test_clear_all_caches(self):
+        """clear_all_caches() should empty every tool cache."""
+        calls = []
+
+        @cached_tool(maxsize=8)
+        def lookup(record_id):
+            calls.append(record_id)
+            return record_id
+
+        lookup("I1")
+        clear_all_caches()
+        lookup("I1")
+        assert len(calls) == 2
+
+    def test_missing_id_returns_none(self):
+        """Unknown IDs should still return None."""
+        assert _payload(_cached_individual("@NONEXISTENT@")) is None
+
+    def test_timeline_matches_uncached(self, sample_individual_id):
+        """Cached timelines should equal fresh computations."""
+        bare_id = sample_individual_id.strip("@")
+        assert _payload(_cached_timeline(bare_id)) == _get_timeline(sample_individual_id)
+        assert _cached_timeline(sample_individual_id) is _cached_timeline(bare_id)
+
+
+class TestRelationshipCache:
+    """Tests for the order-independent relationship cache."""
+
+    def test_matches_uncached_for_both_orders(self, tree):
+        """Every pair should match _get_relationship in either argument order."""
+        ids = list(state.individuals.keys())[:: 1 if tree == "sample" else 8]
+        for id1 in ids:
+            for id2 in ids:
+                assert _relationship(id1, id2, 10) == _get_relationship(id1, id2, 10)
+
+    def test_pair_shares_one_entry(self, individual_with_parents):
+        """(a, b) and (b, a) should be computed once."""
+        fam = state.families[individual_with_parents.family_as_child]
+        parent_id = fam.husband_id or fam.wife_id
+        clear_all_caches()
+        assert _relationship(individual_with_parents.id, parent_id, 10)["relationship"] == "child"
+        assert _relationship(parent_id, individual_with_parents.id, 10)["relationship"] == "parent"
+        info = _cached_relationship.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestSearchCaches:
+    """Tests for the memoized search tools."""
+
+    def test_name_search_is_case_insensitive_cache(self):
+        """Queries differing only in case should share one cached result."""
+        clear_all_caches()
+        first = _cached_search_individuals("smith", 10)
+        assert first == _search_individuals("SMITH", 10)
+        assert _cached_search_individuals("smith", 10) is first
+        assert _cached_search_individuals.cache_info().hits == 1
+
+    def test_place_cluster_matches_uncached(self):
+        """Cached place cluster should equal a fresh computation."""
+        assert _cached_place_cluster("New York", 20) == _get_place_cluster("New York", 20)
+
+    def test_surname_origins_matches_uncached(self):
+        """Cached surname origins should equal a fresh computation."""
+        assert _cached_surname_origins("Smith") == _get_surname_origins("Smith")
+
+    def test_cleared_on_load(self):
+        """state.clear_caches() (run on tree load) should drop cached searches."""
+        _cached_search_individuals("smith", 10)
+        state.clear_caches()
+        assert _cached_search_individuals.cache_info().currsize == 0
+
+
+class TestJsonResult:
+    """Tests for orjson-serialized tool results."""
+
+    @staticmethod
+    def _assert_same_result(func, *args):
+        expected = Tool.from_function(func).convert_result(func(*args))
+        actual = json_result(func)(*args)
+        assert actual.structured_content == expected.structured_content
+        assert actual.meta == expected.meta
+        assert actual.content == expected.content
+
+    def test_dict_result_matches_fastmcp(self, sample_individual_id):
+        """A dict result should match FastMCP's own conversion."""
+
+        def get_descendants(individual_id: str) -> dict:
+            return _get_descendants(individual_id, 3)
+
+        self._assert_same_result(get_descendants, sample_individual_id)
+
+    def test_mapping_result_matches_fastmcp(self, sample_individual_id):
+        """A parameterized dict result is an object too and should not be wrapped."""
+
+        def get_individuals(individual_ids: list[str]) -> dict[str, dict | None]:
+            return _get_individuals_batch(individual_ids)
+
+        self._assert_same_result(get_individuals, [sample_individual_id, "@NONEXISTENT@"])
+
+    def test_list_result_matches_fastmcp(self):
+        """A list result should be wrapped as {"result": ...} like FastMCP does."""
+
+        def search(name: str) -> list[dict]:
+            return _search_individuals(name, 20)
+
+        self._assert_same_result(search, "smith")
+        self._assert_same_result(search, "no such name")
+
+    def test_optional_result_matches_fastmcp(self, sample_individual_id):
+        """A dict-or-None result should match FastMCP's conversion, found or not."""
+
+        def get_biography(individual_id: str) -> dict | None:
+            return _get_biography(individual_id)
+
+        self._assert_same_result(get_biography, sample_individual_id)
+        self._assert_same_result(get_biography, "@NONEXISTENT@")
+
+    def test_reuses_result_for_same_payload(self):
+        """Returning the same (memoized) object again should reuse its encoded result."""
+        payloads = [{"a": 1}]
+
+        def latest() -> dict:
+            return payloads[-1]
+
+        tool = json_result(latest)
+        first = tool()
+        assert tool() is first
+        payloads.append({"a": 1})
+        assert tool() is not first
+        assert tool().structured_content == first.structured_content
+
+    def test_plain_result_shares_payload(self, sample_individual_id):
+        """A plain payload should be the structured content itself, with the same output."""
+
+        def get_biography(individual_id: str) -> dict | None:
+            return _get_biography(individual_id)
+
+        plain = json_result(get_biography, plain=True)(sample_individual_id)
+        copied = json_result(get_biography)(sample_individual_id)
+        assert plain.structured_content["result"] is _get_biography(sample_individual_id)
+        assert plain.structured_content == copied.structured_content
+        assert plain.content == copied.content
+
+    def test_biography_encoded_once_per_id(self, sample_individual_id):
+        """Either ID form should get the biography's encoded result back between other calls."""
+        first = _cached_biography(sample_individual_id)
+        _cached_biography("@NONEXISTENT@")
+        assert _cached_biography(sample_individual_id.strip("@")) is first
+        clear_all_caches()
+        assert _cached_biography(sample_individual_id) is not first
+
+    def test_keeps_signature(self):
+        """The wrapper should keep the tool's parameters and output schema."""
+
+        def search(name: str, max_results: int = 5) -> list[dict]:
+            return _search_individuals(name, max_results)
+
+        expected = Tool.from_function(search)
+        actual = Tool.from_function(json_result(search))
+        assert actual.parameters == expected.parameters
+        assert actual.output_schema == expected.output_schema
@@ -6,6 +6,9 @@ from gedcom_server.narrative import (
     _get_biography,
     _get_repositories,
     _search_narrative,
+    _texts_containing,
+    _vital_template,
+    build_all_biographies,
 )
 from gedcom_server.state import HOME_PERSON_ID, individuals, repositories
 
@@ -92,6 +95,40 @@ class TestGetBiography:
         result = _get_biography("NONEXISTENT999")
         assert result is None
 
+    def test_biography_built_once_per_id(self, sample_individual_id):
+        """Both ID forms share one biography until the caches are cleared on load."""
+        from gedcom_server import state
+
+        bio = _get_biography(sample_individual_id)
+        assert _get_biography(sample_individual_id.strip("@")) is bio
+        state.clear_caches()
+        assert _get_biography(sample_individual_id) is not bio
+        assert _get_biography(sample_individual_id) == bio
+
+    def test_prebuilt_biographies_match_built_on_demand(self, monkeypatch):
+        """With BIOGRAPHY_PREBUILD_ENABLED, biographies come from the table built at load."""
+        from gedcom_server import state
+
+        expected = {indi_id: _get_biography(indi_id) for indi_id in individuals}
+        monkeypatch.setenv("BIOGRAPHY_PREBUILD_ENABLED", "true")
+        try:
+            build_all_biographies()
+            assert state.biographies == expected
+            for indi_id in individuals:
+                assert _get_biography(f"@{indi_id}@") is state.biographies[indi_id]
+            assert _get_biography("NONEXISTENT999") is None
+        finally:
+            monkeypatch.delenv("BIOGRAPHY_PREBUILD_ENABLED")
+            build_all_biographies()
+        assert state.biographies == {}
+
+    def test_vital_templates(self):
+        """Vital summary templates should mention only the known facts."""
+        assert _vital_template(0) == ""
+        assert _vital_template(0b1000) == "Born {bd}."
+        assert _vital_template(0b0101) == "Born in {bp}. Died in {dp}."
+        assert _vital_template(0b1111) == "Born {bd} in {bp}. Died {dd} in {dp}."
+
     def test_biography_has_required_fields(self):
         """Biography should have all required fields."""
         result = _get_biography(HOME_PERSON_ID)
@@ -205,6 +242,32 @@ class TestSearchNarrative:
                         assert result["result_count"] >= 0  # May have no matches if word is common
                         return
 
+    def test_search_matches_full_scan(self, tree):
+        """Indexed search should find exactly the texts a full scan finds, in order."""
+        for query in ("a", "Ob", "e ", "born", "zzz", "", "emigrated", "entry for the", "miner"):
+            q = query.lower()
+            expected = []
+            for indi in individuals.values():
+                texts = list(indi.notes)
+                for event in indi.events:
+                    texts.extend(event.notes)
+                    texts.extend(c.text for c in event.citations if c.text)
+                expected.extend((indi.id, text) for text in texts if q in text.lower())
+            result = _search_narrative(query, max_results=100000)
+            assert [(r["individual_id"], r["full_text"]) for r in result["results"]] == expected
+
+    def test_match_must_lie_within_one_text(self, monkeypatch):
+        """A query spanning the join between two texts matches neither."""
+        from gedcom_server import state
+
+        monkeypatch.setattr(state, "narrative_text", "\n".join(["ab", "", "bab"]))
+        monkeypatch.setattr(state, "narrative_text_starts", [0, 3, 4])
+        assert list(_texts_containing("b", 0, 3)) == [(0, 1), (2, 0)]
+        assert list(_texts_containing("b", 1, 3)) == [(2, 0)]
+        assert list(_texts_containing("b", 0, 1)) == [(0, 1)]
+        assert list(_texts_containing("b\n", 0, 3)) == []
+        assert list(_texts_containing("", 0, 3)) == [(0, 0), (1, 0), (2, 0)]
+
     def test_search_case_insensitive(self):
         """Search should be case-insensitive."""
         upper = _search_narrative("OBITUARY")
@@ -154,6 +154,17 @@ class TestGetAncestorsTerminalFilter:
             assert "path" in item
             assert isinstance(item["path"], list)
 
+    def test_terminal_filter_paths_lead_to_ancestor(self):
+        """Each path should walk from the start person to the listed ancestor."""
+        for indi in individuals.values():
+            for item in _get_ancestors(indi.id, generations=20, filter="terminal"):
+                current = indi
+                for step in item["path"]:
+                    fam = families[current.family_as_child]
+                    current = individuals[fam.husband_id if step == "father" else fam.wife_id]
+                assert current.id == item["id"]
+                assert item["generation"] == len(item["path"])
+
     def test_terminal_filter_does_not_include_starting_person(self, individual_with_parents):
         """Terminal filter should not include the starting person."""
         result = _get_ancestors(individual_with_parents.id, generations=10, filter="terminal")
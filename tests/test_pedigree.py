@@ -0,0 +1,247 @@
+"""Tests for the integer-indexed pedigree arrays."""
+
+from gedcom_server import pedigree
+from gedcom_server.core import _get_children, _get_parents
+from gedcom_server.state import families, individual_ids, individual_index, individuals
+
+
+class TestDenseIds:
+    """Tests for the dense individual numbering."""
+
+    def test_covers_every_individual_in_load_order(self, tree):
+        """individual_ids should list every individual in dict order."""
+        assert individual_ids == list(individuals)
+
+    def test_index_is_inverse_of_ids(self, tree):
+        """individual_index should map each ID back to its position."""
+        for i, indi_id in enumerate(individual_ids):
+            assert individual_index[indi_id] == i
+
+
+class TestAdjacency:
+    """Tests for the CSR parent/child rows."""
+
+    def test_parents_match_family_lookup(self, tree):
+        """parents_of should list husband then wife of family_as_child."""
+        for indi_id, indi in individuals.items():
+            expected = []
+            fam = families.get(indi.family_as_child) if indi.family_as_child else None
+            if fam:
+                expected = [p for p in (fam.husband_id, fam.wife_id) if p and p in individuals]
+            parents = pedigree.parents_of(individual_index[indi_id])
+            assert [individual_ids[p] for p in parents] == expected
+
+    def test_father_and_mother_match_family(self, tree):
+        """father_of/mother_of should follow husband and wife of family_as_child."""
+        for indi_id, indi in individuals.items():
+            fam = families.get(indi.family_as_child) if indi.family_as_child else None
+            i = individual_index[indi_id]
+            for parent_id, parent in (
+                (fam and fam.husband_id, pedigree.father_of(i)),
+                (fam and fam.wife_id, pedigree.mother_of(i)),
+            ):
+                expected = individual_index.get(parent_id, -1) if parent_id else -1
+                assert parent == expected
+
+    def test_siblings_match_family_children(self, tree):
+        """siblings_of should list the other children of family_as_child in order."""
+        for indi_id, indi in individuals.items():
+            fam = families.get(indi.family_as_child) if indi.family_as_child else None
+            expected = []
+            if fam:
+                expected = [c for c in fam.children_ids if c != indi_id and c in individuals]
+            siblings = pedigree.siblings_of(individual_index[indi_id])
+            assert [individual_ids[s] for s in siblings] == expected
+
+    def test_parents_agree_with_get_parents(self, individual_with_parents):
+        """Parent rows should agree with _get_parents."""
+        result = _get_parents(individual_with_parents.id)
+        expected = {p["id"] for p in (result["father"], result["mother"]) if p}
+        parents = pedigree.parents_of(individual_index[individual_with_parents.id])
+        assert {individual_ids[p] for p in parents} == expected
+
+    def test_children_agree_with_get_children(self, individual_with_children):
+        """Child rows should list the same children, in order, as _get_children."""
+        expected = [c["id"] for c in _get_children(individual_with_children.id)]
+        children = pedigree.children_of(individual_index[individual_with_children.id])
+        assert [individual_ids[c] for c in children] == expected
+
+
+class TestAncestorDepths:
+    """Tests for the vectorized ancestor walk."""
+
+    @staticmethod
+    def _reference(i, max_generations):
+        depths = {}
+        frontier = [i]
+        for gen in range(1, max_generations + 1):
+            next_frontier = []
+            for node in frontier:
+                for parent in pedigree.parents_of(node):
+                    if parent not in depths:
+                        depths[parent] = gen
+                        next_frontier.append(parent)
+            frontier = next_frontier
+        return depths
+
+    def test_matches_reference_walk(self, tree):
+        """Vectorized walk should find the same ancestors at the same depths."""
+        for i in range(len(individual_ids)):
+            for max_gen in (1, 2, 10):
+                nodes, gens = pedigree.ancestor_depths(i, max_gen)
+                assert dict(zip(nodes.tolist(), gens.tolist(), strict=True)) == self._reference(
+                    i, max_gen
+                )
+
+    def test_ordered_by_generation(self, tree):
+        """Results should come back nearest generation first."""
+        for i in range(len(individual_ids)):
+            _, gens = pedigree.ancestor_depths(i, 10)
+            assert gens.tolist() == sorted(gens.tolist())
+
+    def test_zero_generations(self):
+        """max_generations=0 should find nothing."""
+        nodes, gens = pedigree.ancestor_depths(0, 0)
+        assert len(nodes) == 0
+        assert len(gens) == 0
+
+
+class TestIntervalLabels:
+    """Tests for the DFS interval ancestor filter."""
+
+    def test_never_rules_out_a_real_ancestor(self, tree):
+        """Every ancestor found by the walk should pass may_be_ancestor."""
+        for i in range(len(individual_ids)):
+            nodes, _ = pedigree.ancestor_depths(i, 100)
+            for a in nodes.tolist():
+                assert pedigree.may_be_ancestor(a, i)
+
+    def test_rules_out_descendants(self, tree):
+        """A child can never be its parent's ancestor."""
+        assert pedigree._intervals_valid
+        for i in range(len(individual_ids)):
+            for child in pedigree.children_of(i):
+                assert not pedigree.may_be_ancestor(child, i)
+
+    def test_rules_out_only_non_ancestors_of_every_pair(self, generated_tree):
+        """Over every pair, the filter should keep all ancestors and prune most others."""
+        count = len(individual_ids)
+        pruned = 0
+        for d in range(count):
+            ancestors = set(pedigree.ancestor_depths(d, count)[0].tolist())
+            for a in range(count):
+                if a in ancestors:
+                    assert pedigree.may_be_ancestor(a, d)
+                else:
+                    pruned += not pedigree.may_be_ancestor(a, d)
+        assert pruned > count * count // 2
+
+    def test_cycle_disables_filter(self):
+        """Cyclic links (bad data) should fall back to allowing every pair."""
+        ranks, lows, acyclic = pedigree._label_intervals([[2], [0], [1]], [[1], [2], [0]])
+        assert not acyclic
+        assert len(ranks) == len(lows) == 3
+
+    def test_tree_labels_are_exact(self):
+        """On a single-parent tree the intervals decide ancestry exactly."""
+        # 0 -> 1 -> 3, 0 -> 2
+        parent_rows = [[], [0], [0], [1]]
+        child_rows = [[1, 2], [3], [], []]
+        ranks, lows, acyclic = pedigree._label_intervals(parent_rows, child_rows)
+        assert acyclic
+        ancestors = {(0, 1), (0, 2), (0, 3), (1, 3)}
+        for a in range(4):
+            for d in range(4):
+                nested = lows[a] <= lows[d] and ranks[d] <= ranks[a]
+                assert nested == (a == d or (a, d) in ancestors)
+
+
+class TestClosestCommonAncestor:
+    """Tests for the bidirectional common-ancestor walk."""
+
+    @staticmethod
+    def _reference(i, j, max_generations):
+        nodes1, gens1 = pedigree.ancestor_depths(i, max_generations)
+        nodes2, gens2 = pedigree.ancestor_depths(j, max_generations)
+        depths2 = dict(zip(nodes2.tolist(), gens2.tolist(), strict=True))
+        best = None
+        for node, gen1 in zip(nodes1.tolist(), gens1.tolist(), strict=True):
+            gen2 = depths2.get(node)
+            if gen2 is not None and (best is None or gen1 + gen2 < best[1] + best[2]):
+                best = (node, gen1, gen2)
+        return best
+
+    def test_matches_full_walks(self, tree):
+        """Should pick the same ancestor as scanning both full ancestor maps."""
+        # Every pair on the sample tree; every pair of every fifth person on the larger one
+        people = range(0, len(individual_ids), 1 if tree == "sample" else 5)
+        for i in people:
+            for j in people:
+                for max_gen in (1, 3, 10):
+                    assert pedigree.closest_common_ancestor(i, j, max_gen) == self._reference(
+                        i, j, max_gen
+                    )
+
+    def test_ties_go_to_nearest_side_then_lowest_id(self, generated_tree):
+        """Among equally close common ancestors, the fewest generations from i and then the
+        lowest ID should win; collapsed lines give many pairs several such ancestors."""
+        count = len(individual_ids)
+        depths = [
+            dict(zip(*(a.tolist() for a in pedigree.ancestor_depths(i, 10)), strict=True))
+            for i in range(count)
+        ]
+        tied = 0
+        for i in range(0, count, 7):
+            for j in range(count):
+                shared = depths[i].keys() & depths[j].keys()
+                if not shared:
+                    assert pedigree.closest_common_ancestor(i, j, 10) is None
+                    continue
+                keys = sorted((depths[i][a] + depths[j][a], depths[i][a], a) for a in shared)
+                total, gen_i, ancestor = keys[0]
+                tied += keys[1][0] == total if len(keys) > 1 else 0
+                expected = (ancestor, gen_i, total - gen_i)
+                assert pedigree.closest_common_ancestor(i, j, 10) == expected
+        assert tied > 0
+
+    def test_siblings_share_parent(self, individual_with_parents):
+        """Full siblings should meet at a parent one generation up on both sides."""
+        fam = families[individual_with_parents.family_as_child]
+        siblings = [c for c in fam.children_ids if c != individual_with_parents.id]
+        if not siblings:
+            return
+        _, gen1, gen2 = pedigree.closest_common_ancestor(
+            individual_index[individual_with_parents.id], individual_index[siblings[0]], 10
+        )
+        assert (gen1, gen2) == (1, 1)
+
+
+class TestBfsLevels:
+    """Tests for the level-at-a-time parent/child walk."""
+
+    @staticmethod
+    def _reference(i, max_depth, step):
+        seen = {i}
+        nodes, levels = [], []
+        frontier = [i]
+        for level in range(1, max_depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for other in step(node):
+                    if other not in seen:
+                        seen.add(other)
+                        next_frontier.append(other)
+                        nodes.append(other)
+                        levels.append(level)
+            frontier = next_frontier
+        return nodes, levels
+
+    def test_matches_reference_walk_in_discovery_order(self, tree):
+        """Should find the same people, at the same levels, in the same order."""
+        for i in range(len(individual_ids)):
+            for towards_parents, step in (
+                (True, pedigree.parents_of),
+                (False, pedigree.children_of),
+            ):
+                nodes, levels = pedigree.bfs_levels(i, 10, towards_parents)
+                assert (nodes.tolist(), levels.tolist()) == self._reference(i, 10, step)
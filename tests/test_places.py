@@ -1,7 +1,15 @@
 """Tests for place-related functionality including fuzzy search and geocoding."""
 
+import re
+
 from gedcom_server.constants import HISTORICAL_MAPPINGS, HISTORICAL_NAMES
-from gedcom_server.helpers import get_place_id, normalize_place_string, parse_place_components
+from gedcom_server.helpers import (
+    get_place_id,
+    normalize_place_string,
+    parse_place_components,
+    place_phonetic_key,
+    trigram_candidates,
+)
 from gedcom_server.models import Place
 from gedcom_server.places import (
     _fuzzy_match_places,
@@ -12,6 +20,7 @@ from gedcom_server.places import (
     _get_place,
     _get_place_variants,
     _phonetic_match_places,
+    _place_keys_matching,
     _search_nearby,
     _search_similar_places,
 )
@@ -122,6 +131,11 @@ class TestNormalization:
         id2 = get_place_id("New York, USA")
         assert id1 == id2
 
+    def test_place_phonetic_key(self):
+        """Should encode the first word of the first component."""
+        assert place_phonetic_key("Smithfield Township, Ohio") == place_phonetic_key("Smythfield")
+        assert place_phonetic_key("  , Ohio") is None
+
     def test_get_place_id_normalized(self):
         """Similar places should get same ID after normalization."""
         id1 = get_place_id("St. Louis, MO")
@@ -176,6 +190,13 @@ class TestFuzzyMatchPlaces:
         low_threshold_results = _fuzzy_match_places("test", threshold=30)
         assert len(high_threshold_results) <= len(low_threshold_results)
 
+    def test_fuzzy_match_maps_back_to_original(self):
+        """Each place should be its own best match, reported by its original spelling."""
+        for place in list(places.values())[:20]:
+            result = _fuzzy_match_places(place.original, threshold=30)
+            assert (place.original, 100.0) in result
+            assert all(orig in {p.original for p in places.values()} for orig, _ in result)
+
 
 class TestPhoneticMatchPlaces:
     """Tests for phonetic place matching."""
@@ -185,6 +206,24 @@ class TestPhoneticMatchPlaces:
         result = _phonetic_match_places("Vienna")
         assert isinstance(result, list)
 
+    def test_matches_first_word_metaphone_of_every_place(self, tree):
+        """Should return exactly the places whose first word sounds like the query's."""
+        import jellyfish
+
+        for place in list(places.values())[:20]:
+            code = jellyfish.metaphone(place.original.split(",")[0].split()[0])
+            expected = [
+                p.original
+                for p in places.values()
+                if p.original.split(",")[0].split()
+                and jellyfish.metaphone(p.original.split(",")[0].split()[0]) == code
+            ]
+            assert _phonetic_match_places(place.original) == expected
+
+    def test_empty_query(self):
+        """A query without a first word should match nothing."""
+        assert _phonetic_match_places(", USA") == []
+
 
 class TestFuzzySearchPlace:
     """Tests for the fuzzy_search_place tool."""
@@ -214,6 +253,58 @@ class TestFuzzySearchPlace:
         # High threshold should return equal or fewer results
         assert len(high_results) <= len(low_results)
 
+    def test_matches_historical_variant(self):
+        """A historical name should find individuals recorded under the modern name."""
+        from unittest import mock
+
+        from gedcom_server import state
+
+        indi_id = next(iter(state.individuals))
+        key = "istanbul, turkey"
+        with (
+            mock.patch.dict(state.place_index, {key: [indi_id]}),
+            mock.patch.object(state, "place_index_keys", [key]),
+            mock.patch.object(state, "place_index_text", key),
+            mock.patch.object(state, "place_index_starts", [0]),
+        ):
+            result = _fuzzy_search_place("Constantinople", threshold=95)
+
+        match = next(r for r in result if r["id"] == indi_id)
+        assert match["matched_place"] == "istanbul, turkey"
+        assert match["match_score"] == 80.0
+
+    def test_normalized_candidates_cover_full_scan(self, tree):
+        """The trigram index should never drop a place whose normalized form contains the query."""
+        from gedcom_server import state
+
+        forms = state.place_normalized
+        queries = {
+            form[i : i + n] for form in forms for n in (3, 5, 9) for i in range(0, len(form), 4)
+        }
+        for query in sorted(queries) + ["zzz", "boston, massachusetts"]:
+            candidates = trigram_candidates(state.place_trigram_index, query)
+            if candidates is not None:
+                expected = [k for k, form in enumerate(forms) if query in form]
+                assert [k for k in sorted(candidates) if query in forms[k]] == expected
+
+    def test_substring_scan_matches_each_key_once(self):
+        """Keys containing the query are found once each, in order, never across two keys."""
+        from unittest import mock
+
+        from gedcom_server import state
+
+        keys = ["boston, ma", "south boston", "bos", "ton, usa"]
+        starts = [0, 11, 24, 28]
+        with (
+            mock.patch.object(state, "place_index_keys", keys),
+            mock.patch.object(state, "place_index_text", "\n".join(keys)),
+            mock.patch.object(state, "place_index_starts", starts),
+        ):
+            assert list(_place_keys_matching("boston")) == [0, 1]
+            assert list(_place_keys_matching("ma\nsouth")) == []
+            assert list(_place_keys_matching("")) == [0, 1, 2, 3]
+            assert list(_place_keys_matching(re.compile("ton|os"))) == [0, 1, 2, 3]
+
 
 class TestSearchSimilarPlaces:
     """Tests for the search_similar_places tool."""
@@ -254,6 +345,26 @@ class TestGetPlaceVariants:
                 assert "place" in result[0]
                 assert "match_type" in result[0]
 
+    def test_matches_scan_of_every_place(self, tree):
+        """Normalized and phonetic variants should be what a scan of every place finds."""
+        queries = [p.original for p in places.values()]
+        queries += ["boston", "Boston, Massachusetts, USA", "NEW YORK, NY, USA", "Danzig", ""]
+        for query in queries:
+            code = place_phonetic_key(query)
+            normalized = normalize_place_string(query)
+            matches = {}
+            for p in places.values():
+                if code is not None and place_phonetic_key(p.original) == code:
+                    matches[p.id] = "phonetic"
+                if p.normalized == normalized:
+                    matches[p.id] = "normalized"
+            expected = {}
+            for place_id, match_type in matches.items():
+                expected.setdefault(places[place_id].original, match_type)
+            result = _get_place_variants(query)
+            indexed = [(v["place"], v["match_type"]) for v in result if v["match_type"] != "fuzzy"]
+            assert indexed == list(expected.items())
+
 
 class TestGetAllPlaces:
     """Tests for the get_all_places tool."""
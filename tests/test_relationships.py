@@ -1,14 +1,24 @@
 """Tests for relationship integrity."""
 
+from unittest import mock
+
+from gedcom_server import pedigree, state
 from gedcom_server.core import (
+    _ancestor_depths,
+    _build_ancestor_depths,
+    _build_ancestor_set,
     _detect_pedigree_collapse,
     _find_common_ancestors,
     _get_children,
+    _get_families_batch,
+    _get_family,
     _get_individuals_batch,
     _get_parents,
     _get_relationship,
     _get_siblings,
     _get_spouses,
+    _pedigree_collapse,
+    _precompute_pedigree_collapse,
 )
 from gedcom_server.state import (
     HOME_PERSON_ID,
@@ -228,6 +238,11 @@ class TestIndexIntegrity:
             for indi_id in ids[:10]:  # Sample first 10 per place
                 assert indi_id in individuals, f"ID {indi_id} not found for place {place}"
 
+    def test_place_index_lists_each_individual_once(self):
+        """An individual with several events at one place should be listed there once."""
+        for place, ids in place_index.items():
+            assert len(ids) == len(set(ids)), f"Duplicate IDs for place {place}"
+
 
 class TestGetIndividualsBatch:
     """Tests for batch individual retrieval."""
@@ -264,6 +279,65 @@ class TestGetIndividualsBatch:
         # Should normalize and return the same data
         assert first_id in result
 
+    def test_batch_deduplicates_ids(self):
+        """Repeated IDs in either form should yield one entry, in first-seen order."""
+        first_id, second_id = list(individuals.keys())[:2]
+        result = _get_individuals_batch([first_id, second_id, first_id.strip("@")])
+        assert list(result) == [first_id, second_id]
+
+
+class TestGetFamiliesBatch:
+    """Tests for batch family retrieval."""
+
+    def test_batch_matches_single_lookups(self, sample_family_id):
+        """Each entry should equal get_family(), with None for unknown IDs."""
+        result = _get_families_batch([sample_family_id, "@NONEXISTENT999@"])
+        assert result == {
+            sample_family_id: _get_family(sample_family_id),
+            "@NONEXISTENT999@": None,
+        }
+
+    def test_batch_deduplicates_ids(self, sample_family_id):
+        """Repeated IDs in either form should yield one entry."""
+        result = _get_families_batch([sample_family_id, sample_family_id.strip("@")])
+        assert list(result) == [sample_family_id]
+
+
+class TestBuildAncestorDepths:
+    """Tests for _build_ancestor_depths."""
+
+    def test_parents_at_generation_one(self, individual_with_parents):
+        """Parents should be at depth 1."""
+        fam = families[individual_with_parents.family_as_child]
+        depths = _build_ancestor_depths(individual_with_parents.id)
+        for parent_id in (fam.husband_id, fam.wife_id):
+            if parent_id:
+                assert depths[parent_id] == 1
+
+    def test_matches_closest_generation_of_ancestor_set(self, tree):
+        """Depths should equal the closest generation found by path enumeration."""
+        for indi_id in individuals:
+            depths = _build_ancestor_depths(indi_id)
+            ancestor_set = _build_ancestor_set(indi_id)
+            assert depths == {aid: min(gens) for aid, gens in ancestor_set.items()}
+
+    def test_respects_max_generations(self):
+        """No ancestor should be deeper than max_generations."""
+        for indi_id in individuals:
+            assert all(d <= 1 for d in _build_ancestor_depths(indi_id, 1).values())
+
+    def test_unknown_id_returns_empty(self):
+        """Unknown individuals have no ancestors."""
+        assert _build_ancestor_depths("@NONEXISTENT@") == {}
+
+    def test_memoized_until_tree_reload(self, individual_with_parents):
+        """_ancestor_depths should reuse one map per person until caches are cleared."""
+        first = _ancestor_depths(individual_with_parents.id, 10)
+        assert _ancestor_depths(individual_with_parents.id, 10) is first
+        assert first == _build_ancestor_depths(individual_with_parents.id, 10)
+        state.clear_caches()
+        assert _ancestor_depths(individual_with_parents.id, 10) is not first
+
 
 class TestFindCommonAncestors:
     """Tests for common ancestor finding."""
@@ -324,6 +398,15 @@ class TestGetRelationship:
         result = _get_relationship(first_id, first_id)
         assert result["relationship"] == "same person"
 
+    def test_interval_filter_changes_no_result(self, generated_tree):
+        """Pruning ancestor lookups with the interval labels should not change any answer."""
+        ids = list(individuals)[::8]
+        pruned = {(id1, id2): _get_relationship(id1, id2) for id1 in ids for id2 in ids}
+        state.clear_caches()
+        with mock.patch.object(pedigree, "may_be_ancestor", return_value=True):
+            for (id1, id2), result in pruned.items():
+                assert _get_relationship(id1, id2) == result
+
     def test_parent_child(self, individual_with_parents):
         """Should identify parent-child relationship."""
         indi = individual_with_parents
@@ -406,6 +489,21 @@ class TestGetRelationship:
         assert _descendant_name(4) == "second great-grandchild"
         assert _descendant_name(5) == "third great-grandchild"
 
+    def test_inverse_relationship_name(self):
+        """Should flip asymmetric roles and leave symmetric ones alone."""
+        from gedcom_server.core import _inverse_relationship_name
+
+        assert _inverse_relationship_name("parent") == "child"
+        assert _inverse_relationship_name("grandchild") == "grandparent"
+        assert _inverse_relationship_name("third great-grandparent") == "third great-grandchild"
+        assert _inverse_relationship_name("aunt/uncle") == "niece/nephew"
+        assert _inverse_relationship_name("niece/nephew") == "aunt/uncle"
+        assert _inverse_relationship_name("first cousin once removed") == (
+            "first cousin once removed"
+        )
+        assert _inverse_relationship_name("spouse") == "spouse"
+        assert _inverse_relationship_name(None) is None
+
 
 class TestDetectPedigreeCollapse:
     """Tests for pedigree collapse detection."""
@@ -447,3 +545,32 @@ class TestDetectPedigreeCollapse:
         # With very few generations, should still work
         result = _detect_pedigree_collapse(first_id, max_generations=2)
         assert "collapse_points" in result
+
+    def test_cousin_marriage_paths(self, monkeypatch):
+        """Shared grandparents should be reported once per path, father's line first."""
+        from gedcom_server import pedigree
+        from gedcom_server.models import Individual
+
+        # Child @C@ of first cousins' parents: both parents share @GF@ and @GM@
+        ids = ["@C@", "@F@", "@M@", "@GF@", "@GM@"]
+        parents = {0: [1, 2], 1: [3, 4], 2: [3, 4], 3: [], 4: []}
+        monkeypatch.setattr(state, "individuals", {i: Individual(id=i, given_name=i) for i in ids})
+        monkeypatch.setattr(state, "individual_ids", ids)
+        monkeypatch.setattr(state, "individual_index", {i: n for n, i in enumerate(ids)})
+        monkeypatch.setattr(pedigree, "parents_of", parents.__getitem__)
+
+        result = _pedigree_collapse.__wrapped__("@C@", 10)
+        assert [p["ancestor_id"] for p in result["collapse_points"]] == ["@GF@", "@GM@"]
+        point = result["collapse_points"][0]
+        assert point["paths"] == [["@C@", "@F@", "@GF@"], ["@C@", "@M@", "@GF@"]]
+        assert point["generations"] == [2, 2]
+        assert point["occurrence_count"] == 2
+        assert _pedigree_collapse.__wrapped__("@C@", 1)["collapse_points"] == []
+
+    def test_home_person_precomputed(self):
+        """The home person's report should be served from the load-time precompute."""
+        state.clear_caches()
+        _precompute_pedigree_collapse()
+        misses = _pedigree_collapse.cache_info().misses
+        _detect_pedigree_collapse(HOME_PERSON_ID.strip("@"))
+        assert _pedigree_collapse.cache_info().misses == misses
@@ -1,5 +1,6 @@
 """Tests for semantic search functionality."""
 
+import json
 import os
 from unittest.mock import MagicMock, patch
 
@@ -7,6 +8,7 @@ import numpy as np
 import pytest
 
 from gedcom_server import semantic
+from gedcom_server.helpers import gedcom_file_hash
 from gedcom_server.state import individuals
 
 
@@ -104,6 +106,83 @@ class TestBuildEmbeddingText:
         assert "Parents:" in text
 
 
+class TestGetEncoder:
+    """Tests for _get_encoder() lazy model loading."""
+
+    def test_returns_loaded_encoder(self):
+        """An already loaded model should be returned without importing anything."""
+        mock_enc = MagicMock()
+        with (
+            patch.object(semantic, "_encoder", mock_enc),
+            patch.dict("sys.modules", {"sentence_transformers": None}),
+        ):
+            assert semantic._get_encoder() is mock_enc
+
+    def test_returns_none_when_not_installed(self):
+        """Without sentence-transformers there is no encoder, and nothing is cached."""
+        with (
+            patch.object(semantic, "_encoder", None),
+            patch.dict("sys.modules", {"sentence_transformers": None}),
+        ):
+            assert semantic._get_encoder() is None
+            assert semantic._encoder is None
+
+    def test_onnx_backend_loads_onnx_model(self):
+        """SEMANTIC_SEARCH_BACKEND=onnx should load the portable ONNX export by default."""
+        fake = MagicMock()
+        with (
+            patch.object(semantic, "_encoder", None),
+            patch.object(semantic, "_encoder_key", semantic.MODEL_NAME),
+            patch.dict("sys.modules", {"sentence_transformers": fake}),
+            patch.dict(os.environ, {"SEMANTIC_SEARCH_BACKEND": "onnx"}),
+        ):
+            os.environ.pop("SEMANTIC_SEARCH_ONNX_FILE", None)
+            assert semantic._get_encoder() is fake.SentenceTransformer.return_value
+            fake.SentenceTransformer.assert_called_once_with(
+                semantic.MODEL_NAME,
+                backend="onnx",
+                model_kwargs={"file_name": "onnx/model.onnx"},
+            )
+            assert semantic._model_key() == f"{semantic.MODEL_NAME}:onnx/model.onnx"
+
+    def test_onnx_file_is_configurable(self):
+        """SEMANTIC_SEARCH_ONNX_FILE should select a quantized export for the CPU."""
+        fake = MagicMock()
+        onnx_file = "onnx/model_qint8_arm64.onnx"
+        with (
+            patch.object(semantic, "_encoder", None),
+            patch.object(semantic, "_encoder_key", semantic.MODEL_NAME),
+            patch.dict("sys.modules", {"sentence_transformers": fake}),
+            patch.dict(
+                os.environ,
+                {"SEMANTIC_SEARCH_BACKEND": "onnx", "SEMANTIC_SEARCH_ONNX_FILE": onnx_file},
+            ),
+        ):
+            semantic._get_encoder()
+            fake.SentenceTransformer.assert_called_once_with(
+                semantic.MODEL_NAME, backend="onnx", model_kwargs={"file_name": onnx_file}
+            )
+            assert semantic._model_key() == f"{semantic.MODEL_NAME}:{onnx_file}"
+
+    def test_onnx_backend_falls_back_to_torch(self):
+        """Without ONNX support the PyTorch model should be loaded and cached under its key."""
+        fake = MagicMock()
+        # sentence-transformers raises a bare Exception when optimum/onnxruntime are missing
+        fake.SentenceTransformer.side_effect = [
+            Exception("Using the ONNX backend requires installing Optimum and ONNX Runtime."),
+            "torch",
+        ]
+        with (
+            patch.object(semantic, "_encoder", None),
+            patch.object(semantic, "_encoder_key", semantic.MODEL_NAME),
+            patch.dict("sys.modules", {"sentence_transformers": fake}),
+            patch.dict(os.environ, {"SEMANTIC_SEARCH_BACKEND": "onnx"}),
+        ):
+            assert semantic._get_encoder() == "torch"
+            fake.SentenceTransformer.assert_called_with(semantic.MODEL_NAME)
+            assert semantic._model_key() == semantic.MODEL_NAME
+
+
 class TestSemanticSearch:
     """Tests for _semantic_search() function."""
 
@@ -126,7 +205,10 @@ class TestSemanticSearch:
             semantic._embeddings = None
             semantic._embedding_ids = []
 
-            with patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}):
+            with (
+                patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
+                patch.object(semantic, "_embeddings_ready", True),
+            ):
                 result = semantic._semantic_search("test query")
                 assert "error" in result
                 assert "not built" in result["error"]
@@ -141,6 +223,7 @@ class TestSemanticSearch:
             patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
             patch.object(semantic, "_embeddings", np.zeros((10, 384))),
             patch.object(semantic, "_embedding_ids", [f"@I{i}@" for i in range(10)]),
+            patch.object(semantic, "_embeddings_ready", True),
             patch.object(semantic, "_embedding_texts", ["text"] * 10),
             patch.object(semantic, "_encoder") as mock_encoder,
         ):
@@ -150,6 +233,38 @@ class TestSemanticSearch:
             # Should work without error (clamped internally)
             assert isinstance(result, dict)
 
+    def test_returns_best_matches_by_score(self):
+        """Only the max_results most similar individuals are returned, best first."""
+        ids = list(individuals)[:5]
+        embeddings = np.eye(len(ids), 384)
+        query = np.linspace(0.1, 1.0, 384)[None, :]
+        with (
+            patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
+            patch.object(semantic, "_embeddings", embeddings),
+            patch.object(semantic, "_embedding_ids", ids),
+            patch.object(semantic, "_embeddings_ready", True),
+            patch.object(semantic, "_embedding_texts", ["text"] * len(ids)),
+            patch.object(semantic, "_encoder") as mock_encoder,
+        ):
+            mock_encoder.encode.return_value = query
+            result = semantic._semantic_search("test", max_results=3)
+        assert [r["individual_id"] for r in result["results"]] == ids[:-4:-1]
+
+    def test_scores_in_float32(self):
+        """A float64 query embedding is scored against the float32 matrix without upcasting."""
+        with (
+            patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
+            patch.object(semantic, "_embeddings", np.eye(3, 384, dtype=np.float32)),
+            patch.object(semantic, "_embedding_ids", list(individuals)[:3]),
+            patch.object(semantic, "_embeddings_ready", True),
+            patch.object(semantic, "_embedding_texts", ["text"] * 3),
+            patch.object(semantic, "_encoder") as mock_encoder,
+            patch.object(semantic.np, "dot", wraps=np.dot) as mock_dot,
+        ):
+            mock_encoder.encode.return_value = np.ones((1, 384))
+            semantic._semantic_search("test")
+        assert mock_dot.call_args.args[1].dtype == np.float32
+
 
 class TestCacheOperations:
     """Tests for cache save/load functionality."""
@@ -161,24 +276,14 @@ class TestCacheOperations:
 
         with patch.object(semantic.state, "GEDCOM_FILE", test_ged):
             cache_path = semantic._get_cache_path()
-            assert cache_path == test_ged.with_suffix(".ged.embeddings.npz")
+            assert cache_path == test_ged.with_suffix(".ged.embeddings.npy")
+            assert semantic._get_cache_meta_path() == test_ged.with_suffix(".ged.embeddings.json")
 
     def test_get_cache_path_none_when_no_gedcom(self):
         """Cache path should be None when GEDCOM_FILE not set."""
         with patch.object(semantic.state, "GEDCOM_FILE", None):
             assert semantic._get_cache_path() is None
 
-    def test_compute_gedcom_hash(self, tmp_path):
-        """Should compute consistent hash for same file content."""
-        test_ged = tmp_path / "test.ged"
-        test_ged.write_text("0 HEAD\n1 SOUR Test\n")
-
-        with patch.object(semantic.state, "GEDCOM_FILE", test_ged):
-            hash1 = semantic._compute_gedcom_hash()
-            hash2 = semantic._compute_gedcom_hash()
-            assert hash1 == hash2
-            assert len(hash1) == 64  # SHA256 hex digest
-
     def test_cache_round_trip(self, tmp_path):
         """Should save and load cache correctly."""
         test_ged = tmp_path / "test.ged"
@@ -210,10 +315,27 @@ class TestCacheOperations:
             # Load cache
             success = semantic._load_cache()
             assert success is True
+            assert isinstance(semantic._embeddings, np.memmap)
             assert np.allclose(semantic._embeddings, test_embeddings)
             assert semantic._embedding_ids == test_ids
             assert semantic._embedding_texts == test_texts
 
+    def test_unchanged_file_is_not_rehashed(self, tmp_path):
+        """A cache whose file mtime and size still match should load without hashing."""
+        test_ged = tmp_path / "test.ged"
+        test_ged.write_text("0 HEAD\n1 SOUR Test\n")
+
+        with (
+            patch.object(semantic.state, "GEDCOM_FILE", test_ged),
+            patch.object(semantic, "_embeddings", np.random.rand(2, 384).astype(np.float32)),
+            patch.object(semantic, "_embedding_ids", ["@I1@", "@I2@"]),
+            patch.object(semantic, "_embedding_texts", ["text1", "text2"]),
+        ):
+            semantic._save_cache()
+            with patch("gedcom_server.helpers.gedcom_file_hash") as mock_hash:
+                assert semantic._load_cache() is True
+                mock_hash.assert_not_called()
+
     def test_cache_invalidation_on_gedcom_change(self, tmp_path):
         """Cache should be invalidated when GEDCOM file changes."""
         test_ged = tmp_path / "test.ged"
@@ -276,19 +398,23 @@ class TestBuildEmbeddings:
 
         # Create a cache file
         test_embeddings = np.random.rand(3, 384).astype(np.float32)
-        cache_path = test_ged.with_suffix(".ged.embeddings.npz")
+        cache_path = test_ged.with_suffix(".ged.embeddings.npy")
+        meta_path = test_ged.with_suffix(".ged.embeddings.json")
 
         with patch.object(semantic.state, "GEDCOM_FILE", test_ged):
-            np.savez_compressed(
-                cache_path,
-                gedcom_hash=semantic._compute_gedcom_hash(),
-                model_name=semantic.MODEL_NAME,
-                embeddings=test_embeddings,
-                ids=np.array(["@I1@", "@I2@", "@I3@"], dtype=object),
-                texts=np.array(["t1", "t2", "t3"], dtype=object),
-            )
-
-            with patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}):
+            np.save(cache_path, test_embeddings)
+            meta = {
+                "gedcom_hash": gedcom_file_hash(test_ged),
+                "model_name": semantic.MODEL_NAME,
+                "ids": ["@I1@", "@I2@", "@I3@"],
+                "texts": ["t1", "t2", "t3"],
+            }
+            meta_path.write_text(json.dumps(meta))
+
+            with (
+                patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
+                patch.object(semantic, "_encoder") as mock_encoder,
+            ):
                 semantic._embeddings = None
                 semantic._embedding_ids = []
                 semantic._embedding_texts = []
@@ -296,10 +422,40 @@ class TestBuildEmbeddings:
                 semantic.build_embeddings()
 
                 # Should have loaded from cache (fast path)
+                mock_encoder.encode.assert_not_called()
                 # Verify the expected number of embeddings were loaded
                 assert len(semantic._embedding_ids) == 3
 
 
+class TestEnsureEmbeddings:
+    """Tests for lazy embedding builds on first semantic search."""
+
+    def test_builds_once_per_load(self):
+        """Embeddings are built on the first call only, until the tree is reloaded."""
+        with (
+            patch.object(semantic, "_embeddings_ready", False),
+            patch.object(semantic, "build_embeddings") as mock_build,
+        ):
+            semantic.ensure_embeddings()
+            semantic.ensure_embeddings()
+            assert mock_build.call_count == 1
+
+    def test_clear_embeddings_forces_rebuild(self):
+        """Clearing caches on reload drops the embeddings and builds them again on next use."""
+        with (
+            patch.object(semantic, "_embeddings", np.zeros((1, 384))),
+            patch.object(semantic, "_embedding_ids", ["@I1@"]),
+            patch.object(semantic, "_embedding_texts", ["text"]),
+            patch.object(semantic, "_embeddings_ready", True),
+            patch.object(semantic, "build_embeddings") as mock_build,
+        ):
+            semantic.clear_embeddings()
+            assert semantic._embeddings is None
+            assert semantic._embedding_ids == []
+            semantic.ensure_embeddings()
+            mock_build.assert_called_once()
+
+
 class TestResultsFormat:
     """Tests for search result format."""
 
@@ -332,7 +488,10 @@ class TestResultsFormat:
             mock_enc.encode.return_value = np.random.rand(1, 384).astype(np.float32)
             semantic._encoder = mock_enc
 
-            with patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}):
+            with (
+                patch.dict(os.environ, {"SEMANTIC_SEARCH_ENABLED": "true"}),
+                patch.object(semantic, "_embeddings_ready", True),
+            ):
                 result = semantic._semantic_search("test query", max_results=3)
 
                 assert "query" in result
@@ -129,3 +129,18 @@ class TestSearchSources:
                 lower_results = _search_sources(word.lower())
                 assert len(upper_results) == len(lower_results)
                 break
+
+    def test_indexed_search_matches_full_scan(self):
+        """Trigram-indexed search should agree with a scan of titles and authors."""
+        for source in sources.values():
+            for text in (source.title, source.author):
+                if not text or len(text) < 4:
+                    continue
+                query = text[1:4].lower()
+                expected = [
+                    s.to_summary()
+                    for s in sources.values()
+                    if (s.title and query in s.title.lower())
+                    or (s.author and query in s.author.lower())
+                ]
+                assert _search_sources(query) == expected
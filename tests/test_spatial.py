@@ -5,11 +5,11 @@ from unittest import mock
 
 import pytest
 
+from gedcom_server.geoindex import _point_in_bbox
 from gedcom_server.spatial import (
     _geocode_via_geonamescache,
     _geocode_via_nominatim_full,
     _is_ungeocodable,
-    _point_in_bbox,
     _resolve_location,
     _resolve_location_with_bbox,
     _search_nearby,
@@ -177,6 +177,44 @@ class TestSearchNearby:
             distances = [r["distance_miles"] for r in result["results"]]
             assert distances == sorted(distances)
 
+    def test_matches_full_scan_of_events(self, generated_tree):
+        """Should find exactly the people with an event in range, at their nearest one."""
+        import random
+
+        from haversine import Unit, haversine
+
+        from gedcom_server import state
+
+        rng = random.Random(3)
+        for place in state.places.values():
+            place.latitude, place.longitude = rng.uniform(40, 45), rng.uniform(-75, -69)
+        state.place_coords_version += 1
+
+        center = next(iter(state.places.values())).original
+        with mock.patch("gedcom_server.spatial._geocode_via_nominatim_full", return_value=None):
+            for radius in (25, 100, 250):
+                result = _search_nearby(center, radius_miles=radius, max_results=1000)
+                ref = result["reference_location"]["coordinates"]
+                expected: dict[str, float] = {}
+                for indi in state.individuals.values():
+                    for event in indi.events:
+                        if event.place_id:
+                            place = state.places[event.place_id]
+                            dist = haversine(
+                                (ref["lat"], ref["lon"]),
+                                (place.latitude, place.longitude),
+                                unit=Unit.MILES,
+                            )
+                            if dist <= radius:
+                                expected[indi.id] = min(dist, expected.get(indi.id, dist))
+
+                found = {r["individual_id"]: r["distance_miles"] for r in result["results"]}
+                assert found.keys() == expected.keys()
+                for indi_id, dist in expected.items():
+                    assert found[indi_id] == pytest.approx(dist, abs=0.1)
+                distances = [r["distance_miles"] for r in result["results"]]
+                assert distances == sorted(distances)
+
     def test_coverage_info(self):
         """Should include coverage information."""
         result = _search_nearby("Boston", radius_miles=50)
@@ -217,6 +255,137 @@ class TestDistanceCalculation:
         assert 180 < distance_miles < 220
 
 
+class TestPlacesWithin:
+    """Tests for the latitude-sorted place index behind radius searches."""
+
+    @pytest.fixture
+    def synthetic_places(self):
+        """Swap in a scattered set of geocoded places, including near the poles and dateline."""
+        import random
+
+        from gedcom_server import state
+        from gedcom_server.models import Place
+
+        rng = random.Random(7)
+        coords = [(rng.uniform(-89.9, 89.9), rng.uniform(-180, 180)) for _ in range(2000)]
+        coords += [(89.95, 10.0), (-89.95, -170.0), (51.5, 179.9), (51.5, -179.9)]
+        fake = {f"p{i}": Place(f"p{i}", f"p{i}", f"p{i}") for i in range(len(coords))}
+        for place, (lat, lon) in zip(fake.values(), coords, strict=True):
+            place.latitude, place.longitude = lat, lon
+        fake["ungeocoded"] = Place("ungeocoded", "x", "x")
+
+        with mock.patch.dict(state.places, fake, clear=True):
+            state.place_coords_version += 1
+            yield fake
+        state.place_coords_version += 1
+
+    @pytest.mark.parametrize(
+        "center",
+        [(40.7, -74.0), (51.5, 179.95), (89.9, 0.0), (-89.9, 45.0), (0.0, 0.0), (-33.9, 151.2)],
+    )
+    @pytest.mark.parametrize("radius", [0, 25, 300, 2500])
+    def test_matches_brute_force(self, synthetic_places, center, radius):
+        """Should return the places a full haversine scan finds, in place order."""
+        from haversine import Unit, haversine
+
+        from gedcom_server.geoindex import places_within
+
+        distances = {
+            place.id: haversine(center, (place.latitude, place.longitude), unit=Unit.MILES)
+            for place in synthetic_places.values()
+            if place.latitude is not None and place.longitude is not None
+        }
+        found = places_within(center, radius, unit=Unit.MILES)
+        found_ids = [place_id for place_id, _ in found]
+
+        # Coordinates are stored as float32, so places within a metre of the edge may go
+        # either way; everything else must match a full scan
+        tolerance = 0.001
+        assert {p for p, d in distances.items() if d <= radius - tolerance} <= set(found_ids)
+        assert all(distances[p] <= radius + tolerance for p in found_ids)
+        assert found_ids == [p for p in synthetic_places if p in set(found_ids)]
+        for place_id, dist in found:
+            assert dist == pytest.approx(distances[place_id], abs=tolerance)
+
+    @pytest.mark.parametrize(
+        "bbox",
+        [
+            {"south": 40.0, "north": 42.0, "west": -75.0, "east": -73.0},
+            {"south": -90.0, "north": 90.0, "west": -180.0, "east": 180.0},
+            {"south": 10.0, "north": 10.0, "west": 20.0, "east": 20.0},
+            {"south": 5.0, "north": 1.0, "west": 0.0, "east": 10.0},
+        ],
+    )
+    def test_bbox_matches_brute_force(self, synthetic_places, bbox):
+        """places_in_bbox should agree exactly with _point_in_bbox over every place."""
+        from gedcom_server.geoindex import places_in_bbox
+
+        expected = [
+            place.id
+            for place in synthetic_places.values()
+            if place.latitude is not None
+            and place.longitude is not None
+            and _point_in_bbox(place.latitude, place.longitude, bbox)
+        ]
+        assert places_in_bbox(bbox) == expected
+
+    def test_bbox_includes_place_on_edge(self, synthetic_places):
+        """A place exactly on the box edge should be found despite float32 storage."""
+        from gedcom_server.geoindex import places_in_bbox
+
+        place = synthetic_places["p0"]
+        bbox = {
+            "south": place.latitude,
+            "north": place.latitude,
+            "west": place.longitude,
+            "east": place.longitude,
+        }
+        assert places_in_bbox(bbox) == ["p0"]
+
+    def test_rebuilds_when_place_gains_coordinates(self, synthetic_places):
+        """Should pick up coordinates added after the index was built."""
+        from haversine import Unit
+
+        from gedcom_server import state
+        from gedcom_server.geoindex import places_within
+
+        center = (12.34, 56.78)
+        before = {place_id for place_id, _ in places_within(center, 1, unit=Unit.KILOMETERS)}
+        assert "ungeocoded" not in before
+
+        synthetic_places["ungeocoded"].latitude, synthetic_places["ungeocoded"].longitude = center
+        state.place_coords_version += 1
+
+        after = {place_id for place_id, _ in places_within(center, 1, unit=Unit.KILOMETERS)}
+        assert after == before | {"ungeocoded"}
+
+    def test_refresh_index_builds_eagerly(self, synthetic_places):
+        """refresh_index() should leave an index current with the coordinates."""
+        from gedcom_server import geoindex, state
+
+        state.place_coords_version += 1
+        geoindex.refresh_index()
+        assert geoindex._index is not None
+        assert geoindex._index.version == state.place_coords_version
+        assert len(geoindex._index.place_ids) == len(synthetic_places) - 1
+
+
+class TestPlaceIndividualsIndex:
+    """Tests for the place -> individuals inverted index."""
+
+    def test_inverse_of_individual_places(self, tree):
+        """Every individual should be listed once under each of their places."""
+        from gedcom_server import state
+
+        expected: dict[str, list[str]] = {}
+        for indi_id, place_ids in state.individual_places.items():
+            for place_id in dict.fromkeys(place_ids):
+                expected.setdefault(place_id, []).append(indi_id)
+
+        assert state.place_individuals == expected
+        assert state.place_individuals
+
+
 class TestDisabledState:
     """Tests for behavior when GIS search is disabled."""
 